@@ -29,8 +29,12 @@ from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 import os
 import csv
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'shared' / 'scripts' / 'figures'))
+from figure_build import FigureBuild
+
 # Style settings for publication
 plt.style.use('seaborn-v0_8-whitegrid')
 plt.rcParams.update({
@@ -696,18 +700,26 @@ def figure_7_cascade_sequence(output_dir: str = 'outputs/figures'):
     plt.close()
 
 
-def generate_all_figures(output_dir: str = 'outputs/figures'):
-    """Generate all publication figures"""
+def generate_all_figures(output_dir: str = 'outputs/figures', force: bool = False,
+                         n_jobs: Optional[int] = None):
+    """Generate all publication figures (in parallel, skipping unchanged ones)"""
     print("Generating publication-quality figures for Paper 2...")
     print("=" * 60)
 
-    figure_1_k_index_trajectories(output_dir)
-    figure_2_threshold_dynamics(output_dir)
-    figure_3_coupling_matrix(output_dir)
-    figure_4_survivor_comparison(output_dir)
-    figure_5_modern_predictions(output_dir)
-    figure_6_four_laws(output_dir)
-    figure_7_cascade_sequence(output_dir)
+    data_csv = Path(__file__).parent.parent / 'data' / 'collapse_cases_empirical.csv'
+    build = FigureBuild(output_dir)
+    for stem, func in [
+        ('figure_1_k_trajectories', figure_1_k_index_trajectories),
+        ('figure_2_threshold_dynamics', figure_2_threshold_dynamics),
+        ('figure_3_coupling_matrix', figure_3_coupling_matrix),
+        ('figure_4_survivor_comparison', figure_4_survivor_comparison),
+        ('figure_5_modern_predictions', figure_5_modern_predictions),
+        ('figure_6_twelve_laws', figure_6_twelve_laws),
+        ('figure_7_cascade_sequence', figure_7_cascade_sequence),
+    ]:
+        build.task(stem, func, output_dir, inputs=[data_csv],
+                   outputs=[Path(output_dir) / f'{stem}.png', Path(output_dir) / f'{stem}.pdf'])
+    build.run(n_jobs=n_jobs, force=force)
 
     print("=" * 60)
     print(f"All figures saved to {output_dir}/")
@@ -722,6 +734,10 @@ if __name__ == "__main__":
                        help='Output directory for figures')
     parser.add_argument('--figure', type=int, default=None,
                        help='Generate specific figure only (1-7)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render figures even if inputs are unchanged')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Parallel render processes (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -732,7 +748,7 @@ if __name__ == "__main__":
             3: figure_3_coupling_matrix,
             4: figure_4_survivor_comparison,
             5: figure_5_modern_predictions,
-            6: figure_6_four_laws,
+            6: figure_6_twelve_laws,
             7: figure_7_cascade_sequence
         }
         if args.figure in figure_funcs:
@@ -740,4 +756,4 @@ if __name__ == "__main__":
         else:
             print(f"Figure {args.figure} not found. Available: 1-7")
     else:
-        generate_all_figures(args.output_dir)
+        generate_all_figures(args.output_dir, force=args.force, n_jobs=args.jobs)
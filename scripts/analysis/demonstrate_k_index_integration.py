@@ -36,6 +36,7 @@ import seaborn as sns
 from pathlib import Path
 from typing import Tuple
 import logging
+import sys
 
 # Set up logging
 logging.basicConfig(
@@ -50,6 +51,9 @@ DATA_PROCESSED = PROJECT_ROOT / "data" / "processed"
 FIGURES_DIR = PROJECT_ROOT / "figures" / "k_index_integration"
 MANUSCRIPT_DIR = PROJECT_ROOT / "manuscript"
 
+sys.path.insert(0, str(PROJECT_ROOT / "scripts" / "processing"))
+from panel_rankings import PanelRanking
+
 # Create output directories
 FIGURES_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -84,23 +88,20 @@ def create_country_rankings(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info("Creating country rankings...")
 
-    # Get most recent year for each country
-    latest_year = df.groupby('country_code')['year'].max().reset_index()
-    latest_data = df.merge(latest_year, on=['country_code', 'year'])
-
-    # Sort by H₇
-    rankings = latest_data.sort_values('H7_evolutionary_progression', ascending=False).reset_index(drop=True)
-    rankings['rank'] = rankings.index + 1
+    # Rank every country on its most recent observation (one argsort)
+    ranking = PanelRanking.from_frame(df, 'H7_evolutionary_progression')
+    latest = ranking.latest()
 
-    # Calculate percentile
-    rankings['percentile'] = (1 - rankings['rank'] / len(rankings)) * 100
+    # Attach the full latest-year rows, keeping rank order
+    rankings = latest[['country_code', 'year', 'rank', 'percentile']].merge(
+        df, on=['country_code', 'year'], how='left'
+    )
+    rankings = rankings[list(df.columns) + ['rank', 'percentile']]
 
     # Add temporal trend (change from first to last year for each country)
-    first_years = df.groupby('country_code').first().reset_index()
-    first_years = first_years[['country_code', 'year', 'H7_evolutionary_progression']]
-    first_years.columns = ['country_code', 'first_year', 'first_h7']
+    rankings['first_year'] = latest['first_year'].to_numpy()
+    rankings['first_h7'] = latest['first_value'].to_numpy()
 
-    rankings = rankings.merge(first_years, on='country_code', how='left')
     rankings['h7_change'] = rankings['H7_evolutionary_progression'] - rankings['first_h7']
     rankings['years_observed'] = rankings['year'] - rankings['first_year']
     rankings['h7_annual_growth'] = np.where(
@@ -416,8 +417,8 @@ def generate_manuscript_update_report(df: pd.DataFrame, rankings: pd.DataFrame,
     report.append("## Top Performing Countries (2021)")
     report.append("")
     top_10 = rankings.head(10)
-    for i, (idx, row) in enumerate(top_10.iterrows(), 1):
-        report.append(f"{i:2d}. {row['country_name']:<40} H₇ = {row['H7_evolutionary_progression']:.4f}")
+    for i, name, value in zip(top_10['rank'], top_10['country_name'], top_10['H7_evolutionary_progression']):
+        report.append(f"{i:2d}. {name:<40} H₇ = {value:.4f}")
     report.append("")
 
     # Component Contributions
@@ -24,6 +24,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from datetime import datetime
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "shared" / "scripts" / "processing"))
+from panel_k import HarmonyPanel, compute_panel_k
 
 # Set style
 sns.set_style("whitegrid")
@@ -98,7 +102,7 @@ def integrate_and_compare(k_existing, h7_validated):
 
     # Filter to overlap period (1996-2020)
     overlap_years = range(1996, 2021)  # 1996-2020
-    k_overlap = k_existing[k_existing['year'].isin(overlap_years)].copy()
+    k_overlap = k_existing[k_existing['year'].isin(overlap_years)].sort_values('year')
 
     # Merge with validated H₇
     merged = k_overlap.merge(h7_validated, on='year', how='left')
@@ -113,11 +117,15 @@ def integrate_and_compare(k_existing, h7_validated):
     print("Calculating three K(t) formulations:")
     print()
 
+    # Global series as a one-entity panel (float64 keeps CSV precision)
+    panel = HarmonyPanel.from_global(
+        merged, ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7_validated'], dtype=np.float64
+    )
+
     # 1. Six-harmony K(t) (H₁-H₆ only)
-    merged['k_six_harmony'] = (
-        merged['h1'] * merged['h2'] * merged['h3'] *
-        merged['h4'] * merged['h5'] * merged['h6']
-    ) ** (1/6)
+    merged['k_six_harmony'] = compute_panel_k(
+        panel.select(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+    )[0]
     print(f"1. Six-harmony K(t) (H₁-H₆):        Mean = {merged['k_six_harmony'].mean():.4f}")
 
     # 2. Seven-harmony K(t) with synthetic H₇ (current approach)
@@ -125,10 +133,7 @@ def integrate_and_compare(k_existing, h7_validated):
     print(f"2. Seven-harmony K(t) (synthetic):  Mean = {merged['k_seven_synthetic'].mean():.4f}")
 
     # 3. Seven-harmony K(t) with validated H₇ (new approach)
-    merged['k_seven_validated'] = (
-        merged['h1'] * merged['h2'] * merged['h3'] * merged['h4'] *
-        merged['h5'] * merged['h6'] * merged['h7_validated']
-    ) ** (1/7)
+    merged['k_seven_validated'] = compute_panel_k(panel)[0]
     print(f"3. Seven-harmony K(t) (validated):  Mean = {merged['k_seven_validated'].mean():.4f}")
     print()
 
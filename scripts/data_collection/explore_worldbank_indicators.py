@@ -7,33 +7,108 @@ This script searches World Bank indicators to find data relevant to:
 - Infrastructure density (railways, roads, electricity, telecom)
 - Governance/institutions (for constitutional complexity proxy)
 
+With --offline, search runs against the local BM25 index over the
+indicator catalog (indicator_index.py) and needs no network;
+--download-catalog fetches the full World Bank indicator list once into
+data/raw/worldbank_indicator_catalog.csv for that index.
+
 Author: Tristan Stoltz / Claude Code
 Date: December 3, 2025
 """
 
+import argparse
 import requests
 import pandas as pd
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional
 import time
 
+from indicator_index import CATALOG_FILE, IndicatorIndex, load_indicator_index
+
 WB_BASE_URL = "https://api.worldbank.org/v2"
 
-def search_indicators(search_terms: List[str], per_page: int = 100) -> pd.DataFrame:
+
+def download_catalog(output_file: Path = CATALOG_FILE, per_page: int = 20000) -> pd.DataFrame:
+    """
+    Download the full World Bank indicator list once as the offline catalog.
+
+    Returns:
+        DataFrame with id, name, description and source columns
+    """
+    rows = []
+    page, pages = 1, 1
+    while page <= pages:
+        response = requests.get(f"{WB_BASE_URL}/indicator",
+                                params={'format': 'json', 'per_page': per_page, 'page': page},
+                                timeout=120)
+        response.raise_for_status()
+        meta, indicators = response.json()
+        pages = int(meta.get('pages', 1))
+        rows.extend({
+            'id': ind.get('id', ''),
+            'name': ind.get('name', ''),
+            'description': ind.get('sourceNote', ''),
+            'source': (ind.get('source') or {}).get('value', 'Unknown'),
+        } for ind in indicators or [] if ind)
+        page += 1
+
+    catalog = pd.DataFrame(rows, columns=['id', 'name', 'description', 'source'])
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    catalog.to_csv(output_file, index=False)
+    print(f"✓ Catalog saved to: {output_file} ({len(catalog)} indicators)")
+    return catalog
+
+
+def search_indicators_offline(search_terms: List[str], index: Optional[IndicatorIndex] = None,
+                              top_k: int = 25) -> pd.DataFrame:
+    """
+    Search the local indicator index (no network).
+
+    Args:
+        search_terms: List of keywords to search for
+        index: Indicator index (default: load_indicator_index())
+        top_k: Maximum results per term
+
+    Returns:
+        DataFrame with matching indicators, search_term and BM25 score
+    """
+    index = index if index is not None else load_indicator_index()
+    results = []
+    for term in search_terms:
+        matching = index.search(term, top_k)
+        matching['description'] = matching['description'].str.lower().map(
+            lambda desc: desc[:200] + '...' if len(desc) > 200 else desc)
+        matching['search_term'] = term
+        print(f"Searching for: '{term}'...")
+        print(f"  Found {len(matching)} matching indicators")
+        results.append(matching)
+
+    columns = ['id', 'name', 'description', 'source', 'search_term', 'score']
+    if not results:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(results, ignore_index=True)[columns]
+
+def search_indicators(search_terms: List[str], per_page: int = 100,
+                      offline: bool = False) -> pd.DataFrame:
     """
     Search World Bank indicators by keywords.
 
     Args:
         search_terms: List of keywords to search for
         per_page: Number of results per page
+        offline: Search the local indicator index instead of the API
 
     Returns:
         DataFrame with matching indicators
     """
 
     print(f"\n{'='*80}")
-    print("Searching World Bank Indicators")
+    print("Searching World Bank Indicators" + (" (offline index)" if offline else ""))
     print(f"{'='*80}\n")
 
+    if offline:
+        return search_indicators_offline(search_terms)
+
     all_indicators = []
 
     for term in search_terms:
@@ -86,7 +161,7 @@ def search_indicators(search_terms: List[str], per_page: int = 100) -> pd.DataFr
     return pd.DataFrame(all_indicators)
 
 
-def find_h7_indicators():
+def find_h7_indicators(offline: bool = False):
     """Find World Bank indicators relevant to H₇ components."""
 
     print("\n" + "="*80)
@@ -129,14 +204,15 @@ def find_h7_indicators():
         print(f"Category: {category}")
         print(f"{'='*80}")
 
-        df = search_indicators(terms)
+        df = search_indicators(terms, offline=offline)
 
         if len(df) > 0:
             print(f"\n✓ Found {len(df)} total indicators for {category}")
             print(f"\nTop matches:")
-            for i, row in df.head(10).iterrows():
-                print(f"\n  {row['id']}: {row['name']}")
-                print(f"  Description: {row['description'][:100]}...")
+            top = df.head(10)
+            for ind_id, name, desc in zip(top['id'], top['name'], top['description']):
+                print(f"\n  {ind_id}: {name}")
+                print(f"  Description: {desc[:100]}...")
         else:
             print(f"\n✗ No indicators found for {category}")
 
@@ -148,6 +224,17 @@ def find_h7_indicators():
 def main():
     """Main execution function."""
 
+    parser = argparse.ArgumentParser(description="Explore World Bank indicators for H₇ components")
+    parser.add_argument('--offline', action='store_true',
+                        help="Search the local indicator index instead of the World Bank API")
+    parser.add_argument('--download-catalog', action='store_true',
+                        help="Download the full indicator catalog for offline search, then exit")
+    args = parser.parse_args()
+
+    if args.download_catalog:
+        download_catalog()
+        return
+
     print("\n🔍 Exploring World Bank Indicators for H₇ Components")
     print("="*80)
     print()
@@ -160,10 +247,12 @@ def main():
     print()
 
     # Search for relevant indicators
-    results = find_h7_indicators()
+    results = find_h7_indicators(offline=args.offline)
 
-    # Save results
-    output_file = "data/raw/worldbank_indicator_search_results.csv"
+    # Save results (offline results must not overwrite the catalog snapshot
+    # they were searched from)
+    output_file = ("data/raw/worldbank_indicator_offline_search_results.csv" if args.offline
+                   else "data/raw/worldbank_indicator_search_results.csv")
 
     all_results = pd.concat(results.values(), ignore_index=True)
 
@@ -11,18 +11,44 @@ Creates print-ready HTML that can be easily converted to PDF:
 5. Complete Documentation HTML
 
 HTML versions are print-optimized and can be saved as PDF from any browser.
+
+Builds are incremental (see submission_build.py): a document is only
+re-rendered when its markdown inputs, the CSS or its renderer change, or
+when its previous build failed. Use --force to re-render everything.
 """
 
-import os
+import argparse
 from pathlib import Path
 from datetime import datetime
 import markdown
 
+from submission_build import SubmissionBuild
+
 # Base directory
 BASE_DIR = Path("/srv/luminous-dynamics/historical-k-index")
 OUTPUT_DIR = BASE_DIR / "submission_html"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Markdown inputs per document
+SUPPLEMENTARY_INPUTS = [
+    BASE_DIR / "manuscript/supplementary/SUPPLEMENTARY_METHODS.md",
+    BASE_DIR / "manuscript/supplementary/SUPPLEMENTARY_TABLES.md",
+]
+EXECUTIVE_SUMMARY_INPUT = BASE_DIR / "EXECUTIVE_SUMMARY_ONE_PAGE.md"
+MANUSCRIPT_SECTION_INPUTS = [
+    BASE_DIR / "manuscript/H7_METHODS_SECTION_TEXT.md",
+    BASE_DIR / "manuscript/H7_RESULTS_SECTION_TEXT.md",
+    BASE_DIR / "manuscript/H7_DISCUSSION_SECTION_TEXT.md",
+]
+DOCUMENTATION_FILES = [
+    ("START_HERE.md", "Master Navigation"),
+    ("EXECUTIVE_SUMMARY_ONE_PAGE.md", "Executive Summary"),
+    ("H7_README.md", "H₇ Component Documentation"),
+    ("PUBLICATION_READINESS_VERIFICATION.md", "Publication Readiness Verification"),
+    ("AUTHOR_QUICK_START.md", "Author Quick Start Guide"),
+    ("NATURE_SUBMISSION_CHECKLIST.md", "Nature Submission Checklist"),
+]
+
 # CSS for professional print-ready documents
 PROFESSIONAL_CSS = """
 <style>
@@ -254,8 +280,7 @@ def create_supplementary_materials_html():
     print("="*80)
 
     # Read supplementary files
-    supp_methods = (BASE_DIR / "manuscript/supplementary/SUPPLEMENTARY_METHODS.md").read_text()
-    supp_tables = (BASE_DIR / "manuscript/supplementary/SUPPLEMENTARY_TABLES.md").read_text()
+    supp_methods, supp_tables = (path.read_text() for path in SUPPLEMENTARY_INPUTS)
 
     combined_content = f"{supp_methods}\n\n{supp_tables}"
 
@@ -274,7 +299,7 @@ def create_executive_summary_html():
     print("2. Creating Executive Summary HTML")
     print("="*80)
 
-    content = (BASE_DIR / "EXECUTIVE_SUMMARY_ONE_PAGE.md").read_text()
+    content = EXECUTIVE_SUMMARY_INPUT.read_text()
     output_file = OUTPUT_DIR / "H7_Executive_Summary.html"
 
     return create_html_document(
@@ -290,9 +315,7 @@ def create_manuscript_sections_html():
     print("3. Creating H₇ Manuscript Sections HTML")
     print("="*80)
 
-    methods = (BASE_DIR / "manuscript/H7_METHODS_SECTION_TEXT.md").read_text()
-    results = (BASE_DIR / "manuscript/H7_RESULTS_SECTION_TEXT.md").read_text()
-    discussion = (BASE_DIR / "manuscript/H7_DISCUSSION_SECTION_TEXT.md").read_text()
+    methods, results, discussion = (path.read_text() for path in MANUSCRIPT_SECTION_INPUTS)
 
     combined_content = f"""# H₇ Manuscript Sections
 
@@ -422,14 +445,7 @@ def create_complete_documentation_html():
     print("="*80)
 
     # Combine major documentation files
-    docs = [
-        ("START_HERE.md", "Master Navigation"),
-        ("EXECUTIVE_SUMMARY_ONE_PAGE.md", "Executive Summary"),
-        ("H7_README.md", "H₇ Component Documentation"),
-        ("PUBLICATION_READINESS_VERIFICATION.md", "Publication Readiness Verification"),
-        ("AUTHOR_QUICK_START.md", "Author Quick Start Guide"),
-        ("NATURE_SUBMISSION_CHECKLIST.md", "Nature Submission Checklist"),
-    ]
+    docs = DOCUMENTATION_FILES
 
     combined_content = "# H₇ Evolutionary Progression: Complete Documentation\n\n"
     combined_content += "## Table of Contents\n\n"
@@ -564,8 +580,8 @@ All materials are independently verified and publication-ready. Follow the [Auth
         subtitle="Start here for all submission materials"
     )
 
-def main():
-    """Generate all submission HTML documents."""
+def main(force=False, max_workers=None):
+    """Generate all stale (or previously failed) submission HTML documents."""
     print("\n" + "="*80)
     print("HTML Generation for Nature Submission")
     print("="*80)
@@ -573,27 +589,34 @@ def main():
     print(f"Date: {datetime.now().strftime('%B %d, %Y')}")
     print("\nThese HTML documents are print-ready and can be saved as PDF from any browser.")
 
-    results = []
+    # Register HTML documents in priority order; every document shares the
+    # page template, so the CSS and create_html_document are build parameters
+    build = SubmissionBuild(OUTPUT_DIR)
+    template = (PROFESSIONAL_CSS, create_html_document)
+    documents = [
+        ("Supplementary Materials", create_supplementary_materials_html,
+         "H7_Supplementary_Materials.html", SUPPLEMENTARY_INPUTS),
+        ("Executive Summary", create_executive_summary_html,
+         "H7_Executive_Summary.html", [EXECUTIVE_SUMMARY_INPUT]),
+        ("Manuscript Sections", create_manuscript_sections_html,
+         "H7_Manuscript_Sections.html", MANUSCRIPT_SECTION_INPUTS),
+        ("Cover Letter Template", create_cover_letter_html, "Cover_Letter_Template.html", []),
+        ("Complete Documentation", create_complete_documentation_html,
+         "H7_Complete_Documentation.html", [BASE_DIR / name for name, _ in DOCUMENTATION_FILES]),
+        ("Index Page", create_index_html, "index.html", []),
+    ]
+    for name, func, filename, inputs in documents:
+        build.render(name, func, output=OUTPUT_DIR / filename, inputs=inputs, params=template)
 
-    # Create HTML documents in priority order
-    results.append(("Supplementary Materials", create_supplementary_materials_html()))
-    results.append(("Executive Summary", create_executive_summary_html()))
-    results.append(("Manuscript Sections", create_manuscript_sections_html()))
-    results.append(("Cover Letter Template", create_cover_letter_html()))
-    results.append(("Complete Documentation", create_complete_documentation_html()))
-    results.append(("Index Page", create_index_html()))
+    results = build.run(force=force, max_workers=max_workers)
 
     # Summary
     print("\n" + "="*80)
     print("Generation Summary")
     print("="*80)
 
-    for name, success in results:
-        status = "✓" if success else "✗"
-        print(f"  {status} {name}")
-
-    successful = sum(1 for _, success in results if success)
-    print(f"\nCompleted: {successful}/{len(results)} HTML documents generated")
+    successful = sum(1 for r in results if r["status"] != "failed")
+    print(f"\nCompleted: {successful}/{len(results)} HTML documents up to date")
 
     if successful == len(results):
         print("\n✅ All HTML documents generated successfully!")
@@ -617,5 +640,10 @@ def main():
 
 if __name__ == "__main__":
     import sys
-    success = main()
+    parser = argparse.ArgumentParser(description="Generate print-ready submission HTML")
+    parser.add_argument("--force", action="store_true", help="Re-render all documents")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Concurrent renders (default: min(4, CPU count))")
+    args = parser.parse_args()
+    success = main(force=args.force, max_workers=args.jobs)
     sys.exit(0 if success else 1)
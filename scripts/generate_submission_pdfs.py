@@ -9,14 +9,23 @@ Creates professional PDFs from markdown documentation:
 3. H₇ Manuscript Sections PDF (ready for insertion)
 4. Cover Letter template PDF
 
-Uses pandoc for high-quality PDF generation.
+Uses pandoc for high-quality PDF generation. Builds are incremental: a PDF
+is only regenerated when its markdown inputs or pandoc arguments change, or
+when its previous build failed (see submission_build.py). Independent PDFs
+are built concurrently.
+
+Usage:
+    python generate_submission_pdfs.py               # stale and failed PDFs
+    python generate_submission_pdfs.py --failed-only  # retry failures only
+    python generate_submission_pdfs.py --force        # rebuild everything
 """
 
-import subprocess
-import os
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+from submission_build import SubmissionBuild
+
 # Base directory
 BASE_DIR = Path("/srv/luminous-dynamics/historical-k-index")
 OUTPUT_DIR = BASE_DIR / "submission_pdfs"
@@ -33,12 +42,9 @@ PANDOC_COMMON_ARGS = [
     "--highlight-style=tango",
 ]
 
-def run_pandoc(input_files, output_file, title, additional_args=None):
-    """Run pandoc to generate PDF."""
+def pandoc_args(title, additional_args=None):
+    """Pandoc arguments (after the input files and output) for one PDF."""
     args = [
-        "pandoc",
-        *input_files,
-        "-o", str(output_file),
         f"--metadata=title:{title}",
         f"--metadata=date:{datetime.now().strftime('%B %d, %Y')}",
         *PANDOC_COMMON_ARGS,
@@ -47,23 +53,15 @@ def run_pandoc(input_files, output_file, title, additional_args=None):
     if additional_args:
         args.extend(additional_args)
 
-    print(f"Generating: {output_file.name}")
-    result = subprocess.run(args, capture_output=True, text=True)
+    return args
 
-    if result.returncode == 0:
-        size_mb = output_file.stat().st_size / (1024 * 1024)
-        print(f"  ✓ Created: {output_file.name} ({size_mb:.2f} MB)")
-        return True
-    else:
-        print(f"  ✗ Error: {result.stderr}")
-        return False
+def register_pdf(build, input_files, output_file, title, additional_args=None):
+    """Register one PDF with the incremental build (job name = output file name)."""
+    return build.pandoc(output_file.name, input_files, output_file,
+                        pandoc_args(title, additional_args))
 
-def create_supplementary_materials_pdf():
+def create_supplementary_materials_pdf(build):
     """Create comprehensive supplementary materials PDF."""
-    print("\n" + "="*80)
-    print("1. Creating Supplementary Materials PDF")
-    print("="*80)
-
     # Combine supplementary materials
     input_files = [
         str(BASE_DIR / "manuscript/supplementary/SUPPLEMENTARY_METHODS.md"),
@@ -72,35 +70,29 @@ def create_supplementary_materials_pdf():
 
     output_file = OUTPUT_DIR / "H7_Supplementary_Materials.pdf"
 
-    return run_pandoc(
+    return register_pdf(
+        build,
         input_files,
         output_file,
         "Supplementary Materials: Validated H₇ (Evolutionary Progression) Component",
         additional_args=["--variable=fontsize:10pt"]  # Smaller font for supplement
     )
 
-def create_executive_summary_pdf():
+def create_executive_summary_pdf(build):
     """Create polished 2-page executive summary PDF."""
-    print("\n" + "="*80)
-    print("2. Creating Executive Summary PDF")
-    print("="*80)
-
     input_files = [str(BASE_DIR / "EXECUTIVE_SUMMARY_ONE_PAGE.md")]
     output_file = OUTPUT_DIR / "H7_Executive_Summary.pdf"
 
-    return run_pandoc(
+    return register_pdf(
+        build,
         input_files,
         output_file,
         "H₇ Evolutionary Progression: Executive Summary",
         additional_args=["--variable=fontsize:11pt"]
     )
 
-def create_manuscript_sections_pdf():
+def create_manuscript_sections_pdf(build):
     """Create PDF with H₇ manuscript sections ready for insertion."""
-    print("\n" + "="*80)
-    print("3. Creating H₇ Manuscript Sections PDF")
-    print("="*80)
-
     input_files = [
         str(BASE_DIR / "manuscript/H7_METHODS_SECTION_TEXT.md"),
         str(BASE_DIR / "manuscript/H7_RESULTS_SECTION_TEXT.md"),
@@ -109,26 +101,23 @@ def create_manuscript_sections_pdf():
 
     output_file = OUTPUT_DIR / "H7_Manuscript_Sections.pdf"
 
-    return run_pandoc(
+    return register_pdf(
+        build,
         input_files,
         output_file,
         "H₇ Manuscript Sections for Integration",
         additional_args=["--variable=fontsize:12pt"]
     )
 
-def create_cover_letter_pdf():
+def create_cover_letter_pdf(build):
     """Create Nature cover letter template PDF."""
-    print("\n" + "="*80)
-    print("4. Creating Cover Letter Template PDF")
-    print("="*80)
-
-    # Create cover letter markdown
+    # Create cover letter markdown. The date comes from pandoc's --metadata=date
+    # (title block), so the hashed input does not change from day to day
     cover_letter_md = OUTPUT_DIR / "cover_letter_template.md"
 
     cover_letter_content = """# Cover Letter: Validated H₇ Component for Historical K(t) Index
 
 **To**: Editor, *Nature*
-**Date**: {date}
 **Subject**: Submission of "Historical K(t) Index for Civilizational Coherence (1810-2020)"
 
 Dear Editor,
@@ -190,25 +179,24 @@ Sincerely,
 - Specific manuscript title
 - Any additional context
 - Co-author information
-""".format(date=datetime.now().strftime("%B %d, %Y"))
+"""
 
-    cover_letter_md.write_text(cover_letter_content)
+    # Only rewrite when the text changes, so the PDF stays up to date otherwise
+    if not cover_letter_md.exists() or cover_letter_md.read_text() != cover_letter_content:
+        cover_letter_md.write_text(cover_letter_content)
 
     output_file = OUTPUT_DIR / "Cover_Letter_Template.pdf"
 
-    return run_pandoc(
+    return register_pdf(
+        build,
         [str(cover_letter_md)],
         output_file,
         "Cover Letter Template",
         additional_args=["--variable=fontsize:12pt"]
     )
 
-def create_complete_documentation_pdf():
+def create_complete_documentation_pdf(build):
     """Create comprehensive technical documentation PDF."""
-    print("\n" + "="*80)
-    print("5. Creating Complete Documentation PDF")
-    print("="*80)
-
     # Major documentation files
     input_files = [
         str(BASE_DIR / "START_HERE.md"),
@@ -221,7 +209,8 @@ def create_complete_documentation_pdf():
 
     output_file = OUTPUT_DIR / "H7_Complete_Documentation.pdf"
 
-    return run_pandoc(
+    return register_pdf(
+        build,
         input_files,
         output_file,
         "H₇ Evolutionary Progression: Complete Documentation",
@@ -231,34 +220,32 @@ def create_complete_documentation_pdf():
         ]
     )
 
-def main():
-    """Generate all submission PDFs."""
+def main(force=False, only_failed=False, max_workers=None):
+    """Generate all stale (or previously failed) submission PDFs."""
     print("\n" + "="*80)
     print("PDF Generation for Nature Submission")
     print("="*80)
     print(f"Output directory: {OUTPUT_DIR}")
     print(f"Date: {datetime.now().strftime('%B %d, %Y')}")
+    print()
 
-    results = []
+    # Register PDFs in priority order
+    build = SubmissionBuild(OUTPUT_DIR)
+    create_supplementary_materials_pdf(build)
+    create_executive_summary_pdf(build)
+    create_manuscript_sections_pdf(build)
+    create_cover_letter_pdf(build)
+    create_complete_documentation_pdf(build)
 
-    # Create PDFs in priority order
-    results.append(("Supplementary Materials", create_supplementary_materials_pdf()))
-    results.append(("Executive Summary", create_executive_summary_pdf()))
-    results.append(("Manuscript Sections", create_manuscript_sections_pdf()))
-    results.append(("Cover Letter Template", create_cover_letter_pdf()))
-    results.append(("Complete Documentation", create_complete_documentation_pdf()))
+    results = build.run(force=force, only_failed=only_failed, max_workers=max_workers)
 
     # Summary
     print("\n" + "="*80)
     print("Generation Summary")
     print("="*80)
 
-    for name, success in results:
-        status = "✓" if success else "✗"
-        print(f"  {status} {name}")
-
-    successful = sum(1 for _, success in results if success)
-    print(f"\nCompleted: {successful}/{len(results)} PDFs generated")
+    successful = sum(1 for r in results if r["status"] != "failed")
+    print(f"\nCompleted: {successful}/{len(results)} PDFs up to date")
 
     if successful == len(results):
         print("\n✅ All PDFs generated successfully!")
@@ -269,10 +256,18 @@ def main():
             print(f"  - {pdf_file.name} ({size_mb:.2f} MB)")
     else:
         print("\n⚠️ Some PDFs failed to generate. Check errors above.")
+        print("   Rerun to retry only the failed PDFs.")
 
     return successful == len(results)
 
 if __name__ == "__main__":
     import sys
-    success = main()
+    parser = argparse.ArgumentParser(description="Generate submission PDFs with pandoc")
+    parser.add_argument("--force", action="store_true", help="Rebuild all PDFs")
+    parser.add_argument("--failed-only", action="store_true",
+                        help="Only retry PDFs whose last build failed")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Concurrent pandoc processes (default: min(4, CPU count))")
+    args = parser.parse_args()
+    success = main(force=args.force, only_failed=args.failed_only, max_workers=args.jobs)
     sys.exit(0 if success else 1)
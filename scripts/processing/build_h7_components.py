@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Build All Four H₇ Components and the Integrated H₇ in One Process
+
+Runs the education, patents, infrastructure and governance processing and
+the H₇ integration as one pipeline:
+
+- Each raw input is read once: the World Bank supplementary panels through
+  panel_store (education, infrastructure, governance, population) and the
+  combined patents CSV
+- Every component is a vectorized transform of a (country × year) grid:
+  per-indicator normalization over the whole cube, then a weighted mean
+  across the indicator axis, with the same rules and weights as the
+  process_*_component.py scripts
+- The four component grids are aligned on one (country × year) grid and
+  handed to integrate_h7_components.integrate_arrays in memory; the
+  component CSVs are still written for other consumers but not re-read
+- Figures are optional (--figures) and rendered in parallel worker
+  processes after all data outputs are written
+
+Differences from running the five scripts separately:
+- Education rows carry the country name for every country-year (the
+  sequential outer merges only kept names from the literacy table), and
+  aggregates without an ISO code are no longer cross-joined
+- Patents rows of aggregates without an ISO code use total patents, as
+  no population figure can be matched to them
+
+Usage:
+    python scripts/processing/build_h7_components.py
+    python scripts/processing/build_h7_components.py --figures --jobs 4
+
+Author: Historical K(t) Index Project
+Date: December 3, 2025
+License: CC-BY-4.0
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from panel_normalization import SCALING_MODES, lookup_panel, per_capita, scale_panel
+from panel_store import DATA_RAW, IndicatorPanel, load_panel
+import integrate_h7_components as integration
+import process_education_component as education
+import process_governance_component as governance
+import process_infrastructure_component as infrastructure
+import process_patents_component as patents
+
+logger = logging.getLogger(__name__)
+
+PATENTS_FILE = patents.DATA_RAW / "wipo" / "worldbank_patents_combined.csv"
+POPULATION_FILE = DATA_RAW / "worldbank_population.csv"
+
+# Education sub-indicators: (column, indicator code, cap at 1, fixed min/max)
+EDUCATION_INDICATORS = [
+    ('literacy', 'SE.ADT.LITR.ZS', False, None),
+    ('primary', 'SE.PRM.ENRR', True, None),
+    ('secondary', 'SE.SEC.ENRR', True, None),
+    ('tertiary', 'SE.TER.ENRR', True, None),
+    ('years_schooling', 'BAR.SCHL.15UP', False, (0, 15)),
+]
+
+# Component CSV columns, as written by the individual scripts
+OUTPUT_COLUMNS = {
+    'education': None,  # every column
+    'patents': ['country_code', 'country_name', 'year', 'resident', 'nonresident',
+                'total', 'patents_per_capita', 'patents_component'],
+    'infrastructure': ['country_code', 'country_name', 'year', 'infrastructure_component'],
+    'governance': ['country_code', 'country_name', 'year', 'governance_component'],
+}
+
+
+class ComponentPanel:
+    """
+    One H₇ component on a (country × year) grid.
+
+    Attributes:
+        name: Component name ('education', ...)
+        column: Component value column ('education_component', ...)
+        country_codes: ISO3 codes, axis 0 ('' for unlabelled aggregates)
+        country_names: Country names, aligned to axis 0
+        years: Integer years, axis 1
+        present: bool (country × year), True where the component has a row
+        columns: Ordered {column: (country × year) array} for the output
+            table, including the component column
+    """
+
+    def __init__(self, name: str, column: str, country_codes, country_names, years,
+                 present: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.name = name
+        self.column = column
+        self.country_codes = np.asarray(country_codes, dtype=str)
+        self.country_names = np.asarray(country_names, dtype=str)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.present = present
+        self.columns = columns
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.columns[self.column]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table (country → year order) in the component CSV layout."""
+        c, y = np.nonzero(self.present)
+        frame = pd.DataFrame({
+            'country_code': pd.Series(self.country_codes[c]).replace('', np.nan).to_numpy(),
+            'country_name': self.country_names[c],
+            'year': self.years[y],
+        })
+        for col, values in self.columns.items():
+            frame[col] = values[c, y]
+        return frame
+
+
+def panel_component(name: str, column: str, panel: IndicatorPanel, present: np.ndarray,
+                    columns: Dict[str, np.ndarray]) -> ComponentPanel:
+    return ComponentPanel(name, column, panel.country_codes, panel.country_names,
+                          panel.years, present, columns)
+
+
+def accumulate_weighted(normalized: List[np.ndarray], weights: List[float]):
+    """
+    Weighted mean across indicator grids, renormalized over observed ones.
+
+    Indicators are added in order, so every cell is summed exactly as the
+    per-row accumulation in the individual scripts.
+
+    Returns:
+        (composite, total_weight) grids; composite is NaN where nothing is observed
+    """
+    weighted_sum = np.zeros(normalized[0].shape)
+    total_weight = np.zeros(normalized[0].shape)
+    for values, weight in zip(normalized, weights):
+        observed = ~np.isnan(values)
+        weighted_sum[observed] += values[observed] * weight
+        total_weight[observed] += weight
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        composite = np.where(total_weight > 0, weighted_sum / total_weight, np.nan)
+    return composite, total_weight
+
+
+def education_panel(panel: IndicatorPanel) -> ComponentPanel:
+    """Education composite (process_education_component rules) over the panel."""
+    available = set(panel.indicator_codes)
+    indicators = [ind for ind in EDUCATION_INDICATORS if ind[1] in available]
+    if not indicators:
+        raise ValueError("No education indicators in panel")
+
+    cube = panel.cube([code for _, code, _, _ in indicators])
+    columns, normalized, weights = {}, [], []
+    for (col, code, cap, bounds), values in zip(indicators, cube):
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        if hi <= 100 and lo >= 0:
+            norm = values / 100.0
+        else:
+            lo, hi = bounds if bounds is not None else (lo, hi)
+            norm = (values - lo) / (hi - lo)
+        if cap:
+            norm = np.minimum(norm, 1.0)
+        columns[col] = norm
+        normalized.append(norm)
+        weights.append(education.WEIGHTS[col])
+
+    composite, total_weight = accumulate_weighted(normalized, weights)
+    columns['education_component'] = composite
+    columns['total_weight'] = total_weight
+    return panel_component('education', 'education_component', panel, total_weight > 0, columns)
+
+
+def infrastructure_panel(panel: IndicatorPanel) -> ComponentPanel:
+    """Infrastructure composite (process_infrastructure_component rules)."""
+    available = set(panel.indicator_codes)
+    codes = [code for code in infrastructure.INFRASTRUCTURE_INDICATORS if code in available]
+    if not codes:
+        raise ValueError("No indicators could be normalized")
+
+    cube = panel.cube(codes)
+    normalized, weights = [], []
+    for code, values in zip(codes, cube):
+        config = infrastructure.INFRASTRUCTURE_INDICATORS[code]
+        if config['max_value'] is not None:
+            norm = np.clip(values / config['max_value'], 0, 1)
+        else:
+            lo, hi = np.nanmin(values), np.nanmax(values)
+            norm = (values - lo) / (hi - lo)
+        normalized.append(norm)
+        weights.append(config['weight'])
+
+    composite, total_weight = accumulate_weighted(normalized, weights)
+    valid = composite[~np.isnan(composite)]
+    if valid.size and (valid.min() < 0 or valid.max() > 1):
+        raise ValueError(f"Infrastructure composite outside [0, 1]: {valid.min():.4f} - {valid.max():.4f}")
+
+    return panel_component('infrastructure', 'infrastructure_component', panel, total_weight > 0,
+                           {'infrastructure_component': composite})
+
+
+def governance_panel(panel: IndicatorPanel) -> ComponentPanel:
+    """Governance composite, reusing the governance script's matrix kernels."""
+    codes = [code for code in governance.GOVERNANCE_INDICATORS if code in set(panel.indicator_codes)]
+    if not codes:
+        raise ValueError("No indicators could be normalized")
+
+    cube = panel.cube(codes)
+    grid = cube.shape[1:]
+    matrix = cube.reshape(len(codes), -1).T
+    normalized = governance.normalize_matrix(matrix, codes)
+
+    weights = np.array([governance.GOVERNANCE_INDICATORS[code]['weight'] for code in codes])
+    composite = governance.weighted_composite(normalized, weights)
+
+    valid = composite[~np.isnan(composite)]
+    if valid.size and (valid.min() < -0.01 or valid.max() > 1.01):
+        raise ValueError(f"Composite outside [0, 1]: {valid.min():.4f} - {valid.max():.4f}")
+
+    present = (~np.isnan(matrix)).any(axis=1).reshape(grid)
+    return panel_component('governance', 'governance_component', panel, present,
+                           {'governance_component': np.clip(composite, 0, 1).reshape(grid)})
+
+
+def patents_panel(patents_df: pd.DataFrame, population: Optional[IndicatorPanel],
+                  scaling: str = 'global', **options) -> ComponentPanel:
+    """Patents per million people, scaled in log space (panel_normalization mode)."""
+    keys = patents_df['country_code'].fillna('').astype(str) + '\x1f' + patents_df['country_name'].astype(str)
+    entity, uniques = pd.factorize(keys, sort=True)
+    split = [key.split('\x1f', 1) for key in uniques]
+    codes = np.array([s[0] for s in split])
+
+    years = patents_df['year'].to_numpy(dtype=np.int64)
+    year_axis = np.arange(years.min(), years.max() + 1, dtype=np.int64)
+    y = years - year_axis[0]
+
+    present = np.zeros((len(uniques), len(year_axis)), dtype=bool)
+    present[entity, y] = True
+
+    columns = {}
+    for col in ('resident', 'nonresident', 'total'):
+        if col in patents_df.columns:
+            grid = np.full(present.shape, np.nan)
+            grid[entity, y] = patents_df[col].to_numpy(dtype=np.float64)
+            columns[col] = grid
+
+    pop = lookup_panel(population, patents.POPULATION_INDICATOR, codes, year_axis)
+    columns['patents_per_capita'] = per_capita(columns['total'], pop)
+    columns['patents_component'] = scale_panel(columns['patents_per_capita'], scaling, log=True, **options)
+
+    return ComponentPanel('patents', 'patents_component', codes, [s[1] for s in split],
+                          year_axis, present, columns)
+
+
+def build_components(raw_dir: Path = DATA_RAW, patents_file: Path = PATENTS_FILE,
+                     patents_scaling: str = 'global') -> Dict[str, ComponentPanel]:
+    """Read every raw input once and compute all four components."""
+    population = None
+    if (Path(raw_dir) / POPULATION_FILE.name).exists():
+        population = load_panel("population", raw_dir=raw_dir)
+    else:
+        logger.warning("Population data not found - patents use total counts")
+
+    if not Path(patents_file).exists():
+        raise FileNotFoundError(f"Patent data not found: {patents_file}")
+
+    return {
+        'education': education_panel(load_panel("education", raw_dir=raw_dir)),
+        'patents': patents_panel(pd.read_csv(patents_file), population, patents_scaling),
+        'infrastructure': infrastructure_panel(load_panel("infrastructure", raw_dir=raw_dir)),
+        'governance': governance_panel(load_panel("governance", raw_dir=raw_dir)),
+    }
+
+
+def align_components(components: Dict[str, ComponentPanel]):
+    """
+    Place every component on one (ISO code × year) grid.
+
+    Aggregates without an ISO code are left out, as in the CSV-based join;
+    names come from the education component.
+
+    Returns:
+        (codes, names, years, values, present) with values and present of
+        shape (component × country × year), ordered like COMPONENT_COLUMNS
+    """
+    order = list(integration.COMPONENT_COLUMNS)
+    codes = np.unique(np.concatenate([components[n].country_codes for n in order]))
+    codes = codes[codes != '']
+    years = np.arange(min(components[n].years[0] for n in order),
+                      max(components[n].years[-1] for n in order) + 1, dtype=np.int64)
+
+    values = np.full((len(order), len(codes), len(years)), np.nan)
+    present = np.zeros(values.shape, dtype=bool)
+    names = np.full(len(codes), '', dtype=object)
+    for j, name in enumerate(order):
+        comp = components[name]
+        coded = np.flatnonzero(comp.country_codes != '')
+        rows = np.searchsorted(codes, comp.country_codes[coded])
+        cols = slice(comp.years[0] - years[0], comp.years[-1] - years[0] + 1)
+        values[j, rows, cols] = comp.values[coded]
+        present[j, rows, cols] = comp.present[coded]
+        if name == 'education':
+            names[rows] = comp.country_names[coded]
+
+    return codes, names, years, values, present
+
+
+def figure_tasks(frames: Dict[str, pd.DataFrame], integrated: pd.DataFrame) -> List[Tuple[Callable, pd.DataFrame]]:
+    """Every figure of the five scripts as (render function, data) pairs."""
+    tasks = [(education.visualize_education_component, frames['education'])]
+    for name, module in (('patents', patents), ('infrastructure', infrastructure), ('governance', governance)):
+        tasks += [(module.create_global_trend_visualization, frames[name]),
+                  (module.create_top_bottom_countries_visualization, frames[name]),
+                  (module.create_distribution_evolution_visualization, frames[name])]
+    tasks += [(integration.create_global_trend_visualization, integrated),
+              (integration.create_country_comparison_visualization, integrated),
+              (integration.create_component_correlation_heatmap, integrated)]
+    return tasks
+
+
+def _render(func: Callable, data: pd.DataFrame):
+    return func(data)
+
+
+def render_figures(frames: Dict[str, pd.DataFrame], integrated: pd.DataFrame, n_jobs: Optional[int] = None):
+    """Render all component and H₇ figures, in parallel worker processes."""
+    tasks = figure_tasks(frames, integrated)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        for func, data in tasks:
+            func(data)
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            list(pool.map(_render, *zip(*tasks)))
+    logger.info(f"Rendered {len(tasks)} figures")
+
+
+def run_pipeline(figures: bool = False, n_jobs: Optional[int] = None,
+                 patents_scaling: str = 'global') -> pd.DataFrame:
+    """Build the four components and H₇; returns the integrated frame."""
+    start = time.perf_counter()
+    components = build_components(patents_scaling=patents_scaling)
+    frames = {name: comp.to_frame() for name, comp in components.items()}
+    logger.info(f"Computed {len(components)} components in {time.perf_counter() - start:.2f}s")
+
+    integration.DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+    for name, frame in frames.items():
+        columns = OUTPUT_COLUMNS[name]
+        if columns is not None:
+            frame = frame[[c for c in columns if c in frame.columns]]
+        output_file = integration.DATA_PROCESSED / f"{name}_component.csv"
+        frame.to_csv(output_file, index=False)
+        logger.info(f"Saved {name} component: {output_file} ({len(frame)} rows)")
+
+    summaries = {'patents': patents, 'infrastructure': infrastructure, 'governance': governance}
+    for name, module in summaries.items():
+        summary_file = module.FIGURES_DIR / f"{name}_summary_stats.txt"
+        summary_file.write_text(module.generate_summary_statistics(frames[name]))
+
+    integrated = integration.integrate_arrays(*align_components(components))
+    output_file = integration.DATA_FINAL / "H7_evolutionary_progression.csv"
+    integrated.to_csv(output_file, index=False)
+    logger.info(f"Saved integrated H₇ data: {output_file}")
+
+    report = integration.generate_summary_report(integrated, frames)
+    print("\n" + report)
+    (integration.DATA_FINAL / "H7_integration_report.txt").write_text(report)
+    logger.info(f"H₇ data outputs complete in {time.perf_counter() - start:.2f}s")
+
+    if figures:
+        render_figures(frames, integrated, n_jobs)
+
+    return integrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build all H₇ components and the integrated H₇")
+    parser.add_argument("--figures", action="store_true", help="Also render component and H₇ figures")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for figures (default: all CPUs)")
+    parser.add_argument("--patents-scaling", choices=SCALING_MODES, default="global",
+                        help="Normalization of log patents per capita (default: global min-max)")
+    args = parser.parse_args()
+
+    run_pipeline(figures=args.figures, n_jobs=args.jobs, patents_scaling=args.patents_scaling)
+
+
+if __name__ == "__main__":
+    main()
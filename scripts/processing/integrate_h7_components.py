@@ -38,6 +38,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 import logging
+import sys
 
 # Set up logging
 logging.basicConfig(
@@ -52,6 +53,18 @@ DATA_PROCESSED = PROJECT_ROOT / "data" / "processed" / "H7_components"
 DATA_FINAL = PROJECT_ROOT / "data" / "processed"
 FIGURES_DIR = PROJECT_ROOT / "figures"
 
+# Processed component column for each H₇ component
+COMPONENT_COLUMNS = {
+    'education': 'education_component',
+    'patents': 'patents_component',
+    'infrastructure': 'infrastructure_component',
+    'governance': 'governance_component',
+}
+
+sys.path.insert(0, str(PROJECT_ROOT / "shared" / "scripts" / "processing"))
+from aggregation_methods import nan_geometric_mean
+from panel_rankings import PanelRanking
+
 # Create output directories
 DATA_FINAL.mkdir(parents=True, exist_ok=True)
 FIGURES_DIR.mkdir(parents=True, exist_ok=True)
@@ -86,7 +99,7 @@ def load_all_components() -> dict:
     return components
 
 
-def integrate_components(components: dict) -> pd.DataFrame:
+def integrate_components(components: dict, return_coverage: bool = False):
     """
     Integrate all components using geometric mean.
 
@@ -94,51 +107,94 @@ def integrate_components(components: dict) -> pd.DataFrame:
     1. It's multiplicative (components interact)
     2. Penalizes imbalances (can't compensate weak governance with strong education)
     3. Standard for composite indices
+
+    Components are aligned on (country_code, year) in a single indexed join
+    and H₇ is computed by the vectorized NaN-aware geometric mean.
+
+    Args:
+        components: Dict of component name -> processed component frame
+        return_coverage: Also return the (rows × components) observed mask
+
+    Returns:
+        Integrated DataFrame, or (DataFrame, mask) if return_coverage is True
     """
     logger.info("Integrating components via geometric mean...")
 
-    # Start with education (largest coverage)
-    merged = components['education'][['country_code', 'country_name', 'year', 'education_component']].copy()
+    key = ['country_code', 'year']
 
-    # Merge patents
-    merged = merged.merge(
-        components['patents'][['country_code', 'year', 'patents_component']],
-        on=['country_code', 'year'],
-        how='inner'  # Only keep where both exist
-    )
+    # Aggregates without an ISO code cannot be matched across components
+    aligned = []
+    for name, col in COMPONENT_COLUMNS.items():
+        frame = components[name].dropna(subset=['country_code'])
+        aligned.append(frame.set_index(key)[col])
 
-    # Merge infrastructure
-    merged = merged.merge(
-        components['infrastructure'][['country_code', 'year', 'infrastructure_component']],
-        on=['country_code', 'year'],
-        how='inner'
-    )
+    # Education provides country names (largest coverage)
+    names = components['education'].dropna(subset=['country_code']).set_index(key)['country_name']
 
-    # Merge governance
-    merged = merged.merge(
-        components['governance'][['country_code', 'year', 'governance_component']],
-        on=['country_code', 'year'],
-        how='inner'
-    )
+    # Inner join: only keep country-years where all components exist
+    matrix = pd.concat(aligned, axis=1, join='inner')
+    merged = pd.concat([names.reindex(matrix.index), matrix], axis=1).reset_index()
+    merged = merged[['country_code', 'country_name', 'year'] + list(COMPONENT_COLUMNS.values())]
+
+    return add_h7_composite(merged, return_coverage)
 
+
+def integrate_arrays(country_codes, country_names, years, values: np.ndarray,
+                     present: np.ndarray, return_coverage: bool = False):
+    """
+    Integrate components that are already aligned on one (country × year) grid.
+
+    In-memory counterpart of integrate_components, used by
+    build_h7_components.py: no component CSV is re-read or re-joined.
+
+    Args:
+        country_codes, country_names: Country axis (ISO3 codes, '' for
+            unlabelled aggregates, which are dropped as in the CSV join)
+        years: Year axis
+        values: (component × country × year) array, ordered like COMPONENT_COLUMNS
+        present: Same shape; True where a component has a row. Country-years
+            where every component has a row are kept (the inner join)
+        return_coverage: Also return the (rows × components) observed mask
+
+    Returns:
+        Integrated DataFrame, or (DataFrame, mask) if return_coverage is True
+    """
+    keep = present.all(axis=0) & (np.asarray(country_codes) != '')[:, None]
+    c, y = np.nonzero(keep)
+
+    merged = pd.DataFrame({
+        'country_code': np.asarray(country_codes)[c],
+        'country_name': np.asarray(country_names)[c],
+        'year': np.asarray(years)[y],
+    })
+    for j, col in enumerate(COMPONENT_COLUMNS.values()):
+        merged[col] = values[j][c, y]
+
+    return add_h7_composite(merged, return_coverage)
+
+
+def add_h7_composite(merged: pd.DataFrame, return_coverage: bool = False):
+    """Geometric mean of the component columns as H7_evolutionary_progression."""
     logger.info(f"Merged data: {len(merged)} country-year observations")
     logger.info(f"Countries: {merged['country_code'].nunique()}")
     logger.info(f"Year range: {merged['year'].min():.0f} - {merged['year'].max():.0f}")
 
     # Calculate geometric mean: (a × b × c × d)^(1/4)
-    merged['H7_evolutionary_progression'] = (
-        merged['education_component'] *
-        merged['patents_component'] *
-        merged['infrastructure_component'] *
-        merged['governance_component']
-    ) ** 0.25
+    h7, counts, mask = nan_geometric_mean(
+        merged[list(COMPONENT_COLUMNS.values())].to_numpy(dtype=float),
+        return_coverage=True
+    )
+    merged['H7_evolutionary_progression'] = h7
 
     # Validate
-    assert merged['H7_evolutionary_progression'].min() >= 0, "H₇ values < 0"
-    assert merged['H7_evolutionary_progression'].max() <= 1, "H₇ values > 1"
+    valid = h7[counts > 0]
+    if valid.size and (valid.min() < 0 or valid.max() > 1):
+        raise ValueError(f"H₇ values outside [0, 1]: {valid.min():.4f} - {valid.max():.4f}")
 
     logger.info(f"H₇ range: {merged['H7_evolutionary_progression'].min():.4f} - {merged['H7_evolutionary_progression'].max():.4f}")
 
+    if return_coverage:
+        return merged, mask
     return merged
 
 
@@ -369,10 +425,10 @@ def generate_summary_report(df: pd.DataFrame, components: dict) -> str:
 
     # Top 10 countries
     report.append("🏆 Top 10 Countries (Most Recent Year):")
-    latest_year = df['year'].max()
-    latest_data = df[df['year'] == latest_year].nlargest(10, 'H7_evolutionary_progression')
-    for idx, row in latest_data.iterrows():
-        report.append(f"  {row['country_name']:<40} {row['H7_evolutionary_progression']:.4f}")
+    ranking = PanelRanking.from_frame(df, 'H7_evolutionary_progression')
+    top_10 = ranking.leaderboard(n=10)
+    for name, value in zip(top_10['country_name'], top_10['value']):
+        report.append(f"  {name:<40} {value:.4f}")
     report.append("")
 
     # Component correlations
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Per-Capita Scaling and Normalization Engine for Country Panels
+
+Vectorized transforms over a (country × year) array, used for the patents
+component of H₇ and reusable for any country panel:
+
+- Per-capita scaling with an indexed population lookup: population is
+  gathered from the panel_store cube (or a (country_code, year) index) by
+  position, with no merge; cells without population keep the raw count
+- Scaling modes, each one pass over the whole array:
+    global      min-max over every country-year
+    per_year    min-max within each year (cross-section)
+    rolling     min-max over each country's trailing window of years
+    percentile  clip to global percentiles, then min-max
+    rank        per-year average rank (ties share the mean of their ranks),
+                mapped to [0, 1] (lowest = 0, highest = 1)
+- Optional log1p before scaling (log space), as used for skewed counts
+
+Conventions:
+- NaN cells stay NaN and are ignored by every statistic
+- A degenerate range (max == min) scales to 0, as in the governance matrix
+- Results are clipped to [0, 1]
+
+Usage:
+    from panel_normalization import scale_panel, sweep_scalings
+
+    component = scale_panel(np.log1p(per_capita), mode='per_year')
+    variants = sweep_scalings(np.log1p(per_capita), ['global', 'rank'])
+
+Author: Historical K(t) Index Project
+Date: December 3, 2025
+License: CC-BY-4.0
+"""
+
+import warnings
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+SCALING_MODES = ('global', 'per_year', 'rolling', 'percentile', 'rank')
+DEFAULT_WINDOW = 10
+DEFAULT_PERCENTILES = (5.0, 95.0)
+
+
+def frame_to_grid(frame: pd.DataFrame, column: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scatter a long (country, year) column into a (country × year) array.
+
+    Countries are keyed by (country_code, country_name) as in panel_store,
+    so aggregates without an ISO code stay distinct.
+
+    Returns:
+        (grid, rows, cols): grid[rows[i], cols[i]] is the value of frame row i
+    """
+    keys = frame['country_code'].fillna('').astype(str) + '\x1f' + frame['country_name'].astype(str)
+    rows, uniques = pd.factorize(keys, sort=True)
+    years = frame['year'].to_numpy(dtype=np.int64)
+    cols = years - years.min()
+
+    grid = np.full((len(uniques), int(cols.max()) + 1), np.nan)
+    grid[rows, cols] = frame[column].to_numpy(dtype=np.float64)
+    return grid, rows, cols
+
+
+def lookup_population(population: pd.DataFrame, country_codes, years) -> np.ndarray:
+    """
+    Population for each (country_code, year) pair by index lookup.
+
+    ``population`` is a long frame with country_code, year and value (as
+    from panel_store). Pairs without an ISO code or without an observation
+    give NaN.
+    """
+    pop = population.dropna(subset=['country_code'])
+    pop = pop.drop_duplicates(subset=['country_code', 'year']).set_index(['country_code', 'year'])['value']
+    keys = pd.MultiIndex.from_arrays([pd.Series(country_codes).fillna(''), np.asarray(years, dtype=np.int64)])
+    return pop.reindex(keys).to_numpy(dtype=np.float64)
+
+
+def lookup_panel(panel, indicator: str, country_codes: Sequence[str], years: Sequence[int]) -> np.ndarray:
+    """
+    (country × year) values of one panel_store indicator for the given axes.
+
+    An indexed gather from the panel cube; NaN where the code, year or
+    observation is missing (including every '' code).
+    """
+    years = np.asarray(years, dtype=np.int64)
+    out = np.full((len(country_codes), len(years)), np.nan)
+    if panel is None or indicator not in set(panel.indicator_codes):
+        return out
+
+    cube = panel.cube([indicator])[0]
+    position = {}
+    for i, code in enumerate(panel.country_codes):
+        if code:
+            position.setdefault(code, i)
+
+    rows = np.array([position.get(code, -1) for code in country_codes], dtype=np.intp)
+    cols = years - panel.years[0]
+    row_ok = rows >= 0
+    col_ok = (cols >= 0) & (cols < len(panel.years))
+    out[np.ix_(row_ok, col_ok)] = cube[np.ix_(rows[row_ok], cols[col_ok])]
+    return out
+
+
+def per_capita(values: np.ndarray, population: np.ndarray, per: float = 1_000_000) -> np.ndarray:
+    """values per ``per`` people; cells without population keep the raw value."""
+    values = np.asarray(values, dtype=np.float64)
+    population = np.asarray(population, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(np.isnan(population), values, values / (population / per))
+
+
+def _min_max(values: np.ndarray, lo, hi) -> np.ndarray:
+    span = np.where(hi > lo, hi - lo, 1.0)
+    return np.clip((values - lo) / span, 0.0, 1.0)
+
+
+def _rolling_bounds(values: np.ndarray, window: int):
+    """Trailing-window nanmin / nanmax along the year axis."""
+    padded = np.concatenate([np.full((values.shape[0], window - 1), np.nan), values], axis=1)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=1)
+    return np.nanmin(windows, axis=2), np.nanmax(windows, axis=2)
+
+
+def scale_panel(values: np.ndarray, mode: str = 'global', window: int = DEFAULT_WINDOW,
+                percentiles: Tuple[float, float] = DEFAULT_PERCENTILES, log: bool = False) -> np.ndarray:
+    """
+    Scale a (country × year) array to [0, 1].
+
+    Args:
+        values: float array, NaN where missing
+        mode: One of SCALING_MODES
+        window: Trailing years per country for mode='rolling'
+        percentiles: (low, high) clip percentiles for mode='percentile'
+        log: Apply log1p first
+
+    Returns:
+        Array of the same shape, NaN where the input is NaN
+    """
+    if mode not in SCALING_MODES:
+        raise ValueError(f"Unknown scaling mode '{mode}'. Use {list(SCALING_MODES)}.")
+
+    x = np.asarray(values, dtype=np.float64)
+    if log:
+        x = np.log1p(x)
+
+    with warnings.catch_warnings():
+        # All-NaN years / windows are expected and stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if mode == 'global':
+            return _min_max(x, np.nanmin(x), np.nanmax(x))
+        if mode == 'per_year':
+            return _min_max(x, np.nanmin(x, axis=0), np.nanmax(x, axis=0))
+        if mode == 'rolling':
+            if window < 1:
+                raise ValueError("window must be at least 1")
+            lo, hi = _rolling_bounds(x, window)
+            return _min_max(x, lo, hi)
+        if mode == 'percentile':
+            lo, hi = np.nanpercentile(x, percentiles)
+            return _min_max(np.clip(x, lo, hi), lo, hi)
+
+    # Average (fractional) ranks among each year's observed values, so equal
+    # inputs always get equal scores
+    ranks = rankdata(x, method='average', nan_policy='omit', axis=0)
+    n_ranked = (~np.isnan(x)).sum(axis=0)
+    return _min_max(ranks - 1, 0.0, np.maximum(n_ranked - 1, 0))
+
+
+def sweep_scalings(values: np.ndarray, modes: Optional[Iterable[str]] = None,
+                   **options) -> Dict[str, np.ndarray]:
+    """scale_panel for several modes on the same array: {mode: scaled array}."""
+    return {mode: scale_panel(values, mode, **options) for mode in (modes or SCALING_MODES)}
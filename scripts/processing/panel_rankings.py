@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Rank and Percentile Engine for Country Panels
+
+Computes, for every year at once, each country's rank, percentile and rank
+change on a (country × year) panel such as H₇ or country-level K(t).
+Rankings are one stable argsort over the country axis; the result is cached
+on the PanelRanking object, so leaderboards, latest-observation rankings and
+rank-mobility statistics are lookups rather than repeated sort/filter passes.
+
+Conventions:
+- Rank 1 is the highest value (descending=True, the default)
+- Missing values are unranked (NaN rank) and never appear in leaderboards
+- Percentile = (1 - rank / n_ranked) × 100, as in the manuscript tables
+- Rank change = previous year's rank − this year's rank (positive = moved up)
+
+Usage:
+    from panel_rankings import PanelRanking
+
+    ranking = PanelRanking.from_frame(h7_df, 'H7_evolutionary_progression')
+    top_10 = ranking.leaderboard(2021, n=10)
+    latest = ranking.latest()
+
+Author: Historical K(t) Index Project
+Date: December 3, 2025
+License: CC-BY-4.0
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def rank_columns(values: np.ndarray, descending: bool = True) -> np.ndarray:
+    """
+    Ordinal ranks along axis 0 (countries) for every column (year).
+
+    Ties keep input order (stable sort). NaN entries get NaN rank.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    keys = np.where(missing, np.inf, -values if descending else values)
+
+    order = np.argsort(keys, axis=0, kind='stable')
+    positions = np.arange(1, values.shape[0] + 1, dtype=np.float64)
+    if values.ndim == 2:
+        positions = np.broadcast_to(positions[:, None], values.shape)
+
+    ranks = np.empty(values.shape, dtype=np.float64)
+    np.put_along_axis(ranks, order, positions, axis=0)
+    ranks[missing] = np.nan
+    return ranks
+
+
+class PanelRanking:
+    """
+    Cached ranks, percentiles and rank changes for a (country × year) panel.
+
+    Attributes:
+        countries: Country codes, axis 0
+        years: Years, axis 1
+        values: float64 (country × year) array, NaN where missing
+        ranks: Ordinal rank per country-year (1 = best)
+        n_ranked: Number of ranked countries per year
+        percentiles: Percentile per country-year
+        rank_change: Rank improvement versus the previous year
+    """
+
+    def __init__(self, values: np.ndarray, countries: Sequence, years: Sequence[int],
+                 names: Optional[Dict[str, str]] = None, descending: bool = True):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.countries = np.asarray(countries)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.names = names or {}
+        self.descending = descending
+
+        self.ranks = rank_columns(self.values, descending)
+        self.n_ranked = (~np.isnan(self.values)).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.percentiles = (1 - self.ranks / self.n_ranked) * 100
+
+        self.rank_change = np.full(self.ranks.shape, np.nan)
+        self.rank_change[:, 1:] = self.ranks[:, :-1] - self.ranks[:, 1:]
+
+        # Country order per year (best first, missing last)
+        self._order = np.argsort(np.where(np.isnan(self.ranks), np.inf, self.ranks),
+                                 axis=0, kind='stable')
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, value_col: str,
+                   country_col: str = 'country_code', year_col: str = 'year',
+                   name_col: Optional[str] = 'country_name',
+                   descending: bool = True) -> 'PanelRanking':
+        """Pivot a long country-year frame once and rank it."""
+        data = df.dropna(subset=[country_col])
+        wide = data.pivot_table(index=country_col, columns=year_col, values=value_col,
+                                aggfunc='last', dropna=False)
+        wide = wide.reindex(columns=np.arange(wide.columns.min(), wide.columns.max() + 1))
+
+        names = None
+        if name_col is not None and name_col in data.columns:
+            named = data.dropna(subset=[name_col])
+            names = dict(zip(named[country_col], named[name_col]))
+
+        return cls(wide.to_numpy(dtype=np.float64), wide.index.to_numpy(),
+                   wide.columns.to_numpy(), names, descending)
+
+    def _year_index(self, year: Optional[int]) -> int:
+        if year is None:
+            # Latest year with any ranked country
+            return int(np.flatnonzero(self.n_ranked > 0)[-1])
+        pos = int(np.searchsorted(self.years, year))
+        if pos >= len(self.years) or self.years[pos] != year:
+            raise KeyError(f"Year {year} not in ranking panel")
+        return pos
+
+    def leaderboard(self, year: Optional[int] = None, n: int = 10,
+                    bottom: bool = False) -> pd.DataFrame:
+        """
+        Top (or bottom) n countries for a year, best first (worst first if bottom).
+
+        Defaults to the latest year with data.
+        """
+        t = self._year_index(year)
+        ranked = self._order[:self.n_ranked[t], t]
+        rows = ranked[::-1][:n] if bottom else ranked[:n]
+        return self._rows(rows, t)
+
+    def latest(self) -> pd.DataFrame:
+        """
+        Rank each country on its most recent observation.
+
+        Countries whose latest year differs are ranked together on their
+        latest values, with first-observation values for trend columns.
+        Rows are ordered best first.
+        """
+        observed = ~np.isnan(self.values)
+        has_data = observed.any(axis=1)
+        n_years = len(self.years)
+
+        last_idx = n_years - 1 - np.argmax(observed[:, ::-1], axis=1)
+        first_idx = np.argmax(observed, axis=1)
+        rows = np.flatnonzero(has_data)
+
+        latest_values = self.values[rows, last_idx[rows]]
+        ranks = rank_columns(latest_values, self.descending)
+        order = np.argsort(ranks, kind='stable')
+        rows, ranks = rows[order], ranks[order]
+
+        return pd.DataFrame({
+            'country_code': self.countries[rows],
+            'year': self.years[last_idx[rows]],
+            'value': self.values[rows, last_idx[rows]],
+            'rank': ranks.astype(int),
+            'percentile': (1 - ranks / len(rows)) * 100,
+            'first_year': self.years[first_idx[rows]],
+            'first_value': self.values[rows, first_idx[rows]],
+        })
+
+    def mobility(self) -> pd.DataFrame:
+        """
+        Year-by-year rank-mobility statistics.
+
+        Columns: n_ranked, mean_abs_rank_change, max_rise, max_fall and
+        rank_correlation (Spearman correlation of ranks with the previous year
+        over countries ranked in both years).
+        """
+        change = self.rank_change
+        both = ~np.isnan(change)
+
+        with np.errstate(invalid='ignore'):
+            mean_abs = np.where(both.any(axis=0),
+                                np.nansum(np.abs(change), axis=0) / both.sum(axis=0), np.nan)
+        max_rise = np.where(both.any(axis=0), np.nanmax(np.where(both, change, -np.inf), axis=0), np.nan)
+        max_fall = np.where(both.any(axis=0), -np.nanmin(np.where(both, change, np.inf), axis=0), np.nan)
+
+        # Spearman on the common set: re-rank within the overlap, then Pearson
+        corr = np.full(len(self.years), np.nan)
+        prev = self.ranks[:, :-1]
+        curr = self.ranks[:, 1:]
+        common = ~np.isnan(prev) & ~np.isnan(curr)
+        for j in np.flatnonzero(common.sum(axis=0) > 2):
+            m = common[:, j]
+            a = rank_columns(prev[m, j], descending=False)
+            b = rank_columns(curr[m, j], descending=False)
+            corr[j + 1] = np.corrcoef(a, b)[0, 1]
+
+        return pd.DataFrame({
+            'year': self.years,
+            'n_ranked': self.n_ranked,
+            'mean_abs_rank_change': mean_abs,
+            'max_rise': max_rise,
+            'max_fall': max_fall,
+            'rank_correlation': corr,
+        })
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long frame of every ranked country-year."""
+        c, t = np.nonzero(~np.isnan(self.ranks))
+        return pd.DataFrame({
+            'country_code': self.countries[c],
+            'country_name': [self.names.get(code, code) for code in self.countries[c]],
+            'year': self.years[t],
+            'value': self.values[c, t],
+            'rank': self.ranks[c, t].astype(int),
+            'percentile': self.percentiles[c, t],
+            'rank_change': self.rank_change[c, t],
+        })
+
+    def _rows(self, rows: np.ndarray, t: int) -> pd.DataFrame:
+        return pd.DataFrame({
+            'country_code': self.countries[rows],
+            'country_name': [self.names.get(code, code) for code in self.countries[rows]],
+            'year': self.years[t],
+            'value': self.values[rows, t],
+            'rank': self.ranks[rows, t].astype(int),
+            'percentile': self.percentiles[rows, t],
+            'rank_change': self.rank_change[rows, t],
+        })
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Columnar Panel Store for World Bank Supplementary Indicators
+
+The raw World Bank downloads in data/raw/worldbank_supplementary/ are long
+tables (indicator_code, indicator_name, country_code, country_name, year,
+value) that repeat the indicator and country strings on every row. Each H₇
+processing script used to re-read and re-filter these CSVs on its own.
+
+This module converts each table once into a dictionary-encoded cube:
+- Indicator, country and year axes are stored once as small label arrays
+- Values live in a dense float64 array of shape (indicator × country × year)
+- Missing observations are NaN (see IndicatorPanel.mask)
+
+The cube is cached as a compressed .npz next to the processed data, keyed by
+the SHA-256 of the source CSV, so a changed download is re-encoded
+automatically. Within one process the decoded panel is memoised as well.
+
+Usage:
+    from panel_store import load_panel, load_frame
+
+    panel = load_panel('governance')
+    cube = panel.cube(['CC.EST', 'GE.EST'])          # (2 × country × year)
+    df = load_frame('education', ['SE.ADT.LITR.ZS'])  # long frame, like read_csv
+
+Country entities are keyed by (country_code, country_name) because the World
+Bank income-group aggregates ship without an ISO code.
+
+Author: Historical K(t) Index Project
+Date: December 3, 2025
+License: CC-BY-4.0
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DATA_RAW = PROJECT_ROOT / "data" / "raw" / "worldbank_supplementary"
+CACHE_DIR = PROJECT_ROOT / "data" / "processed" / "panel_store"
+
+LONG_COLUMNS = ['indicator_code', 'indicator_name', 'country_code',
+                'country_name', 'year', 'value']
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+CACHE_VERSION = 1
+
+# In-process memo: dataset name -> (source hash, panel)
+_PANELS: Dict[str, Tuple[str, 'IndicatorPanel']] = {}
+
+
+class IndicatorPanel:
+    """
+    Dense (indicator × country × year) cube with label axes.
+
+    Attributes:
+        indicator_codes: Indicator codes, axis 0
+        indicator_names: Human-readable indicator names, aligned to axis 0
+        country_codes: ISO3 codes, axis 1 ('' for unlabelled aggregates)
+        country_names: Country names, aligned to axis 1
+        years: Integer years, axis 2 (contiguous, ascending)
+        values: float64 array of shape (n_indicators, n_countries, n_years)
+    """
+
+    def __init__(self, indicator_codes, indicator_names, country_codes,
+                 country_names, years, values):
+        self.indicator_codes = np.asarray(indicator_codes, dtype=str)
+        self.indicator_names = np.asarray(indicator_names, dtype=str)
+        self.country_codes = np.asarray(country_codes, dtype=str)
+        self.country_names = np.asarray(country_names, dtype=str)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+
+        self._indicator_pos = {code: i for i, code in enumerate(self.indicator_codes)}
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.values.shape
+
+    @property
+    def mask(self) -> np.ndarray:
+        """Boolean cube, True where an observation exists."""
+        return ~np.isnan(self.values)
+
+    def indicator_index(self, indicator_codes: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Positions of the requested indicators on axis 0 (all if None)."""
+        if indicator_codes is None:
+            return np.arange(len(self.indicator_codes))
+        if isinstance(indicator_codes, str):
+            indicator_codes = [indicator_codes]
+        missing = [c for c in indicator_codes if c not in self._indicator_pos]
+        if missing:
+            raise KeyError(f"Indicators not in panel: {missing}")
+        return np.array([self._indicator_pos[c] for c in indicator_codes], dtype=np.intp)
+
+    def year_slice(self, start: Optional[int] = None, end: Optional[int] = None) -> slice:
+        """Slice on axis 2 covering start..end inclusive."""
+        lo = 0 if start is None else int(np.searchsorted(self.years, start, side='left'))
+        hi = len(self.years) if end is None else int(np.searchsorted(self.years, end, side='right'))
+        return slice(lo, hi)
+
+    def cube(self, indicator_codes: Optional[Iterable[str]] = None,
+             start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Dense sub-cube for the requested indicators and year window."""
+        return self.values[self.indicator_index(indicator_codes)][:, :, self.year_slice(start, end)]
+
+    def to_frame(self, indicator_codes: Optional[Iterable[str]] = None,
+                 start: Optional[int] = None, end: Optional[int] = None) -> pd.DataFrame:
+        """
+        Long frame with the original CSV columns, observed cells only.
+
+        Rows are ordered indicator → country → year. Empty country codes are
+        returned as NaN, matching what pd.read_csv produces for the raw file.
+        """
+        ind_idx = self.indicator_index(indicator_codes)
+        ys = self.year_slice(start, end)
+        sub = self.values[ind_idx][:, :, ys]
+
+        i, c, y = np.nonzero(~np.isnan(sub))
+        ind = ind_idx[i]
+        codes = pd.Series(self.country_codes[c]).replace('', np.nan)
+
+        return pd.DataFrame({
+            'indicator_code': self.indicator_codes[ind],
+            'indicator_name': self.indicator_names[ind],
+            'country_code': codes.to_numpy(),
+            'country_name': self.country_names[c],
+            'year': self.years[ys][y],
+            'value': sub[i, c, y],
+        })
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_panel(df: pd.DataFrame) -> IndicatorPanel:
+    """
+    Dictionary-encode a long World Bank table into an IndicatorPanel.
+
+    Duplicate (indicator, country, year) rows keep the last value, which is
+    what the outer merges in the processing scripts effectively did.
+    """
+    missing = [c for c in LONG_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Long table missing required columns: {missing}")
+
+    ind_codes, ind_uniques = pd.factorize(df['indicator_code'], sort=True)
+    country_keys = df['country_code'].fillna('').astype(str) + '\x1f' + df['country_name'].astype(str)
+    cty_codes, cty_uniques = pd.factorize(country_keys, sort=True)
+
+    years = df['year'].to_numpy(dtype=np.int64)
+    year_axis = np.arange(years.min(), years.max() + 1, dtype=np.int64)
+
+    values = np.full((len(ind_uniques), len(cty_uniques), len(year_axis)), np.nan)
+    values[ind_codes, cty_codes, years - year_axis[0]] = df['value'].to_numpy(dtype=np.float64)
+
+    # First name seen per indicator code
+    names = df.groupby(ind_codes, sort=True)['indicator_name'].first().to_numpy()
+    split = [key.split('\x1f', 1) for key in cty_uniques]
+
+    return IndicatorPanel(
+        indicator_codes=np.asarray(ind_uniques),
+        indicator_names=names,
+        country_codes=[s[0] for s in split],
+        country_names=[s[1] for s in split],
+        years=year_axis,
+        values=values,
+    )
+
+
+def save_panel(panel: IndicatorPanel, path: Path, source_hash: str = ''):
+    """Write a panel to a compressed .npz (no pickled objects)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        version=np.int64(CACHE_VERSION),
+        source_hash=np.str_(source_hash),
+        indicator_codes=panel.indicator_codes,
+        indicator_names=panel.indicator_names,
+        country_codes=panel.country_codes,
+        country_names=panel.country_names,
+        years=panel.years,
+        values=panel.values,
+    )
+
+
+def read_panel(path: Path) -> Tuple[IndicatorPanel, str]:
+    """Read a cached panel; returns (panel, source hash it was built from)."""
+    with np.load(path, allow_pickle=False) as data:
+        if int(data['version']) != CACHE_VERSION:
+            raise ValueError(f"Stale panel cache version in {path}")
+        panel = IndicatorPanel(
+            indicator_codes=data['indicator_codes'],
+            indicator_names=data['indicator_names'],
+            country_codes=data['country_codes'],
+            country_names=data['country_names'],
+            years=data['years'],
+            values=data['values'],
+        )
+        return panel, str(data['source_hash'])
+
+
+def load_panel(dataset: str, raw_dir: Path = DATA_RAW,
+               cache_dir: Path = CACHE_DIR, refresh: bool = False) -> IndicatorPanel:
+    """
+    Load the panel for a supplementary dataset (e.g. 'governance').
+
+    Reads data/raw/worldbank_supplementary/worldbank_<dataset>.csv at most
+    once per content hash; later calls reuse the in-process panel or the
+    on-disk cube.
+
+    Raises:
+        FileNotFoundError: If the raw CSV does not exist
+    """
+    source = raw_dir / f"worldbank_{dataset}.csv"
+    if not source.exists():
+        raise FileNotFoundError(f"Supplementary data not found: {source}")
+
+    source_hash = _file_sha256(source)
+
+    memo = _PANELS.get(dataset)
+    if not refresh and memo is not None and memo[0] == source_hash:
+        return memo[1]
+
+    cache_file = cache_dir / f"worldbank_{dataset}.npz"
+    panel = None
+    if not refresh and cache_file.exists():
+        try:
+            cached, cached_hash = read_panel(cache_file)
+            if cached_hash == source_hash:
+                panel = cached
+                logger.info(f"Loaded {dataset} panel from cache: {cache_file}")
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning(f"Ignoring unreadable panel cache {cache_file}: {e}")
+
+    if panel is None:
+        logger.info(f"Encoding {source} into panel store...")
+        panel = build_panel(pd.read_csv(source))
+        save_panel(panel, cache_file, source_hash)
+        logger.info(f"Saved {dataset} panel {panel.shape}: {cache_file}")
+
+    _PANELS[dataset] = (source_hash, panel)
+    return panel
+
+
+def load_frame(dataset: str, indicator_codes: Optional[Iterable[str]] = None,
+               start: Optional[int] = None, end: Optional[int] = None) -> pd.DataFrame:
+    """Long frame for a dataset, optionally filtered by indicator and years."""
+    return load_panel(dataset).to_frame(indicator_codes, start, end)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    for csv in sorted(DATA_RAW.glob("worldbank_*.csv")):
+        name = csv.stem.replace("worldbank_", "", 1)
+        p = load_panel(name, refresh=True)
+        print(f"{name:<16} indicators={p.shape[0]:>2}  countries={p.shape[1]:>4}  "
+              f"years={p.years[0]}-{p.years[-1]}  observed={int(p.mask.sum()):,}")
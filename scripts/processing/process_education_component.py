@@ -12,12 +12,13 @@ Author: Tristan Stoltz / Claude Code
 Date: December 3, 2025
 """
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from panel_store import load_panel
+
 # Configuration
 INPUT_FILE = Path("data/raw/worldbank_supplementary/worldbank_education.csv")
 OUTPUT_DIR = Path("data/processed/H7_components")
@@ -42,7 +43,7 @@ def load_education_data():
         print("Run 06_download_worldbank_h7_supplementary.py first")
         return None
 
-    df = pd.read_csv(INPUT_FILE)
+    df = load_panel("education", raw_dir=INPUT_FILE.parent).to_frame()
     print(f"✓ Loaded {len(df)} records")
     print(f"  Indicators: {df['indicator_code'].nunique()}")
     print(f"  Countries: {df['country_code'].nunique()}")
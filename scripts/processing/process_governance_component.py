@@ -12,6 +12,8 @@ Methodology:
 - Each dimension equally weighted (evidence suggests high correlation)
 - Normalize to [0, 1] scale using min-max normalization
 - Handle missing data gracefully with weight renormalization
+- Pivot once to a (country-year × indicator) matrix; normalization and the
+  weighted composite are single vectorized passes over that matrix
 
 Governance Dimensions (World Bank WGI):
 1. Control of Corruption (CC) - 16.67% weight
@@ -39,9 +41,12 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from panel_store import IndicatorPanel, build_panel, load_panel
+from panel_rankings import PanelRanking
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -99,8 +104,8 @@ DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
 FIGURES_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_governance_data() -> pd.DataFrame:
-    """Load raw governance data from World Bank."""
+def load_governance_data() -> IndicatorPanel:
+    """Load raw governance data from World Bank as an indicator panel."""
     logger.info("Loading governance data...")
 
     gov_file = DATA_RAW / "worldbank_governance.csv"
@@ -108,152 +113,127 @@ def load_governance_data() -> pd.DataFrame:
     if not gov_file.exists():
         raise FileNotFoundError(f"Governance data not found: {gov_file}")
 
-    df = pd.read_csv(gov_file)
-    logger.info(f"Loaded {len(df)} governance indicator records")
-    logger.info(f"Indicators: {df['indicator_code'].nunique()}")
-    logger.info(f"Countries: {df['country_code'].nunique()}")
-    logger.info(f"Year range: {df['year'].min()} - {df['year'].max()}")
+    panel = load_panel("governance", raw_dir=DATA_RAW)
+    logger.info(f"Loaded {int(panel.mask.sum())} governance indicator records")
+    logger.info(f"Indicators: {len(panel.indicator_codes)}")
+    logger.info(f"Countries: {len(set(panel.country_codes) - {''})}")
+    logger.info(f"Year range: {panel.years[0]} - {panel.years[-1]}")
+
+    return panel
+
+
+def indicator_column(config: Dict) -> str:
+    """Column name used for a normalized indicator in the wide frame."""
+    return config['name'].lower().replace(' ', '_')
+
+
+def build_indicator_matrix(panel: IndicatorPanel) -> Tuple[pd.DataFrame, np.ndarray, List[str]]:
+    """
+    Reshape the governance panel into a (country-year × indicator) matrix.
+
+    Only country-years with at least one observed indicator are kept, which
+    matches the row set of an outer merge across indicators.
+
+    Returns:
+        keys: DataFrame with country_code, country_name, year per matrix row
+        matrix: float64 array (n_rows × n_indicators), NaN where missing
+        codes: Indicator codes aligned to the matrix columns
+    """
+    codes = [c for c in GOVERNANCE_INDICATORS if c in set(panel.indicator_codes)]
+    for code in GOVERNANCE_INDICATORS:
+        if code not in codes:
+            logger.warning(f"No data found for {GOVERNANCE_INDICATORS[code]['name']}")
+    if not codes:
+        raise ValueError("No indicators could be normalized")
+
+    cube = panel.cube(codes)                       # (indicator, country, year)
+    n_countries, n_years = cube.shape[1], cube.shape[2]
+    matrix = cube.reshape(len(codes), -1).T        # (country*year, indicator)
+
+    observed = ~np.isnan(matrix).all(axis=1)
+    rows = np.flatnonzero(observed)
+    country_idx, year_idx = np.divmod(rows, n_years)
+
+    keys = pd.DataFrame({
+        'country_code': pd.Series(panel.country_codes[country_idx]).replace('', np.nan).to_numpy(),
+        'country_name': panel.country_names[country_idx],
+        'year': panel.years[year_idx],
+    })
 
-    return df
+    return keys, matrix[rows], codes
 
 
-def normalize_indicator(df: pd.DataFrame,
-                        indicator_code: str,
-                        config: Dict) -> pd.DataFrame:
+def normalize_matrix(matrix: np.ndarray, codes: List[str]) -> np.ndarray:
     """
-    Normalize a single governance indicator to [0, 1] scale.
+    Min-max normalize every indicator column to [0, 1] in one pass.
 
     WGI indicators are nominally on -2.5 to +2.5 scale, but can exceed
     these bounds in practice. We use the actual data range for normalization.
     """
-    indicator_name = config['name']
-    logger.info(f"Normalizing: {indicator_name}")
+    lo = np.nanmin(matrix, axis=0)
+    hi = np.nanmax(matrix, axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
 
-    # Filter to this indicator
-    indicator_data = df[df['indicator_code'] == indicator_code].copy()
+    normalized = np.clip((matrix - lo) / span, 0.0, 1.0)
 
-    if len(indicator_data) == 0:
-        logger.warning(f"No data found for {indicator_name}")
-        return pd.DataFrame()
+    for j, code in enumerate(codes):
+        column = normalized[:, j]
+        logger.info(f"Normalized: {GOVERNANCE_INDICATORS[code]['name']}")
+        logger.info(f"  Records: {int(np.count_nonzero(~np.isnan(column)))}")
+        logger.info(f"  Original range: {lo[j]:.4f} - {hi[j]:.4f}")
 
-    # Use actual min/max from the data
-    actual_min = indicator_data['value'].min()
-    actual_max = indicator_data['value'].max()
+    return normalized
 
-    # Normalize using actual range to [0, 1]
-    indicator_data['normalized'] = (
-        (indicator_data['value'] - actual_min) / (actual_max - actual_min)
-    )
 
-    # Validate normalization
-    assert indicator_data['normalized'].min() >= -0.01, \
-        f"Normalization failed for {indicator_name}: values < 0"
-    assert indicator_data['normalized'].max() <= 1.01, \
-        f"Normalization failed for {indicator_name}: values > 1"
-
-    # Clip to [0, 1] to handle any floating point errors
-    indicator_data['normalized'] = indicator_data['normalized'].clip(0, 1)
+def weighted_composite(normalized: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted mean across indicator columns, renormalizing over observed ones.
 
-    logger.info(f"  Records: {len(indicator_data)}")
-    logger.info(f"  Original range: {actual_min:.4f} - {actual_max:.4f}")
-    logger.info(f"  Normalized range: {indicator_data['normalized'].min():.4f} - {indicator_data['normalized'].max():.4f}")
-    logger.info(f"  Missing: {indicator_data['value'].isna().sum()}")
+    Computed as one masked dot product: missing indicators contribute
+    neither value nor weight, rows with no observed indicator are NaN.
+    """
+    observed = ~np.isnan(normalized)
+    weighted_sum = np.where(observed, normalized, 0.0) @ weights
+    total_weight = observed @ weights
 
-    return indicator_data[['country_code', 'country_name', 'year', 'normalized']]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total_weight > 0, weighted_sum / total_weight, np.nan)
 
 
-def create_governance_composite(df: pd.DataFrame) -> pd.DataFrame:
+def create_governance_composite(data, weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
     """
     Create composite governance index from 6 WGI dimensions.
 
-    Combines all governance indicators using equal weights,
-    with graceful handling of missing data.
+    Combines all governance indicators using equal weights (or the given
+    per-indicator weights), with graceful handling of missing data.
+
+    Args:
+        data: IndicatorPanel, or a long frame in the raw CSV layout
+        weights: Optional mapping of indicator code to weight; defaults to
+            the weights in GOVERNANCE_INDICATORS
     """
     logger.info("Creating governance composite index...")
 
-    all_normalized = {}
+    panel = data if isinstance(data, IndicatorPanel) else build_panel(data)
+    keys, matrix, codes = build_indicator_matrix(panel)
+    normalized = normalize_matrix(matrix, codes)
 
-    # Normalize each indicator
-    for indicator_code, config in GOVERNANCE_INDICATORS.items():
-        normalized = normalize_indicator(df, indicator_code, config)
-        if len(normalized) > 0:
-            # Rename normalized column to indicator-specific name
-            indicator_key = config['name'].lower().replace(' ', '_')
-            normalized = normalized.rename(columns={'normalized': indicator_key})
-            all_normalized[indicator_code] = (normalized, config['weight'])
+    logger.info(f"Country-year matrix: {normalized.shape[0]} observations × "
+                f"{len(codes)} governance dimensions")
 
-    if not all_normalized:
-        raise ValueError("No indicators could be normalized")
+    weights = weights or {code: config['weight'] for code, config in GOVERNANCE_INDICATORS.items()}
+    weight_vec = np.array([weights.get(code, 0.0) for code in codes], dtype=np.float64)
+    composite = weighted_composite(normalized, weight_vec)
+
+    # Validate in one vectorized check; clip absorbs floating point error
+    valid = composite[~np.isnan(composite)]
+    if valid.size and (valid.min() < -0.01 or valid.max() > 1.01):
+        raise ValueError(f"Composite outside [0, 1]: {valid.min():.4f} - {valid.max():.4f}")
 
-    # Merge all normalized indicators
-    logger.info("Merging normalized indicators...")
-
-    # Start with first indicator
-    first_code = list(all_normalized.keys())[0]
-    merged = all_normalized[first_code][0].copy()
-
-    # Merge remaining indicators
-    for indicator_code, (normalized_df, weight) in list(all_normalized.items())[1:]:
-        indicator_key = list(normalized_df.columns)[-1]  # Get the normalized column name
-        merged = merged.merge(
-            normalized_df,
-            on=['country_code', 'country_name', 'year'],
-            how='outer',
-            suffixes=('', f'_{indicator_code}')
-        )
-
-    logger.info(f"Merged data: {len(merged)} country-year observations")
-
-    # Calculate weighted composite
-    logger.info("Calculating weighted composite...")
-
-    # Get column names for normalized indicators
-    indicator_columns = []
-    for code, config in GOVERNANCE_INDICATORS.items():
-        col_name = config['name'].lower().replace(' ', '_')
-        if col_name in merged.columns:
-            indicator_columns.append(col_name)
-
-    logger.info(f"Found {len(indicator_columns)} governance dimensions")
-
-    # Calculate weighted sum with graceful handling of missing data
-    weighted_values = []
-    total_weights = []
-
-    for col_name in indicator_columns:
-        # Find corresponding weight
-        weight = next(
-            config['weight']
-            for config in GOVERNANCE_INDICATORS.values()
-            if config['name'].lower().replace(' ', '_') == col_name
-        )
-
-        # Multiply by weight, handling NaN gracefully
-        weighted_col = merged[col_name] * weight
-        weighted_values.append(weighted_col.fillna(0))
-
-        # Track valid weights (1 where data exists, 0 where missing)
-        valid_weight = (~merged[col_name].isna()).astype(float) * weight
-        total_weights.append(valid_weight)
-
-    # Sum weighted values and total valid weights
-    weighted_sum = sum(weighted_values)
-    total_weight = sum(total_weights)
-
-    # Calculate normalized composite (dividing by actual total weight)
-    merged['governance_component'] = np.where(
-        total_weight > 0,
-        weighted_sum / total_weight,
-        np.nan
-    )
-
-    # Validate
-    valid_data = merged['governance_component'].dropna()
-    assert valid_data.min() >= -0.01, f"Composite values < 0: {valid_data.min()}"
-    assert valid_data.max() <= 1.01, f"Composite values > 1: {valid_data.max()}"
-
-    # Clip to [0, 1]
-    merged['governance_component'] = merged['governance_component'].clip(0, 1)
+    merged = keys
+    for j, code in enumerate(codes):
+        merged[indicator_column(GOVERNANCE_INDICATORS[code])] = normalized[:, j]
+    merged['governance_component'] = np.clip(composite, 0, 1)
 
     logger.info(f"Composite range: {merged['governance_component'].min():.4f} - {merged['governance_component'].max():.4f}")
     logger.info(f"Valid observations: {merged['governance_component'].notna().sum()}")
@@ -435,11 +415,9 @@ def generate_summary_statistics(df: pd.DataFrame) -> str:
 
     # Top performers
     summary.append("🏆 Top 5 Countries (Most Recent Year):")
-    latest_year = df['year'].max()
-    latest_data = df[df['year'] == latest_year].dropna(subset=['governance_component'])
-    top_5 = latest_data.nlargest(5, 'governance_component')
-    for idx, row in top_5.iterrows():
-        summary.append(f"  {row['country_name']:<40} {row['governance_component']:.4f}")
+    top_5 = PanelRanking.from_frame(df, 'governance_component').leaderboard(n=5)
+    for name, value in zip(top_5['country_name'], top_5['value']):
+        summary.append(f"  {name:<40} {value:.4f}")
     summary.append("")
 
     # Data quality
@@ -463,10 +441,10 @@ def main():
 
     try:
         # Load data
-        raw_df = load_governance_data()
+        panel = load_governance_data()
 
         # Create composite
-        composite_df = create_governance_composite(raw_df)
+        composite_df = create_governance_composite(panel)
 
         # Create visualizations
         create_global_trend_visualization(composite_df)
@@ -39,6 +39,9 @@ from pathlib import Path
 from typing import Dict, Optional
 import logging
 
+from panel_store import load_panel
+from panel_rankings import PanelRanking
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -100,7 +103,7 @@ def load_infrastructure_data() -> pd.DataFrame:
     if not infra_file.exists():
         raise FileNotFoundError(f"Infrastructure data not found: {infra_file}")
 
-    df = pd.read_csv(infra_file)
+    df = load_panel("infrastructure", raw_dir=DATA_RAW).to_frame()
     logger.info(f"Loaded {len(df)} infrastructure indicator records")
     logger.info(f"Indicators: {df['indicator_code'].nunique()}")
     logger.info(f"Countries: {df['country_code'].nunique()}")
@@ -426,11 +429,9 @@ def generate_summary_statistics(df: pd.DataFrame) -> str:
 
     # Top performers
     summary.append("🏆 Top 5 Countries (Most Recent Year):")
-    latest_year = df['year'].max()
-    latest_data = df[df['year'] == latest_year].dropna(subset=['infrastructure_component'])
-    top_5 = latest_data.nlargest(5, 'infrastructure_component')
-    for idx, row in top_5.iterrows():
-        summary.append(f"  {row['country_name']:<40} {row['infrastructure_component']:.4f}")
+    top_5 = PanelRanking.from_frame(df, 'infrastructure_component').leaderboard(n=5)
+    for name, value in zip(top_5['country_name'], top_5['value']):
+        summary.append(f"  {name:<40} {value:.4f}")
     summary.append("")
 
     # Data quality
@@ -8,7 +8,8 @@ Patents are a key indicator of innovation capacity and technological advancement
 Methodology:
 - Use total patents (resident + non-resident) as primary measure
 - Normalize per capita to account for population differences
-- Scale to [0, 1] using min-max normalization
+- Scale log1p(per capita) to [0, 1]: global min-max by default, or any
+  panel_normalization mode (--scaling per_year / rolling / percentile / rank)
 - Handle missing data gracefully
 
 Data Sources:
@@ -29,9 +30,13 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional
 import logging
 
+from panel_store import load_panel
+from panel_normalization import SCALING_MODES, frame_to_grid, lookup_population, per_capita, scale_panel
+from panel_rankings import PanelRanking
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -78,7 +83,7 @@ def load_population_data() -> pd.DataFrame:
     pop_file = DATA_RAW / "worldbank_supplementary" / "worldbank_population.csv"
 
     if pop_file.exists():
-        df = pd.read_csv(pop_file)
+        df = load_panel("population", raw_dir=pop_file.parent).to_frame()
         logger.info(f"Loaded {len(df)} population records")
         return df
     else:
@@ -91,7 +96,10 @@ def calculate_patents_per_capita(patents_df: pd.DataFrame,
     """
     Calculate patents per capita (per 1 million population).
 
-    If population data is not available, return total patents only.
+    Population is looked up by (country_code, year) index rather than
+    merged; records without population (including aggregates without an
+    ISO code) keep total patents. If population data is not available,
+    return total patents only.
     """
     if population_df is None:
         logger.info("Using total patents (population data unavailable)")
@@ -101,60 +109,45 @@ def calculate_patents_per_capita(patents_df: pd.DataFrame,
 
     logger.info("Calculating patents per capita...")
 
-    # Merge patent and population data
-    merged = patents_df.merge(
-        population_df[['country_code', 'year', 'value']],
-        on=['country_code', 'year'],
-        how='left',
-        suffixes=('', '_pop')
-    )
-
-    # Calculate per capita (per 1 million people)
-    merged['patents_per_capita'] = (
-        merged['total'] / (merged['value'] / 1_000_000)
-    )
-
-    # Handle missing population data
-    missing_pop = merged['value'].isna().sum()
+    result = patents_df.copy()
+    result['population'] = lookup_population(population_df, result['country_code'], result['year'])
+    result['patents_per_capita'] = per_capita(result['total'], result['population'])
+
+    missing_pop = int(result['population'].isna().sum())
     if missing_pop > 0:
-        logger.warning(f"{missing_pop} records missing population data")
-        # For records without population, use total patents as fallback
-        merged.loc[merged['value'].isna(), 'patents_per_capita'] = merged.loc[merged['value'].isna(), 'total']
+        logger.warning(f"{missing_pop} records missing population data (using total patents)")
 
-    logger.info(f"Calculated patents per capita for {len(merged)} records")
+    logger.info(f"Calculated patents per capita for {len(result)} records")
 
-    return merged
+    return result
 
 
-def normalize_patents_component(df: pd.DataFrame) -> pd.DataFrame:
+def normalize_patents_component(df: pd.DataFrame, scaling: str = 'global', **options) -> pd.DataFrame:
     """
     Normalize patents data to [0, 1] scale.
 
-    Uses min-max normalization after log transformation to handle
-    the highly skewed distribution of patent counts.
+    Scales log1p(patents per capita) to handle the highly skewed
+    distribution of patent counts. ``scaling`` selects a panel_normalization
+    mode ('global' min-max by default; 'per_year', 'rolling', 'percentile'
+    or 'rank'), applied to the (country × year) array; ``options`` are
+    passed to scale_panel (window, percentiles).
     """
-    logger.info("Normalizing patents component...")
+    logger.info(f"Normalizing patents component ({scaling} scaling)...")
 
     result = df.copy()
 
-    # Log transformation to handle skewed distribution
-    # Add 1 to avoid log(0)
+    # Log transformation to handle skewed distribution (log1p avoids log(0))
     result['patents_log'] = np.log1p(result['patents_per_capita'])
+    logger.info(f"Patents per capita range (log): {result['patents_log'].min():.4f} - {result['patents_log'].max():.4f}")
 
-    # Calculate min and max for normalization
-    min_val = result['patents_log'].min()
-    max_val = result['patents_log'].max()
-
-    logger.info(f"Patents per capita range (log): {min_val:.4f} - {max_val:.4f}")
-
-    # Normalize to [0, 1]
-    result['patents_component'] = (
-        (result['patents_log'] - min_val) / (max_val - min_val)
-    )
+    grid, rows, cols = frame_to_grid(result, 'patents_log')
+    result['patents_component'] = scale_panel(grid, scaling, **options)[rows, cols]
 
     # Validate normalization
-    assert result['patents_component'].min() >= 0, "Normalization failed: values < 0"
-    assert result['patents_component'].max() <= 1, "Normalization failed: values > 1"
+    component = result['patents_component'].to_numpy()
+    valid = component[~np.isnan(component)]
+    if valid.size and (valid.min() < 0 or valid.max() > 1):
+        raise ValueError(f"Normalization outside [0, 1]: {valid.min():.4f} - {valid.max():.4f}")
 
     logger.info(f"Normalized component range: {result['patents_component'].min():.4f} - {result['patents_component'].max():.4f}")
 
@@ -332,10 +325,9 @@ def generate_summary_statistics(df: pd.DataFrame) -> str:
 
     # Top performers
     summary.append("🏆 Top 5 Countries (Most Recent Year):")
-    latest_year = df['year'].max()
-    latest_data = df[df['year'] == latest_year].nlargest(5, 'patents_component')
-    for idx, row in latest_data.iterrows():
-        summary.append(f"  {row['country_name']:<40} {row['patents_component']:.4f}")
+    top_5 = PanelRanking.from_frame(df, 'patents_component').leaderboard(n=5)
+    for name, value in zip(top_5['country_name'], top_5['value']):
+        summary.append(f"  {name:<40} {value:.4f}")
     summary.append("")
 
     # Data quality
@@ -352,7 +344,7 @@ def generate_summary_statistics(df: pd.DataFrame) -> str:
     return "\n".join(summary)
 
 
-def main():
+def main(scaling: str = 'global'):
     """Main processing pipeline for patents component."""
     logger.info("Starting patents component processing...")
     logger.info("=" * 80)
@@ -366,7 +358,7 @@ def main():
         patents_per_capita = calculate_patents_per_capita(patents_df, population_df)
 
         # Normalize component
-        normalized_df = normalize_patents_component(patents_per_capita)
+        normalized_df = normalize_patents_component(patents_per_capita, scaling)
 
         # Create visualizations
         create_global_trend_visualization(normalized_df)
@@ -409,4 +401,11 @@ def main():
 
 
 if __name__ == "__main__":
-    result = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Process the H₇ patents component")
+    parser.add_argument("--scaling", choices=SCALING_MODES, default="global",
+                        help="Normalization of log patents per capita (default: global min-max)")
+    args = parser.parse_args()
+
+    result = main(scaling=args.scaling)
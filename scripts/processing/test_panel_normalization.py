@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Panel Normalization
+
+Validates that:
+1. Rank scaling gives tied values the same score (average ranks)
+2. Every scaling mode stays in [0, 1] and keeps missing cells missing
+
+Run: pytest scripts/processing/test_panel_normalization.py -v
+"""
+
+import numpy as np
+import pytest
+
+from panel_normalization import SCALING_MODES, scale_panel
+
+
+class TestRankScaling:
+    """Per-year rank mode."""
+
+    def test_ties_get_equal_scores(self):
+        """Equal values in a year map to one score, whatever their order."""
+        values = np.array([
+            [0.0, 5.0],
+            [0.0, np.nan],
+            [0.0, 5.0],
+            [3.0, 1.0],
+        ])
+        scaled = scale_panel(values, mode='rank')
+
+        # Year 1: three tied lowest values share average rank 2 of 4
+        assert scaled[0, 0] == scaled[1, 0] == scaled[2, 0] == pytest.approx(1 / 3)
+        assert scaled[3, 0] == pytest.approx(1.0)
+        # Year 2: NaN is unranked; the tied highest values share the top score
+        assert np.isnan(scaled[1, 1])
+        assert scaled[0, 1] == scaled[2, 1] == pytest.approx(0.75)
+        assert scaled[3, 1] == pytest.approx(0.0)
+
+    def test_tied_scores_independent_of_row_order(self):
+        """Permuting countries permutes the scores and nothing else."""
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 4, size=(30, 6)).astype(float)
+        order = rng.permutation(30)
+
+        scaled = scale_panel(values, mode='rank')
+        np.testing.assert_allclose(scale_panel(values[order], mode='rank'), scaled[order])
+
+
+class TestScalingModes:
+    """Shared conventions of every mode."""
+
+    @pytest.mark.parametrize("mode", SCALING_MODES)
+    def test_range_and_missing(self, mode):
+        rng = np.random.default_rng(1)
+        values = rng.lognormal(size=(25, 40))
+        values[rng.random(values.shape) < 0.3] = np.nan
+        values[:, 5] = np.nan
+
+        scaled = scale_panel(values, mode=mode, log=True, window=5)
+
+        np.testing.assert_array_equal(np.isnan(scaled), np.isnan(values))
+        assert np.nanmin(scaled) >= 0.0 and np.nanmax(scaled) <= 1.0
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Incremental Submission Document Builder
+=======================================
+
+Shared build engine for the submission PDF (pandoc) and HTML generators:
+
+- Each document is a job with declared markdown inputs and one output.
+  Its fingerprint is the SHA-256 of the input file contents plus the pandoc
+  command line (or, for in-process HTML renderers, the renderer source and
+  template parameters such as the CSS).
+- Jobs whose fingerprint matches the manifest, whose last build succeeded
+  and whose output exists are skipped.
+- Stale jobs run concurrently in a bounded thread pool (pandoc runs as a
+  subprocess, so threads are enough).
+- Every outcome is recorded in a JSON manifest (.submission_build.json in the
+  output directory). Failed documents stay marked as failed, so the next run
+  retries them, and ``run(only_failed=True)`` retries nothing else.
+
+The ``--metadata=date:`` pandoc argument is left out of the fingerprint so
+an unchanged document is not rebuilt just because the day changed.
+
+Usage:
+    from submission_build import SubmissionBuild
+
+    build = SubmissionBuild(OUTPUT_DIR)
+    build.pandoc("Executive Summary", [summary_md], OUTPUT_DIR / "summary.pdf", args)
+    build.render("Index Page", create_index_html, output=OUTPUT_DIR / "index.html")
+    results = build.run(max_workers=4)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import subprocess
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+MANIFEST_NAME = ".submission_build.json"
+
+# Arguments that change every run without changing the document content
+VOLATILE_ARG_PREFIXES = ("--metadata=date:",)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class BuildJob:
+    """One output document: a pandoc command or an in-process renderer."""
+
+    name: str
+    output: Path
+    inputs: List[Path] = field(default_factory=list)
+    command: Optional[List[str]] = None
+    func: Optional[Callable] = None
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    params: tuple = ()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint_param(value: Any, digest) -> None:
+    if callable(value):
+        digest.update(f"{value.__module__}.{value.__qualname__}".encode())
+        try:
+            digest.update(inspect.getsource(value).encode())
+        except (OSError, TypeError):
+            pass
+    else:
+        digest.update(repr(value).encode())
+
+
+def job_fingerprint(job: BuildJob) -> str:
+    """SHA-256 over input contents, the command (minus volatile args) and parameters."""
+    digest = hashlib.sha256()
+    for path in job.inputs:
+        digest.update(str(path).encode())
+        digest.update(_file_sha256(path).encode() if path.exists() else b"<missing>")
+
+    if job.command is not None:
+        for arg in job.command:
+            if not arg.startswith(VOLATILE_ARG_PREFIXES):
+                digest.update(arg.encode() + b"\0")
+    if job.func is not None:
+        _fingerprint_param(job.func, digest)
+        digest.update(repr(job.args).encode() + repr(sorted(job.kwargs.items())).encode())
+    for param in job.params:
+        _fingerprint_param(param, digest)
+
+    return digest.hexdigest()
+
+
+def _execute(job: BuildJob):
+    """Build one job; returns (success, seconds, error message or None)."""
+    start = time.perf_counter()
+
+    missing = [str(p) for p in job.inputs if not p.exists()]
+    if missing:
+        return False, 0.0, f"Missing inputs: {', '.join(missing)}"
+
+    try:
+        if job.command is not None:
+            result = subprocess.run(job.command, capture_output=True, text=True)
+            ok = result.returncode == 0 and job.output.exists()
+            error = None if ok else (result.stderr.strip() or f"exit code {result.returncode}")
+        else:
+            ok = job.func(*job.args, **job.kwargs) is not False and job.output.exists()
+            error = None if ok else "Renderer reported failure"
+    except Exception:
+        ok, error = False, traceback.format_exc()
+
+    return ok, time.perf_counter() - start, error
+
+
+class SubmissionBuild:
+    """Incremental, concurrent document builder with a JSON manifest."""
+
+    def __init__(self, output_dir: Path, manifest: Optional[Path] = None):
+        self.output_dir = Path(output_dir)
+        self.manifest_path = Path(manifest) if manifest else self.output_dir / MANIFEST_NAME
+        self.jobs: List[BuildJob] = []
+
+    def pandoc(self, name: str, input_files: Sequence, output: Path,
+               args: Sequence[str]) -> BuildJob:
+        """Register a pandoc job; ``args`` is everything after the input files."""
+        inputs = [Path(p) for p in input_files]
+        command = ["pandoc", *[str(p) for p in inputs], "-o", str(output), *args]
+        job = BuildJob(name, Path(output), inputs, command=command)
+        self.jobs.append(job)
+        return job
+
+    def render(self, name: str, func: Callable, *args, output: Path,
+               inputs: Sequence = (), params: Sequence = (), **kwargs) -> BuildJob:
+        """Register an in-process renderer that writes ``output``."""
+        job = BuildJob(name, Path(output), [Path(p) for p in inputs],
+                       func=func, args=args, kwargs=kwargs, params=tuple(params))
+        self.jobs.append(job)
+        return job
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if self.manifest_path.exists():
+            try:
+                return json.loads(self.manifest_path.read_text())
+            except (ValueError, OSError):
+                pass
+        return {}
+
+    def run(self, force: bool = False, only_failed: bool = False,
+            max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Build every stale job.
+
+        Args:
+            force: Ignore the manifest and rebuild everything
+            only_failed: Only retry jobs whose last recorded build failed
+            max_workers: Concurrent builds (default: min(4, CPU count))
+
+        Returns:
+            One dict per job with name, output, status ('built', 'skipped',
+            'failed'), seconds and error
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        fingerprints = {job.name: job_fingerprint(job) for job in self.jobs}
+
+        def is_stale(job: BuildJob) -> bool:
+            entry = manifest.get(job.name, {})
+            if only_failed:
+                return entry.get("status") == "failed"
+            return (
+                force
+                or entry.get("status") != "ok"
+                or entry.get("fingerprint") != fingerprints[job.name]
+                or not job.output.exists()
+            )
+
+        stale = [job for job in self.jobs if is_stale(job)]
+        max_workers = max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+
+        for job in stale:
+            print(f"Generating: {job.output.name}")
+        if len(stale) <= 1 or max_workers == 1:
+            outcomes = {job.name: _execute(job) for job in stale}
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(stale))) as pool:
+                futures = {job.name: pool.submit(_execute, job) for job in stale}
+                outcomes = {name: future.result() for name, future in futures.items()}
+
+        results = []
+        for job in self.jobs:
+            if job.name not in outcomes:
+                results.append({"name": job.name, "output": job.output, "status": "skipped",
+                                "seconds": manifest.get(job.name, {}).get("seconds"), "error": None})
+                continue
+
+            ok, seconds, error = outcomes[job.name]
+            manifest[job.name] = {
+                "fingerprint": fingerprints[job.name],
+                "status": "ok" if ok else "failed",
+                "output": str(job.output),
+                "seconds": round(seconds, 3),
+                "error": error,
+            }
+            results.append({"name": job.name, "output": job.output,
+                            "status": "built" if ok else "failed",
+                            "seconds": seconds, "error": error})
+
+        self.manifest_path.write_text(json.dumps(manifest, indent=2))
+        print_build_report(results)
+        return results
+
+
+def print_build_report(results: List[Dict[str, Any]]) -> None:
+    """Per-document status, size and build time; errors for failures."""
+    print()
+    for r in results:
+        if r["status"] == "failed":
+            print(f"  ✗ {r['name']}: {r['error']}")
+            continue
+        label = r["name"] if r["name"] == r["output"].name else f"{r['name']} → {r['output'].name}"
+        size = f"{r['output'].stat().st_size / 1024:.1f} KB" if r["output"].exists() else ""
+        seconds = "" if r["seconds"] is None else f", {r['seconds']:.1f}s"
+        print(f"  {'✓' if r['status'] == 'built' else '·'} {label} [{r['status']}] ({size}{seconds})")
+
+    counts = {s: sum(r["status"] == s for r in results) for s in ("built", "skipped", "failed")}
+    print(f"\nBuilt {counts['built']}, up to date {counts['skipped']}, failed {counts['failed']}")
@@ -142,6 +142,157 @@ FORMULATIONS = {
 }
 
 
+# Floor applied before logs and reciprocals (matches clip(lower=1e-6) above)
+CLIP_FLOOR = 1e-6
+
+
+def compute_all_formulations(
+    values: np.ndarray,
+    weights: np.ndarray = None,
+    formulations: List[str] = None,
+    alpha: float = 2.0,
+) -> Dict[str, np.ndarray]:
+    """Fused kernel: every formulation from one float64 array in one pass.
+
+    Gives the same results as the individual compute_k_* functions
+    (including their pandas skip-NaN semantics), but clips, logs and takes
+    reciprocals once and shares them between formulations.
+
+    Args:
+        values: Harmony array of shape (..., n_years, n_harmonies). Leading
+            axes are replicate stacks (e.g. bootstrap resamples of years).
+        weights: (n_harmonies,) weights, or (..., n_harmonies) with one
+            weight vector per replicate (weight perturbations). Equal weights
+            if None.
+        formulations: Names from FORMULATIONS to compute (or None for all)
+        alpha: Exponential weighting strength
+
+    Returns:
+        Dict mapping formulation name to an array of shape (..., n_years)
+    """
+    if formulations is None:
+        formulations = list(FORMULATIONS.keys())
+    wanted = set(formulations)
+
+    x = np.ascontiguousarray(values, dtype=np.float64)
+    n_harmonies = x.shape[-1]
+    mask = ~np.isnan(x)
+
+    if weights is None:
+        w = np.full(n_harmonies, 1.0 / n_harmonies)
+    else:
+        w = np.asarray(weights, dtype=np.float64)
+    w = w[..., np.newaxis, :]  # broadcast over the year axis
+
+    results = {}
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if wanted & {"geometric", "harmonic"}:
+            clipped = np.where(mask, np.maximum(x, CLIP_FLOOR), np.nan)
+            if "geometric" in wanted:
+                log_clipped = np.where(mask, np.log(clipped), 0.0)
+                results["geometric"] = np.exp((log_clipped * w).sum(axis=-1))
+            if "harmonic" in wanted:
+                reciprocal = np.where(mask, 1.0 / clipped, 0.0)
+                results["harmonic"] = 1.0 / (reciprocal * w).sum(axis=-1)
+
+        filled = np.where(mask, x, 0.0)
+        if "arithmetic" in wanted:
+            results["arithmetic"] = (filled * w).sum(axis=-1)
+        if "quadratic" in wanted:
+            results["quadratic"] = np.sqrt((filled * filled * w).sum(axis=-1))
+
+        if "minimum" in wanted:
+            k_min = np.where(mask, x, np.inf).min(axis=-1)
+            results["minimum"] = np.where(mask.any(axis=-1), k_min, np.nan)
+
+        if "multiplicative" in wanted:
+            # compare_formulations uses the unweighted product
+            factors = x if weights is None else x ** w
+            results["multiplicative"] = np.where(mask, factors, 1.0).prod(axis=-1)
+
+        if "exponential" in wanted:
+            count = mask.sum(axis=-1)
+            exp_mean = np.where(mask, np.exp(alpha * filled), 0.0).sum(axis=-1) / count
+            results["exponential"] = (exp_mean - 1.0) / (np.exp(alpha) - 1.0)
+
+    return {name: results[name] for name in formulations if name in results}
+
+
+def perturbed_weights(
+    n_harmonies: int,
+    n_replicates: int,
+    perturbation: float = 0.20,
+    seed: int = 42,
+) -> np.ndarray:
+    """(n_replicates × n_harmonies) equal weights perturbed by ±perturbation, renormalized."""
+    rng = np.random.default_rng(seed)
+    factors = rng.uniform(1 - perturbation, 1 + perturbation, size=(n_replicates, n_harmonies))
+    return factors / factors.sum(axis=1, keepdims=True)
+
+
+def formulation_robustness(
+    harmony_data: pd.DataFrame,
+    n_replicates: int = 10000,
+    perturbation: float = 0.20,
+    formulations: List[str] = None,
+    chunk_size: int = 1000,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Weight-perturbation robustness of every formulation.
+
+    Each replicate perturbs the equal harmony weights by up to ±perturbation
+    and recomputes all formulations through the fused kernel, a chunk of
+    replicates at a time. Robustness is the Pearson correlation between the
+    perturbed and unperturbed K series.
+
+    Returns:
+        DataFrame with one row per formulation: mean, 5th percentile and
+        minimum correlation, and mean RMSE against the unperturbed series
+    """
+    harmony_cols = [col for col in HARMONY_COLUMNS if col in harmony_data.columns]
+    x = harmony_data[harmony_cols].to_numpy(dtype=np.float64)
+
+    # Explicit equal weights so weighted formulations (e.g. Π x_i^w_i) compare like-for-like
+    equal = np.full(len(harmony_cols), 1.0 / len(harmony_cols))
+    baseline = compute_all_formulations(x, weights=equal, formulations=formulations)
+    weights = perturbed_weights(len(harmony_cols), n_replicates, perturbation, seed)
+
+    corr = {name: [] for name in baseline}
+    rmse = {name: [] for name in baseline}
+
+    for start in range(0, n_replicates, chunk_size):
+        w = weights[start:start + chunk_size]
+        stack = np.broadcast_to(x, (len(w),) + x.shape)
+        perturbed = compute_all_formulations(stack, weights=w, formulations=list(baseline))
+
+        for name, k in perturbed.items():
+            base = baseline[name]
+            valid = np.isfinite(base) & np.isfinite(k).all(axis=0)
+            a = base[valid] - base[valid].mean()
+            b = k[:, valid] - k[:, valid].mean(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr[name].append(
+                    (b @ a) / np.sqrt((a @ a) * (b * b).sum(axis=1))
+                )
+            rmse[name].append(np.sqrt(((k[:, valid] - base[valid]) ** 2).mean(axis=1)))
+
+    rows = []
+    for name in baseline:
+        r = np.concatenate(corr[name])
+        rows.append(
+            {
+                "formulation": name,
+                "mean_correlation": np.nanmean(r),
+                "p5_correlation": np.nanpercentile(r, 5),
+                "min_correlation": np.nanmin(r),
+                "mean_rmse": np.concatenate(rmse[name]).mean(),
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
 def compare_formulations(
     harmony_data: pd.DataFrame, formulations: List[str] = None
 ) -> pd.DataFrame:
@@ -167,26 +318,173 @@ def compare_formulations(
 
     results = pd.DataFrame({"year": harmony_data["year"]})
 
-    for form_name in formulations:
-        if form_name not in FORMULATIONS:
-            print(f"   ⚠️  Unknown formulation: {form_name}")
-            continue
+    unknown = [name for name in formulations if name not in FORMULATIONS]
+    for form_name in unknown:
+        print(f"   ⚠️  Unknown formulation: {form_name}")
+    formulations = [name for name in formulations if name in FORMULATIONS]
 
+    # One contiguous array, one fused pass over all formulations
+    k_values = compute_all_formulations(
+        harmonies.to_numpy(dtype=np.float64), formulations=formulations
+    )
+    for form_name in formulations:
         print(f"   Computing: {FORMULATIONS[form_name]['name']}")
-        func = FORMULATIONS[form_name]["func"]
-
-        try:
-            k_values = func(harmonies)
-            results[form_name] = k_values
-        except Exception as e:
-            print(f"   ⚠️  Error in {form_name}: {e}")
-            results[form_name] = np.nan
+        results[form_name] = k_values[form_name]
 
     print(f"   ✅ Formulations computed")
 
     return results
 
 
+class FormulationAgreement:
+    """Pairwise agreement matrices across formulations, for any year window.
+
+    Built once from a compare_formulations() frame; every statistic is then
+    an (F × F) matrix from prefix-structure lookups instead of refiltering
+    the frame per pair and per window:
+
+    - Pearson, RMSE, mean/std of differences: 1-D prefix sums of x and x xᵀ
+    - Kendall tau-b: 2-D prefix sums of pairwise sign products, so
+      concordance over a window is a rectangle-sum lookup
+    - Max/min deviation: a sparse table (range-maximum query) over the
+      pairwise differences
+    - Spearman: one rank transform of the window for all formulations,
+      then a single correlation matrix (ranks are window-specific)
+
+    Years with any missing formulation are dropped (listwise), so all
+    matrices describe the same sample. Memory for Kendall is O(F² T²),
+    about 18 MB for 7 formulations over 211 years.
+    """
+
+    def __init__(self, comparison: pd.DataFrame, formulations: List[str] = None):
+        if formulations is None:
+            formulations = [col for col in comparison.columns if col != "year"]
+        self.formulations = list(formulations)
+
+        complete = comparison.dropna(subset=self.formulations)
+        self.years = complete["year"].to_numpy()
+        x = complete[self.formulations].to_numpy(dtype=np.float64)
+        self.values = x
+        n_years, n_forms = x.shape
+
+        zero = np.zeros((1, n_forms))
+        self._sum = np.concatenate([zero, np.cumsum(x, axis=0)])
+        self._cross = np.concatenate(
+            [np.zeros((1, n_forms, n_forms)), np.cumsum(x[:, :, None] * x[:, None, :], axis=0)]
+        )
+
+        # Sparse table of max over windows of d[t, f, g] = x_f - x_g
+        diffs = x[:, :, None] - x[:, None, :]
+        self._max_table = [diffs]
+        span = 1
+        while 2 * span <= n_years:
+            prev = self._max_table[-1]
+            self._max_table.append(np.maximum(prev[:-span], prev[span:]))
+            span *= 2
+
+        # Sign products for every year pair t < s, then 2-D prefix sums
+        signs = np.sign(x[None, :, :] - x[:, None, :])  # (t, s, f): sign(x_s - x_t)
+        signs *= np.triu(np.ones((n_years, n_years)), k=1)[:, :, None]
+        products = np.einsum("tsf,tsg->fgts", signs, signs)
+        self._concord = np.zeros((n_forms, n_forms, n_years + 1, n_years + 1))
+        self._concord[:, :, 1:, 1:] = products.cumsum(axis=2).cumsum(axis=3)
+
+    def _window(self, start: int = None, end: int = None):
+        """Row range [a, b) for years start..end inclusive."""
+        a = 0 if start is None else int(np.searchsorted(self.years, start, side="left"))
+        b = len(self.years) if end is None else int(np.searchsorted(self.years, end, side="right"))
+        if b - a < 2:
+            raise ValueError(f"Year window {start}-{end} has fewer than 2 complete years")
+        return a, b
+
+    def _frame(self, matrix: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(matrix, index=self.formulations, columns=self.formulations)
+
+    def _moments(self, a: int, b: int):
+        n = b - a
+        s = self._sum[b] - self._sum[a]
+        cross = self._cross[b] - self._cross[a]
+        cov = cross - np.outer(s, s) / n  # n × covariance
+        return n, s, cross, cov
+
+    def pearson(self, start: int = None, end: int = None) -> pd.DataFrame:
+        n, _, _, cov = self._moments(*self._window(start, end))
+        scale = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._frame(cov / np.outer(scale, scale))
+
+    def spearman(self, start: int = None, end: int = None) -> pd.DataFrame:
+        a, b = self._window(start, end)
+        ranks = stats.rankdata(self.values[a:b], axis=0)
+        return self._frame(np.corrcoef(ranks, rowvar=False))
+
+    def kendall(self, start: int = None, end: int = None) -> pd.DataFrame:
+        """Kendall tau-b (tie-corrected, as scipy.stats.kendalltau)."""
+        a, b = self._window(start, end)
+        c = self._concord
+        total = c[:, :, b, b] - c[:, :, a, b] - c[:, :, b, a] + c[:, :, a, a]
+        scale = np.sqrt(np.diag(total))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._frame(total / np.outer(scale, scale))
+
+    def rmse(self, start: int = None, end: int = None) -> pd.DataFrame:
+        n, _, cross, _ = self._moments(*self._window(start, end))
+        sq = np.diag(cross)
+        mse = (sq[:, None] + sq[None, :] - 2 * cross) / n
+        return self._frame(np.sqrt(np.maximum(mse, 0.0)))
+
+    def max_diff(self, start: int = None, end: int = None) -> np.ndarray:
+        """(F × F) array of max over the window of x_f - x_g."""
+        a, b = self._window(start, end)
+        level = int(np.log2(b - a))
+        table = self._max_table[level]
+        return np.maximum(table[a], table[b - 2 ** level])
+
+    def max_abs(self, start: int = None, end: int = None) -> pd.DataFrame:
+        high = self.max_diff(start, end)
+        return self._frame(np.maximum(high, high.T))
+
+    def matrices(self, start: int = None, end: int = None) -> Dict[str, pd.DataFrame]:
+        """All agreement matrices for a window."""
+        return {
+            "pearson": self.pearson(start, end),
+            "spearman": self.spearman(start, end),
+            "kendall": self.kendall(start, end),
+            "rmse": self.rmse(start, end),
+            "max_abs": self.max_abs(start, end),
+        }
+
+    def baseline_stats(
+        self, baseline: str, start: int = None, end: int = None
+    ) -> pd.DataFrame:
+        """Difference statistics of every formulation against one baseline."""
+        a, b = self._window(start, end)
+        n, s, cross, cov = self._moments(a, b)
+        j = self.formulations.index(baseline)
+        others = [i for i in range(len(self.formulations)) if i != j]
+
+        diff_sum = s - s[j]
+        diff_sq = np.diag(cross) + cross[j, j] - 2 * cross[:, j]
+        high = self.max_diff(start, end)
+        scale = np.sqrt(np.diag(cov))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table = pd.DataFrame(
+                {
+                    "formulation": [self.formulations[i] for i in others],
+                    "mean_diff": diff_sum[others] / n,
+                    "std_diff": np.sqrt(
+                        np.maximum(diff_sq[others] - diff_sum[others] ** 2 / n, 0.0) / (n - 1)
+                    ),
+                    "max_diff": high[others, j],
+                    "min_diff": -high[j, others],
+                    "correlation": cov[others, j] / (scale[others] * scale[j]),
+                    "rmse": np.sqrt(np.maximum(diff_sq[others], 0.0) / n),
+                }
+            )
+        return table
+
+
 def analyze_formulation_differences(
     comparison: pd.DataFrame, baseline: str = "arithmetic"
 ) -> pd.DataFrame:
@@ -207,29 +505,7 @@ def analyze_formulation_differences(
         print(f"   ⚠️  Baseline {baseline} not found, using first formulation")
         baseline = formulations[0]
 
-    baseline_values = comparison[baseline]
-
-    stats_list = []
-
-    for form in formulations:
-        if form == baseline:
-            continue
-
-        diff = comparison[form] - baseline_values
-
-        stats_list.append(
-            {
-                "formulation": form,
-                "mean_diff": diff.mean(),
-                "std_diff": diff.std(),
-                "max_diff": diff.max(),
-                "min_diff": diff.min(),
-                "correlation": comparison[form].corr(baseline_values),
-                "rmse": np.sqrt((diff**2).mean()),
-            }
-        )
-
-    stats_df = pd.DataFrame(stats_list)
+    stats_df = FormulationAgreement(comparison, formulations).baseline_stats(baseline)
     stats_df = stats_df.sort_values("rmse")
 
     print(f"   ✅ Difference analysis complete")
@@ -346,14 +622,30 @@ def generate_formulation_report(
     report += "| Formulation | Mean Δ | Std Δ | RMSE | Correlation |\n"
     report += "|-------------|--------|-------|------|-------------|\n"
 
-    for _, row in stats.iterrows():
-        form_name = FORMULATIONS.get(row["formulation"], {}).get(
-            "name", row["formulation"]
-        )
-        report += f"| {form_name} | {row['mean_diff']:+.4f} | "
-        report += (
-            f"{row['std_diff']:.4f} | {row['rmse']:.4f} | {row['correlation']:.4f} |\n"
-        )
+    for form, mean_diff, std_diff, rmse, corr in zip(
+        stats["formulation"], stats["mean_diff"], stats["std_diff"],
+        stats["rmse"], stats["correlation"],
+    ):
+        form_name = FORMULATIONS.get(form, {}).get("name", form)
+        report += f"| {form_name} | {mean_diff:+.4f} | "
+        report += f"{std_diff:.4f} | {rmse:.4f} | {corr:.4f} |\n"
+
+    report += "\n## Pairwise Agreement\n\n"
+    matrices = FormulationAgreement(comparison).matrices()
+    for key, title in [
+        ("pearson", "Pearson r"),
+        ("spearman", "Spearman ρ"),
+        ("kendall", "Kendall τ-b"),
+        ("rmse", "RMSE"),
+        ("max_abs", "Max |Δ|"),
+    ]:
+        matrix = matrices[key]
+        report += f"### {title}\n\n"
+        report += "| | " + " | ".join(matrix.columns) + " |\n"
+        report += "|---" * (len(matrix.columns) + 1) + "|\n"
+        for form, row in zip(matrix.index, matrix.to_numpy()):
+            report += f"| {form} | " + " | ".join(f"{v:.4f}" for v in row) + " |\n"
+        report += "\n"
 
     report += "\n## Summary Statistics\n\n"
 
@@ -408,6 +700,12 @@ if __name__ == "__main__":
         choices=list(FORMULATIONS.keys()) + ["all"],
         default=["all"],
     )
+    parser.add_argument(
+        "--robustness-replicates",
+        type=int,
+        default=0,
+        help="Weight-perturbation replicates for robustness analysis (0 = skip)",
+    )
 
     args = parser.parse_args()
     args.output.mkdir(parents=True, exist_ok=True)
@@ -429,24 +727,38 @@ if __name__ == "__main__":
     print()
 
     # Analyze differences
-    stats = analyze_formulation_differences(comparison)
-    stats.to_csv(args.output / "formulation_stats.csv", index=False)
+    stats_df = analyze_formulation_differences(comparison)
+    stats_df.to_csv(args.output / "formulation_stats.csv", index=False)
+
+    agreement = FormulationAgreement(comparison)
+    for key, matrix in agreement.matrices().items():
+        matrix.to_csv(args.output / f"agreement_{key}.csv")
+    print(f"✅ Agreement matrices saved to {args.output}/agreement_*.csv")
     print(f"✅ Stats saved to {args.output / 'formulation_stats.csv'}")
     print()
 
+    # Weight-perturbation robustness through the fused kernel
+    if args.robustness_replicates > 0:
+        print(f"🎲 Weight perturbation robustness ({args.robustness_replicates} replicates)...")
+        robustness = formulation_robustness(
+            df, n_replicates=args.robustness_replicates, formulations=formulations_to_test
+        )
+        robustness.to_csv(args.output / "formulation_robustness.csv", index=False)
+        print(f"✅ Robustness saved to {args.output / 'formulation_robustness.csv'}")
+        print()
+
     # Plot comparison
     plot_formulation_comparison(comparison, args.output / "formulations.png")
 
     # Generate report
     generate_formulation_report(
-        comparison, stats, args.output / "formulation_report.md"
+        comparison, stats_df, args.output / "formulation_report.md"
     )
 
     print(f"\n✅ Alternative formulations analysis complete!")
     print(f"📁 Results saved to: {args.output}")
     print()
     print("Formulations ranked by similarity to arithmetic mean:")
-    for _, row in stats.head(5).iterrows():
-        print(
-            f"  {row['formulation']}: RMSE = {row['rmse']:.4f}, r = {row['correlation']:.4f}"
-        )
+    top = stats_df.head(5)
+    for form, rmse, corr in zip(top["formulation"], top["rmse"], top["correlation"]):
+        print(f"  {form}: RMSE = {rmse:.4f}, r = {corr:.4f}")
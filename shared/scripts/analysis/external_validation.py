@@ -54,14 +54,15 @@ Data Sources:
    - Variables: War participants, casualties
 """
 
+import hashlib
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 from scipy import stats
 
 logging.basicConfig(level=logging.INFO)
@@ -71,10 +72,13 @@ logger = logging.getLogger(__name__)
 class ExternalDataSource:
     """Fetch and process external validation datasets."""
 
-    def __init__(self, data_dir: str = "data/sources/external"):
+    def __init__(self, data_dir: str = "data/sources/external", chunksize: int = 250_000):
         self.data_dir = Path(data_dir)
         self.raw_dir = self.data_dir / "raw"
         self.processed_dir = self.data_dir / "processed"
+        self.cache_dir = self.processed_dir / "yearly_cache"
+        self.chunksize = chunksize
+        self._headers: Dict[str, List[str]] = {}
 
         # Create directories
         self.raw_dir.mkdir(parents=True, exist_ok=True)
@@ -155,35 +159,146 @@ This will:
 """
         return instructions
 
+    # ------------------------------------------------------------------
+    # Lazy loading layer
+    #
+    # Each loader sniffs the CSV header once, reads only the year and value
+    # columns in chunks, and streams a per-year aggregate. The resulting
+    # global series is cached under processed/yearly_cache/ keyed by the
+    # source file's SHA-256, so repeat runs never re-read the raw panel.
+    # ------------------------------------------------------------------
+
+    def _header(self, filepath: Path) -> List[str]:
+        """Column names of a CSV (header row only, memoised per file)."""
+        key = str(filepath)
+        if key not in self._headers:
+            self._headers[key] = list(pd.read_csv(filepath, nrows=0).columns)
+        return self._headers[key]
+
+    @staticmethod
+    def _file_sha256(filepath: Path) -> str:
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _aggregate_by_year(
+        self, filepath: Path, year_col: str, value_col: str, how: str = "mean"
+    ) -> pd.DataFrame:
+        """Stream year/value columns in chunks and aggregate per year.
+
+        Only the two columns are read, with compact dtypes (nullable Int16
+        years, float32 values); sums are accumulated in float64. Files with
+        non-numeric entries are re-read as text and coerced. Non-numeric
+        years are dropped; NaN values are skipped, as in groupby().mean() /
+        groupby().sum().
+        """
+        try:
+            return self._accumulate_by_year(filepath, year_col, value_col, how, compact=True)
+        except (ValueError, TypeError, OverflowError):
+            return self._accumulate_by_year(filepath, year_col, value_col, how, compact=False)
+
+    def _accumulate_by_year(
+        self, filepath: Path, year_col: str, value_col: str, how: str, compact: bool
+    ) -> pd.DataFrame:
+        dtype = {year_col: "Int16", value_col: "float32"} if compact else None
+        totals = None
+        for chunk in pd.read_csv(
+            filepath, usecols=[year_col, value_col], dtype=dtype, chunksize=self.chunksize
+        ):
+            years = pd.to_numeric(chunk[year_col], errors="coerce")
+            values = pd.to_numeric(chunk[value_col], errors="coerce").astype(np.float64)
+            keep = years.notna()
+            part = (
+                pd.DataFrame({"year": years[keep].astype(np.int64), "value": values[keep]})
+                .groupby("year")["value"]
+                .agg(["sum", "count"])
+            )
+            totals = part if totals is None else totals.add(part, fill_value=0)
+
+        if totals is None:
+            return pd.DataFrame(columns=["year", "value"])
+
+        totals = totals.sort_index()
+        if how == "sum":
+            aggregated = totals["sum"]
+        else:
+            aggregated = totals["sum"] / totals["count"].where(totals["count"] > 0)
+
+        return pd.DataFrame(
+            {"year": totals.index.to_numpy(dtype=int), "value": aggregated.to_numpy(dtype=float)}
+        )
+
+    def _load_yearly(
+        self,
+        name: str,
+        filepath: Path,
+        year_col: str,
+        value_col: str,
+        out_col: str,
+        how: str = "mean",
+    ) -> pd.DataFrame:
+        """Per-year series for one source, served from the hash-keyed cache."""
+        cache_file = self.cache_dir / f"{name}.npz"
+        source_hash = self._file_sha256(filepath)
+        spec = f"{year_col}|{value_col}|{how}|float32"
+
+        if cache_file.exists():
+            try:
+                with np.load(cache_file, allow_pickle=False) as cached:
+                    if str(cached["source_hash"]) == source_hash and str(cached["spec"]) == spec:
+                        return pd.DataFrame(
+                            {"year": cached["years"].astype(int), out_col: cached["values"]}
+                        )
+            except (ValueError, KeyError, OSError) as e:
+                logger.warning(f"Ignoring unreadable cache {cache_file}: {e}")
+
+        yearly = self._aggregate_by_year(filepath, year_col, value_col, how)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            cache_file,
+            source_hash=np.str_(source_hash),
+            spec=np.str_(spec),
+            years=yearly["year"].to_numpy(dtype=np.int64),
+            values=yearly["value"].to_numpy(dtype=np.float64),
+        )
+        return yearly.rename(columns={"value": out_col})
+
+    @staticmethod
+    def _first_match(columns: List[str], *needles: str) -> Optional[str]:
+        """First column whose lower-cased name contains any needle."""
+        for c in columns:
+            if any(n in c.lower() for n in needles):
+                return c
+        return None
+
+    def _locate(self, filename: str, processed_first: bool = False) -> Path:
+        if processed_first and (self.processed_dir / filename).exists():
+            return self.processed_dir / filename
+        return self.raw_dir / filename
+
     def load_hdi(self) -> pd.DataFrame:
         """Load Human Development Index data."""
         # Try processed first, then raw
-        filepath = self.processed_dir / "hdi.csv"
-        if not filepath.exists():
-            filepath = self.raw_dir / "hdi.csv"
+        filepath = self._locate("hdi.csv", processed_first=True)
 
         if not filepath.exists():
             logger.warning(f"HDI data not found: {filepath}")
             return pd.DataFrame()
 
         try:
-            df = pd.read_csv(filepath)
+            columns = self._header(filepath)
 
             # Look for year and HDI value columns
-            year_cols = [c for c in df.columns if "year" in c.lower()]
-            hdi_cols = [c for c in df.columns if "hdi" in c.lower()]
+            year_col = self._first_match(columns, "year")
+            hdi_col = self._first_match(columns, "hdi")
 
-            if not year_cols or not hdi_cols:
+            if not year_col or not hdi_col:
                 logger.error("Could not identify year/HDI columns")
                 return pd.DataFrame()
 
-            result = df[[year_cols[0], hdi_cols[0]]].copy()
-            result.columns = ["year", "hdi"]
-
-            # Filter to numeric years
-            result = result[pd.to_numeric(result["year"], errors="coerce").notna()]
-            result["year"] = result["year"].astype(int)
-            result["hdi"] = pd.to_numeric(result["hdi"], errors="coerce")
+            result = self._load_yearly("hdi", filepath, year_col, hdi_col, "hdi")
 
             logger.info(
                 f"✓ Loaded HDI: {len(result)} records, {result['year'].min()}-{result['year'].max()}"
@@ -197,49 +312,25 @@ This will:
     def load_maddison_gdp(self) -> pd.DataFrame:
         """Load Maddison Project GDP per capita data."""
         # Try processed first, then raw
-        filepath = self.processed_dir / "maddison_gdp.csv"
-        if not filepath.exists():
-            filepath = self.raw_dir / "maddison_gdp.csv"
+        filepath = self._locate("maddison_gdp.csv", processed_first=True)
 
         if not filepath.exists():
             logger.warning(f"Maddison GDP data not found: {filepath}")
             return pd.DataFrame()
 
         try:
-            df = pd.read_csv(filepath)
+            columns = self._header(filepath)
 
             # Maddison has 'year' and 'gdppc' (GDP per capita)
-            if "year" not in df.columns:
-                # Try finding year column
-                year_cols = [c for c in df.columns if "year" in c.lower()]
-                if year_cols:
-                    df = df.rename(columns={year_cols[0]: "year"})
-
-            # Find GDP per capita column
-            gdp_cols = [
-                c
-                for c in df.columns
-                if "gdppc" in c.lower()
-                or "gdp per capita" in c.lower()
-                or "gdp_per_capita" in c.lower()
-            ]
-            if gdp_cols:
-                df = df.rename(columns={gdp_cols[0]: "gdp_per_capita"})
-
-            if "year" not in df.columns or "gdp_per_capita" not in df.columns:
+            year_col = "year" if "year" in columns else self._first_match(columns, "year")
+            gdp_col = self._first_match(columns, "gdppc", "gdp per capita", "gdp_per_capita")
+
+            if not year_col or not gdp_col:
                 logger.error("Could not identify year/GDP columns")
                 return pd.DataFrame()
 
-            # Aggregate to global average (if multiple countries)
-            if "country" in df.columns or "countrycode" in df.columns:
-                result = df.groupby("year")["gdp_per_capita"].mean().reset_index()
-            else:
-                result = df[["year", "gdp_per_capita"]].copy()
-
-            result["year"] = result["year"].astype(int)
-            result["gdp_per_capita"] = pd.to_numeric(
-                result["gdp_per_capita"], errors="coerce"
-            )
+            # Country panels are averaged to a global series while streaming
+            result = self._load_yearly("gdp", filepath, year_col, gdp_col, "gdp_per_capita")
 
             logger.info(
                 f"✓ Loaded Maddison GDP: {len(result)} records, {result['year'].min()}-{result['year'].max()}"
@@ -259,30 +350,20 @@ This will:
             return pd.DataFrame()
 
         try:
-            df = pd.read_csv(filepath)
+            columns = self._header(filepath)
 
             # Polity has 'year' and 'polity2' (revised combined polity score)
-            if "year" in df.columns and "polity2" in df.columns:
-                # Aggregate to global average
-                if "country" in df.columns or "ccode" in df.columns:
-                    result = df.groupby("year")["polity2"].mean().reset_index()
-                else:
-                    result = df[["year", "polity2"]].copy()
-
-                result.columns = ["year", "polity_score"]
-                result["year"] = result["year"].astype(int)
-                result["polity_score"] = pd.to_numeric(
-                    result["polity_score"], errors="coerce"
-                )
-
-                logger.info(
-                    f"✓ Loaded Polity: {len(result)} records, {result['year'].min()}-{result['year'].max()}"
-                )
-                return result
-            else:
+            if "year" not in columns or "polity2" not in columns:
                 logger.error("Could not find Polity columns")
                 return pd.DataFrame()
 
+            result = self._load_yearly("polity", filepath, "year", "polity2", "polity_score")
+
+            logger.info(
+                f"✓ Loaded Polity: {len(result)} records, {result['year'].min()}-{result['year'].max()}"
+            )
+            return result
+
         except Exception as e:
             logger.error(f"Error loading Polity: {e}")
             return pd.DataFrame()
@@ -296,18 +377,9 @@ This will:
             return pd.DataFrame()
 
         try:
-            # V-Dem is large, specify columns to load
-            df = pd.read_csv(
-                filepath, usecols=["year", "v2x_polyarchy"]
-            )  # Electoral democracy index
-
-            # Aggregate to global average
-            result = df.groupby("year")["v2x_polyarchy"].mean().reset_index()
-            result.columns = ["year", "democracy_index"]
-
-            result["year"] = result["year"].astype(int)
-            result["democracy_index"] = pd.to_numeric(
-                result["democracy_index"], errors="coerce"
+            # V-Dem is large: only year and the electoral democracy index are read
+            result = self._load_yearly(
+                "vdem", filepath, "year", "v2x_polyarchy", "democracy_index"
             )
 
             logger.info(
@@ -328,20 +400,17 @@ This will:
             return pd.DataFrame()
 
         try:
-            df = pd.read_csv(filepath)
+            columns = self._header(filepath)
 
             # UCDP has 'year' and 'bd_best' (best estimate of battle deaths)
-            year_col = [c for c in df.columns if "year" in c.lower()][0]
-            deaths_col = [
-                c for c in df.columns if "bd" in c.lower() or "death" in c.lower()
-            ][0]
-
-            result = df.groupby(year_col)[deaths_col].sum().reset_index()
-            result.columns = ["year", "battle_deaths"]
+            year_col = self._first_match(columns, "year")
+            deaths_col = self._first_match(columns, "bd", "death")
+            if not year_col or not deaths_col:
+                logger.error("Could not identify year/battle death columns")
+                return pd.DataFrame()
 
-            result["year"] = result["year"].astype(int)
-            result["battle_deaths"] = pd.to_numeric(
-                result["battle_deaths"], errors="coerce"
+            result = self._load_yearly(
+                "battle_deaths", filepath, year_col, deaths_col, "battle_deaths", how="sum"
             )
 
             logger.info(
@@ -356,44 +425,24 @@ This will:
     def load_kof_globalization(self) -> pd.DataFrame:
         """Load KOF Globalization Index data."""
         # Try processed first, then raw
-        filepath = self.processed_dir / "kof_globalization.csv"
-        if not filepath.exists():
-            filepath = self.raw_dir / "kof_globalization.csv"
+        filepath = self._locate("kof_globalization.csv", processed_first=True)
 
         if not filepath.exists():
             logger.warning(f"KOF Globalization data not found: {filepath}")
             return pd.DataFrame()
 
         try:
-            df = pd.read_csv(filepath)
+            columns = self._header(filepath)
 
             # Look for year and KOF index columns
-            year_cols = [c for c in df.columns if "year" in c.lower()]
-            kof_cols = [
-                c
-                for c in df.columns
-                if "kof" in c.lower()
-                or "globalization" in c.lower()
-                or "global" in c.lower()
-            ]
-
-            if not year_cols or not kof_cols:
+            year_col = self._first_match(columns, "year")
+            kof_col = self._first_match(columns, "kof", "globalization", "global")
+
+            if not year_col or not kof_col:
                 logger.error("Could not identify year/KOF columns")
                 return pd.DataFrame()
 
-            result = df[[year_cols[0], kof_cols[0]]].copy()
-            result.columns = ["year", "kof_globalization"]
-
-            # Aggregate to global average if multiple countries
-            if len(df) > len(result["year"].unique()):
-                result = (
-                    result.groupby("year")["kof_globalization"].mean().reset_index()
-                )
-
-            result["year"] = result["year"].astype(int)
-            result["kof_globalization"] = pd.to_numeric(
-                result["kof_globalization"], errors="coerce"
-            )
+            result = self._load_yearly("kof", filepath, year_col, kof_col, "kof_globalization")
 
             logger.info(
                 f"✓ Loaded KOF: {len(result)} records, {result['year'].min()}-{result['year'].max()}"
@@ -413,35 +462,17 @@ This will:
             return pd.DataFrame()
 
         try:
-            df = pd.read_csv(filepath)
+            columns = self._header(filepath)
 
             # Look for year and DHL index columns
-            year_cols = [c for c in df.columns if "year" in c.lower()]
-            dhl_cols = [
-                c
-                for c in df.columns
-                if "dhl" in c.lower()
-                or "connectedness" in c.lower()
-                or "depth" in c.lower()
-            ]
-
-            if not year_cols or not dhl_cols:
+            year_col = self._first_match(columns, "year")
+            dhl_col = self._first_match(columns, "dhl", "connectedness", "depth")
+
+            if not year_col or not dhl_col:
                 logger.error("Could not identify year/DHL columns")
                 return pd.DataFrame()
 
-            result = df[[year_cols[0], dhl_cols[0]]].copy()
-            result.columns = ["year", "dhl_connectedness"]
-
-            # Aggregate to global average if multiple countries
-            if len(df) > len(result["year"].unique()):
-                result = (
-                    result.groupby("year")["dhl_connectedness"].mean().reset_index()
-                )
-
-            result["year"] = result["year"].astype(int)
-            result["dhl_connectedness"] = pd.to_numeric(
-                result["dhl_connectedness"], errors="coerce"
-            )
+            result = self._load_yearly("dhl", filepath, year_col, dhl_col, "dhl_connectedness")
 
             logger.info(
                 f"✓ Loaded DHL: {len(result)} records, {result['year'].min()}-{result['year'].max()}"
@@ -471,18 +502,179 @@ This will:
         return indices
 
 
+MIN_VALID_PAIRS = 4
+
+
+def align_indices(
+    k_series: pd.DataFrame, external_indices: Dict[str, pd.DataFrame]
+) -> Tuple[np.ndarray, np.ndarray, List[str], List[str], np.ndarray, np.ndarray]:
+    """
+    Align every external index to the K(t) years in one (years × indices) matrix.
+
+    Returns:
+        years: K(t) years (axis 0)
+        k: K(t) values
+        names: Index names (axis 1)
+        value_cols: Value column of each index
+        values: float64 (years × indices), NaN where missing
+        present: Boolean (years × indices), True where the index has a row
+            for that year (even if its value is NaN) - the inner-merge overlap
+    """
+    k_frame = k_series.drop_duplicates("year", keep="last")
+    years = k_frame["year"].to_numpy()
+    k = k_frame["K"].to_numpy(dtype=np.float64)
+
+    names = list(external_indices)
+    value_cols = []
+    values = np.full((len(years), len(names)), np.nan)
+    present = np.zeros((len(years), len(names)), dtype=bool)
+
+    for j, index_name in enumerate(names):
+        index_df = external_indices[index_name].drop_duplicates("year", keep="last")
+        value_col = [c for c in index_df.columns if c not in ["year", "K"]][0]
+        value_cols.append(value_col)
+
+        aligned = index_df.set_index("year")[value_col].reindex(years)
+        present[:, j] = np.isin(years, index_df["year"].to_numpy())
+        values[:, j] = pd.to_numeric(aligned, errors="coerce").to_numpy(dtype=np.float64)
+
+    return years, k, names, value_cols, values, present
+
+
+def batch_validation_statistics(k: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """
+    Pearson, Spearman and OLS statistics of K(t) against every index at once.
+
+    Each column uses only the years where both K and the index are observed.
+    Results match scipy's pearsonr, spearmanr and linregress per column
+    (two-sided p-values from the t distribution with n - 2 df).
+
+    Returns:
+        DataFrame with one row per column of ``values``
+    """
+    k_mat = np.broadcast_to(k[:, None], values.shape)
+    valid = ~np.isnan(values) & ~np.isnan(k_mat)
+    n = valid.sum(axis=0).astype(np.float64)
+
+    x = np.where(valid, k_mat, np.nan)
+    y = np.where(valid, values, np.nan)
+
+    def _corr(a, b):
+        da = np.where(valid, a - np.nanmean(a, axis=0), 0.0)
+        db = np.where(valid, b - np.nanmean(b, axis=0), 0.0)
+        sxx, syy, sxy = (da * da).sum(axis=0), (db * db).sum(axis=0), (da * db).sum(axis=0)
+        return sxy / np.sqrt(sxx * syy), sxx, syy, sxy
+
+    def _p_value(r):
+        df = n - 2
+        t = r * np.sqrt(df / np.maximum((1 - r) * (1 + r), 1e-300))
+        return np.where(np.abs(r) >= 1, 0.0, 2 * stats.t.sf(np.abs(t), df))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_pearson, sxx, syy, sxy = _corr(x, y)
+        p_pearson = _p_value(np.clip(r_pearson, -1, 1))
+
+        # One rank transform per column over its own valid years
+        rx = stats.rankdata(x, axis=0, nan_policy="omit")
+        ry = stats.rankdata(y, axis=0, nan_policy="omit")
+        r_spearman = _corr(rx, ry)[0]
+        p_spearman = _p_value(np.clip(r_spearman, -1, 1))
+
+        slope = sxy / sxx
+        intercept = np.nanmean(y, axis=0) - slope * np.nanmean(x, axis=0)
+        r_squared = r_pearson ** 2
+        std_err = np.sqrt((1 - r_squared) * syy / sxx / (n - 2))
+
+    return pd.DataFrame(
+        {
+            "n_samples": n.astype(int),
+            "pearson_r": r_pearson,
+            "pearson_p": p_pearson,
+            "spearman_r": r_spearman,
+            "spearman_p": p_spearman,
+            "slope": slope,
+            "intercept": intercept,
+            "r_squared": r_squared,
+            "p_value": p_pearson,
+            "std_err": std_err,
+        }
+    )
+
+
+def render_validation_figure(
+    index_name: str,
+    years: np.ndarray,
+    k: np.ndarray,
+    values: np.ndarray,
+    regression: Dict,
+    output_path: Path,
+) -> Path:
+    """
+    Two-panel validation figure for one index (scatter + time series).
+
+    ``years``/``k``/``values`` cover the overlapping years; the scatter uses
+    the complete pairs. Imports matplotlib lazily so statistics-only runs
+    never load it; safe to call from worker processes.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    complete = ~np.isnan(k) & ~np.isnan(values)
+    k_clean, v_clean = k[complete], values[complete]
+    slope, intercept = regression["slope"], regression["intercept"]
+    r_squared, r_pearson = regression["r_squared"], regression["pearson_r"]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Scatter plot with regression line
+    ax1.scatter(k_clean, v_clean, alpha=0.6)
+    x_fit = np.linspace(k_clean.min(), k_clean.max(), 100)
+    y_fit = slope * x_fit + intercept
+    ax1.plot(x_fit, y_fit, "r--", label=f"R² = {r_squared:.3f}")
+    ax1.set_xlabel("K(t)")
+    ax1.set_ylabel(index_name.upper())
+    ax1.set_title(f"K(t) vs {index_name.upper()}\nPearson r = {r_pearson:.3f}")
+    ax1.legend()
+    ax1.grid(alpha=0.3)
+
+    # Time series overlay
+    ax2_twin = ax2.twinx()
+    ax2.plot(years, k, "b-", label="K(t)", linewidth=2)
+    ax2_twin.plot(years, values, "r-", label=index_name.upper(), linewidth=2)
+    ax2.set_xlabel("Year")
+    ax2.set_ylabel("K(t)", color="b")
+    ax2_twin.set_ylabel(index_name.upper(), color="r")
+    ax2.set_title(f"Time Series Comparison")
+    ax2.grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches="tight")
+    plt.close(fig)
+    return output_path
+
+
 def cross_validate_k_index(
     k_series: pd.DataFrame,
     external_indices: Dict[str, pd.DataFrame],
     output_dir: str = "logs/validation_external",
+    plot: bool = True,
+    n_jobs: Optional[int] = None,
 ) -> Dict:
     """
     Cross-validate K(t) against external indices.
 
+    Statistics for all indices are computed in one vectorized pass over the
+    aligned (years × indices) matrix; figures are rendered afterwards,
+    optionally in parallel worker processes.
+
     Args:
         k_series: DataFrame with 'year' and 'K' columns
         external_indices: Dictionary of external index DataFrames
         output_dir: Output directory for results
+        plot: Render the per-index validation figures
+        n_jobs: Worker processes for rendering (default: CPU count; 1 = serial)
 
     Returns:
         Dictionary with validation results
@@ -492,108 +684,80 @@ def cross_validate_k_index(
 
     results = {"correlations": {}, "regressions": {}, "time_overlaps": {}}
 
-    # For each external index
-    for index_name, index_df in external_indices.items():
-        logger.info(f"\nValidating against {index_name}...")
+    years, k, names, _, values, present = align_indices(k_series, external_indices)
+    batch = batch_validation_statistics(k, values)
 
-        # Merge with K(t) on year
-        merged = k_series.merge(index_df, on="year", how="inner")
+    figures = []
+    for j, index_name in enumerate(names):
+        logger.info(f"\nValidating against {index_name}...")
 
-        logger.info(f"  Found {len(merged)} overlapping years")
+        n_overlap = int(present[:, j].sum())
+        logger.info(f"  Found {n_overlap} overlapping years")
 
-        if len(merged) < 4:
+        if n_overlap < MIN_VALID_PAIRS:
             logger.warning(
-                f"  ⚠ Only {len(merged)} overlapping years, skipping (need at least 4)"
+                f"  ⚠ Only {n_overlap} overlapping years, skipping (need at least {MIN_VALID_PAIRS})"
             )
             continue
 
+        overlap_years = years[present[:, j]]
         results["time_overlaps"][index_name] = {
-            "n_years": len(merged),
-            "year_range": (int(merged["year"].min()), int(merged["year"].max())),
+            "n_years": n_overlap,
+            "year_range": (int(overlap_years.min()), int(overlap_years.max())),
         }
 
-        # Get value column (second column)
-        value_col = [c for c in merged.columns if c not in ["year", "K"]][0]
-
-        # Remove NaN
-        clean = merged[["K", value_col]].dropna()
-
-        if len(clean) < 4:
+        row = batch.iloc[j]
+        if row["n_samples"] < MIN_VALID_PAIRS:
             logger.warning(
-                f"  ⚠ Only {len(clean)} valid pairs after removing NaN, skipping"
+                f"  ⚠ Only {row['n_samples']} valid pairs after removing NaN, skipping"
             )
             continue
 
-        logger.info(f"  Valid pairs: {len(clean)}")
-
-        # Compute correlation
-        r_pearson, p_pearson = stats.pearsonr(clean["K"], clean[value_col])
-        r_spearman, p_spearman = stats.spearmanr(clean["K"], clean[value_col])
+        logger.info(f"  Valid pairs: {row['n_samples']}")
 
         results["correlations"][index_name] = {
-            "pearson_r": r_pearson,
-            "pearson_p": p_pearson,
-            "spearman_r": r_spearman,
-            "spearman_p": p_spearman,
-            "n_samples": len(clean),
+            "pearson_r": row["pearson_r"],
+            "pearson_p": row["pearson_p"],
+            "spearman_r": row["spearman_r"],
+            "spearman_p": row["spearman_p"],
+            "n_samples": int(row["n_samples"]),
         }
-
-        # Linear regression
-        from scipy.stats import linregress
-
-        slope, intercept, r_value, p_value, std_err = linregress(
-            clean["K"], clean[value_col]
-        )
-
         results["regressions"][index_name] = {
-            "slope": slope,
-            "intercept": intercept,
-            "r_squared": r_value**2,
-            "p_value": p_value,
-            "std_err": std_err,
+            "slope": row["slope"],
+            "intercept": row["intercept"],
+            "r_squared": row["r_squared"],
+            "p_value": row["p_value"],
+            "std_err": row["std_err"],
         }
 
         # Log results
-        logger.info(f"  Pearson r = {r_pearson:.3f} (p={p_pearson:.4f})")
-        logger.info(f"  Spearman r = {r_spearman:.3f} (p={p_spearman:.4f})")
-        logger.info(f"  R² = {r_value**2:.3f}")
-        logger.info(f"  Samples: {len(clean)} years")
-
-        # Plot
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-
-        # Scatter plot with regression line
-        ax1.scatter(clean["K"], clean[value_col], alpha=0.6)
-        x_fit = np.linspace(clean["K"].min(), clean["K"].max(), 100)
-        y_fit = slope * x_fit + intercept
-        ax1.plot(x_fit, y_fit, "r--", label=f"R² = {r_value**2:.3f}")
-        ax1.set_xlabel("K(t)")
-        ax1.set_ylabel(index_name.upper())
-        ax1.set_title(f"K(t) vs {index_name.upper()}\nPearson r = {r_pearson:.3f}")
-        ax1.legend()
-        ax1.grid(alpha=0.3)
-
-        # Time series overlay
-        ax2_twin = ax2.twinx()
-        ax2.plot(merged["year"], merged["K"], "b-", label="K(t)", linewidth=2)
-        ax2_twin.plot(
-            merged["year"],
-            merged[value_col],
-            "r-",
-            label=index_name.upper(),
-            linewidth=2,
-        )
-        ax2.set_xlabel("Year")
-        ax2.set_ylabel("K(t)", color="b")
-        ax2_twin.set_ylabel(index_name.upper(), color="r")
-        ax2.set_title(f"Time Series Comparison")
-        ax2.grid(alpha=0.3)
-
-        plt.tight_layout()
-        plt.savefig(
-            output_dir / f"validation_{index_name}.png", dpi=300, bbox_inches="tight"
-        )
-        plt.close()
+        logger.info(f"  Pearson r = {row['pearson_r']:.3f} (p={row['pearson_p']:.4f})")
+        logger.info(f"  Spearman r = {row['spearman_r']:.3f} (p={row['spearman_p']:.4f})")
+        logger.info(f"  R² = {row['r_squared']:.3f}")
+        logger.info(f"  Samples: {row['n_samples']} years")
+
+        if plot:
+            figures.append(
+                (
+                    index_name,
+                    overlap_years,
+                    k[present[:, j]],
+                    values[present[:, j], j],
+                    {**results["regressions"][index_name], **results["correlations"][index_name]},
+                    output_dir / f"validation_{index_name}.png",
+                )
+            )
+
+    # Render figures after all statistics are in
+    if figures:
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(figures) == 1:
+            for args in figures:
+                render_validation_figure(*args)
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(figures))) as pool:
+                list(pool.map(render_validation_figure, *zip(*figures)))
+        logger.info(f"  Rendered {len(figures)} validation figures")
 
     # Generate summary report
     report_path = output_dir / "validation_report.md"
@@ -710,8 +874,10 @@ if __name__ == "__main__":
         print(f"✓ Loaded {len(indices)} external indices")
         print()
 
-        # Cross-validate
-        results = cross_validate_k_index(k_series, indices)
+        # Cross-validate (--no-plots: statistics and report only)
+        results = cross_validate_k_index(
+            k_series, indices, plot="--no-plots" not in sys.argv
+        )
 
         print()
         print("=" * 70)
@@ -728,3 +894,6 @@ if __name__ == "__main__":
             "  python external_validation.py --download   # Show download instructions"
         )
         print("  python external_validation.py --process    # Run validation")
+        print(
+            "  python external_validation.py --process --no-plots   # Statistics only"
+        )
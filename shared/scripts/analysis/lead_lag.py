@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Lead-Lag Analysis: Lagged and Rolling Correlation of K(t) with External Indices
+
+External validation (external_validation.py) reports contemporaneous
+correlation on overlapping years. This module asks whether K(t) leads or lags
+HDI, GDP, Polity, V-Dem and the other external indices:
+
+1. Lagged correlation r(ℓ) = corr(K(t), X(t + ℓ)) for every lag in
+   [-max_lag, max_lag] and every index at once. Positive ℓ means K leads.
+   All pairwise-complete sums (n, ΣK, ΣX, ΣK², ΣX², ΣKX) are masked
+   cross-correlations, computed with one zero-padded FFT per term, so a
+   decadal K(t) on an annual grid is handled by the masks.
+2. Rolling-window correlation at lag 0 from cumulative sums: each window is
+   a difference of prefix sums, O(1) per window.
+3. Significance from trend-preserving surrogates of each index, run in a
+   process pool. Any two trending series (K(t), GDP, Polity, V-Dem ...)
+   have a large |r|, so resampling the levels would break the index's
+   trend and make every index "significant". Instead the index's
+   year-on-year increments are resampled (phase randomization by default,
+   or circular block bootstrap / permutation) and re-integrated from its
+   first value, so each surrogate keeps the drift and persistence of the
+   original. Peak |r| over all lags is compared with the null distribution
+   of the peak, which controls for searching over lags.
+
+Usage:
+    python lead_lag.py --max-lag 20 --window 50 --n-boot 1000
+
+Outputs (logs/validation_external/):
+    lead_lag_correlations.csv   r(ℓ) and pair counts per index and lag
+    lead_lag_summary.csv        peak lag, peak r, r(0) and p-values per index
+    rolling_correlations.csv    windowed r per index and window end year
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from external_validation import ExternalDataSource
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MIN_PAIRS = 4
+RESAMPLING_METHODS = ("phase", "block", "permutation")
+
+
+def annual_grid(
+    k_series: pd.DataFrame, external_indices: Dict[str, pd.DataFrame]
+) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Put K(t) and every index on one contiguous annual grid.
+
+    Returns:
+        years: Annual grid spanning K(t) and all indices
+        k: K(t) on the grid (NaN where not observed, e.g. between decades)
+        values: DataFrame (years × indices) of index values, NaN if missing
+    """
+    k_frame = k_series.drop_duplicates("year", keep="last")
+    lo = min([k_frame["year"].min()] + [df["year"].min() for df in external_indices.values()])
+    hi = max([k_frame["year"].max()] + [df["year"].max() for df in external_indices.values()])
+    years = np.arange(int(lo), int(hi) + 1)
+
+    k = k_frame.set_index("year")["K"].reindex(years).to_numpy(dtype=np.float64)
+
+    columns = {}
+    for name, df in external_indices.items():
+        value_col = [c for c in df.columns if c not in ["year", "K"]][0]
+        series = df.drop_duplicates("year", keep="last").set_index("year")[value_col]
+        columns[name] = pd.to_numeric(series, errors="coerce").reindex(years)
+
+    return years, k, pd.DataFrame(columns, index=years)
+
+
+def _fft_len(n: int) -> int:
+    """Smallest power of two >= 2n (linear, not circular, correlation)."""
+    return 1 << int(np.ceil(np.log2(max(2 * n, 2))))
+
+
+def _xcorr(a_hat: np.ndarray, b: np.ndarray, n_fft: int, max_lag: int) -> np.ndarray:
+    """
+    c[ℓ] = Σ_t a[t] b[t + ℓ] for ℓ = -max_lag..max_lag, along axis 0.
+
+    ``a_hat`` is the precomputed rfft of a; b may have trailing columns.
+    """
+    full = np.fft.irfft(np.conj(a_hat) * np.fft.rfft(b, n_fft, axis=0), n_fft, axis=0)
+    return np.concatenate([full[n_fft - max_lag:], full[:max_lag + 1]], axis=0)
+
+
+def lagged_correlations(
+    k: np.ndarray, values: np.ndarray, max_lag: int = 10
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete Pearson r between K(t) and X(t + ℓ) for all lags and columns.
+
+    Args:
+        k: K(t) on an annual grid, NaN where missing
+        values: (years × columns) array on the same grid, NaN where missing
+        max_lag: Largest lead/lag in years
+
+    Returns:
+        r: (2·max_lag + 1 × columns) correlations, NaN where fewer than
+           MIN_PAIRS pairs overlap; row i is lag i - max_lag
+        n: Matching pair counts
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_years = len(k)
+    n_fft = _fft_len(n_years)
+
+    mk = ~np.isnan(k)
+    mx = ~np.isnan(values)
+
+    # Centre first to limit cancellation in the moment formulas
+    kc = np.where(mk, k - np.nanmean(k), 0.0)
+    xc = np.where(mx, values - np.nanmean(values, axis=0), 0.0)
+    mxf = mx.astype(np.float64)
+
+    # K-side transforms are shared by every column (and every replicate)
+    mk_hat = np.fft.rfft(mk.astype(np.float64), n_fft)[:, None]
+    k_hat = np.fft.rfft(kc, n_fft)[:, None]
+    kk_hat = np.fft.rfft(kc * kc, n_fft)[:, None]
+
+    n = np.rint(_xcorr(mk_hat, mxf, n_fft, max_lag))
+    sk = _xcorr(k_hat, mxf, n_fft, max_lag)
+    sx = _xcorr(mk_hat, xc, n_fft, max_lag)
+    skk = _xcorr(kk_hat, mxf, n_fft, max_lag)
+    sxx = _xcorr(mk_hat, xc * xc, n_fft, max_lag)
+    skx = _xcorr(k_hat, xc, n_fft, max_lag)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * skx - sk * sx
+        var_k = n * skk - sk * sk
+        var_x = n * sxx - sx * sx
+        r = cov / np.sqrt(np.maximum(var_k, 0.0) * np.maximum(var_x, 0.0))
+
+    r[n < MIN_PAIRS] = np.nan
+    return np.clip(r, -1.0, 1.0), n.astype(int)
+
+
+def rolling_correlations(
+    k: np.ndarray, values: np.ndarray, window: int = 50, min_pairs: int = MIN_PAIRS
+) -> np.ndarray:
+    """
+    Contemporaneous Pearson r over trailing windows of ``window`` years.
+
+    Every window's pairwise-complete sums are differences of cumulative sums.
+
+    Returns:
+        (years × columns) array; row t is the window ending at t (NaN until
+        the first full window or where fewer than min_pairs pairs exist)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    both = ~np.isnan(values) & ~np.isnan(k)[:, None]
+    kk = np.where(both, k[:, None], 0.0)
+    xx = np.where(both, values, 0.0)
+
+    # Centre on overall pair means to limit cancellation
+    kk = np.where(both, kk - kk.sum(axis=0) / np.maximum(both.sum(axis=0), 1), 0.0)
+    xx = np.where(both, xx - xx.sum(axis=0) / np.maximum(both.sum(axis=0), 1), 0.0)
+
+    def windowed(a):
+        c = np.concatenate([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+        out = np.full(a.shape, np.nan)
+        out[window - 1:] = c[window:] - c[:-window]
+        return out
+
+    n = windowed(both.astype(np.float64))
+    sk, sx = windowed(kk), windowed(xx)
+    skk, sxx, skx = windowed(kk * kk), windowed(xx * xx), windowed(kk * xx)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (n * skx - sk * sx) / np.sqrt(
+            np.maximum(n * skk - sk * sk, 0.0) * np.maximum(n * sxx - sx * sx, 0.0)
+        )
+    r[~(n >= min_pairs)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _resample_rows(n_years: int, n_boot: int, method: str, block_length: int, rng) -> np.ndarray:
+    """(n_boot × n_years) row indices: permutations or circular block bootstrap."""
+    if method == "permutation":
+        return rng.permuted(np.tile(np.arange(n_years), (n_boot, 1)), axis=1)
+
+    n_blocks = -(-n_years // block_length)
+    starts = rng.integers(0, n_years, size=(n_boot, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_length)) % n_years
+    return idx.reshape(n_boot, -1)[:, :n_years]
+
+
+def _surrogates(column: np.ndarray, n_boot: int, method: str, block_length: int, rng) -> np.ndarray:
+    """
+    (n_boot × n_years) trend-preserving null replicates of one index.
+
+    Over the index's observed span (interior gaps linearly interpolated),
+    the first differences are phase-randomized ('phase': same power
+    spectrum, so the same drift and autocorrelation), block-bootstrapped
+    or permuted, then cumulated from the first observed value. The
+    index's missingness pattern is reapplied.
+    """
+    observed = ~np.isnan(column)
+    idx = np.flatnonzero(observed)
+    out = np.full((n_boot, len(column)), np.nan)
+    if len(idx) < 3:
+        out[:, observed] = column[observed]
+        return out
+
+    lo, hi = idx[0], idx[-1]
+    filled = np.interp(np.arange(lo, hi + 1), idx, column[idx])
+    steps = np.diff(filled)
+    m = len(steps)
+
+    if method == "phase":
+        spectrum = np.fft.rfft(steps)
+        phases = rng.uniform(0.0, 2 * np.pi, size=(n_boot, len(spectrum)))
+        phases[:, 0] = 0.0  # keep the mean increment (drift)
+        if m % 2 == 0:
+            phases[:, -1] = 0.0  # Nyquist term must stay real
+        resampled = np.fft.irfft(spectrum * np.exp(1j * phases), m, axis=1)
+    else:
+        resampled = steps[_resample_rows(m, n_boot, method, min(block_length, m), rng)]
+
+    out[:, lo:hi + 1] = filled[0] + np.concatenate(
+        [np.zeros((n_boot, 1)), np.cumsum(resampled, axis=1)], axis=1
+    )
+    out[:, ~observed] = np.nan
+    return out
+
+
+def _null_peaks(k: np.ndarray, replicates: np.ndarray, max_lag: int) -> np.ndarray:
+    """(replicates × lags) null |r| for one index (one process-pool task)."""
+    r, _ = lagged_correlations(k, replicates.T, max_lag)
+    return np.abs(r).T
+
+
+def lag_significance(
+    k: np.ndarray,
+    values: np.ndarray,
+    max_lag: int = 10,
+    n_boot: int = 1000,
+    method: str = "phase",
+    block_length: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    seed: int = 42,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resampling p-values for lagged correlations.
+
+    Each index column is replaced by trend-preserving surrogates (its
+    increments phase-randomized, block-bootstrapped or permuted, then
+    re-integrated; see _surrogates) while K(t) is fixed, so two unrelated
+    trending series are not reported as dependent. All lags for all
+    replicates of a column come from one FFT pass. Replicates are drawn up
+    front from one seeded generator, so results do not depend on n_jobs.
+
+    Returns:
+        p_lag: (lags × columns) pointwise p-values P(|r*_ℓ| >= |r_ℓ|)
+        p_peak: (columns,) family-wise p-value of the peak |r| over lags
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    method = method.lower()
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Unknown resampling method '{method}'. Use {list(RESAMPLING_METHODS)}.")
+
+    n_years, n_cols = values.shape
+    if block_length is None:
+        block_length = max(2, int(np.ceil(n_years ** (1 / 3))))
+
+    observed, _ = lagged_correlations(k, values, max_lag)
+    observed = np.abs(observed)
+
+    rng = np.random.default_rng(seed)
+    replicates = [_surrogates(values[:, j], n_boot, method, block_length, rng) for j in range(n_cols)]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    args = ([k] * n_cols, replicates, [max_lag] * n_cols)
+    if n_jobs == 1 or n_cols == 1:
+        nulls = [_null_peaks(*a) for a in zip(*args)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_cols)) as pool:
+            nulls = list(pool.map(_null_peaks, *args))
+
+    p_lag = np.full(observed.shape, np.nan)
+    p_peak = np.full(n_cols, np.nan)
+    for j, null in enumerate(nulls):
+        null = np.nan_to_num(null, nan=0.0)
+        with np.errstate(invalid="ignore"):
+            p_lag[:, j] = ((null >= observed[:, j]).sum(axis=0) + 1) / (n_boot + 1)
+            peak = np.nanmax(observed[:, j]) if np.isfinite(observed[:, j]).any() else np.nan
+            p_peak[j] = ((null.max(axis=1) >= peak).sum() + 1) / (n_boot + 1)
+        p_lag[np.isnan(observed[:, j]), j] = np.nan
+
+    return p_lag, p_peak
+
+
+def lead_lag_analysis(
+    k_series: pd.DataFrame,
+    external_indices: Dict[str, pd.DataFrame],
+    max_lag: int = 10,
+    window: int = 50,
+    n_boot: int = 1000,
+    method: str = "phase",
+    n_jobs: Optional[int] = None,
+    seed: int = 42,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Lagged, rolling and significance results for all indices.
+
+    Returns:
+        Dict with 'lags' (long: index, lag, r, n_pairs, p_value),
+        'summary' (one row per index) and 'rolling' (year × index)
+    """
+    years, k, values = annual_grid(k_series, external_indices)
+    names = list(values.columns)
+    x = values.to_numpy(dtype=np.float64)
+
+    r, n = lagged_correlations(k, x, max_lag)
+    lags = np.arange(-max_lag, max_lag + 1)
+
+    if n_boot > 0:
+        p_lag, p_peak = lag_significance(k, x, max_lag, n_boot, method, n_jobs=n_jobs, seed=seed)
+    else:
+        p_lag, p_peak = np.full(r.shape, np.nan), np.full(len(names), np.nan)
+
+    long = pd.DataFrame(
+        {
+            "index": np.repeat(names, len(lags)),
+            "lag": np.tile(lags, len(names)),
+            "r": r.T.reshape(-1),
+            "n_pairs": n.T.reshape(-1),
+            "p_value": p_lag.T.reshape(-1),
+        }
+    )
+
+    observed = np.isfinite(r).any(axis=0)
+    peak = np.where(observed, np.nanargmax(np.where(np.isfinite(r), np.abs(r), -1.0), axis=0), 0)
+    cols = np.arange(len(names))
+    summary = pd.DataFrame(
+        {
+            "index": names,
+            "r_lag0": r[max_lag],
+            "peak_lag": np.where(observed, lags[peak], np.nan),
+            "peak_r": np.where(observed, r[peak, cols], np.nan),
+            "peak_n_pairs": np.where(observed, n[peak, cols], 0),
+            "peak_p_value": np.where(observed, p_lag[peak, cols], np.nan),
+            "peak_p_familywise": p_peak,
+        }
+    )
+    summary["leader"] = np.select(
+        [summary["peak_lag"] > 0, summary["peak_lag"] < 0, summary["peak_lag"] == 0],
+        ["K leads", "K lags", "contemporaneous"],
+        default="insufficient data",
+    )
+
+    rolling = pd.DataFrame(rolling_correlations(k, x, window), index=years, columns=names)
+    rolling.index.name = "window_end"
+
+    return {"lags": long, "summary": summary, "rolling": rolling}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lead-lag analysis of K(t) vs external indices")
+    parser.add_argument("--k-series", type=Path, default=Path("logs/historical_k/k_t_series.csv"))
+    parser.add_argument("--output", type=Path, default=Path("logs/validation_external"))
+    parser.add_argument("--max-lag", type=int, default=10, help="Largest lead/lag in years")
+    parser.add_argument("--window", type=int, default=50, help="Rolling window in years")
+    parser.add_argument("--n-boot", type=int, default=1000, help="Resamples (0 = no p-values)")
+    parser.add_argument("--method", choices=list(RESAMPLING_METHODS), default="phase",
+                        help="Resampling of index increments for the null")
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    if not args.k_series.exists():
+        print(f"✗ K(t) series not found: {args.k_series}")
+        raise SystemExit(1)
+
+    k_series = pd.read_csv(args.k_series)
+    k_series = k_series[k_series["K"].notna()]
+
+    indices = ExternalDataSource().load_all_indices()
+    if not indices:
+        print("✗ No external indices found! Run external_validation.py --download")
+        raise SystemExit(1)
+
+    results = lead_lag_analysis(
+        k_series,
+        indices,
+        max_lag=args.max_lag,
+        window=args.window,
+        n_boot=args.n_boot,
+        method=args.method,
+        n_jobs=args.jobs,
+    )
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    results["lags"].to_csv(args.output / "lead_lag_correlations.csv", index=False)
+    results["summary"].to_csv(args.output / "lead_lag_summary.csv", index=False)
+    results["rolling"].to_csv(args.output / "rolling_correlations.csv")
+
+    print(results["summary"].to_string(index=False))
+    print(f"\n✅ Lead-lag results saved to {args.output}/")
@@ -2,47 +2,380 @@
 """
 Structural break detection for K(t) time series using Bai-Perron test.
 Identifies discrete regime changes aligned with historical events.
+
+Breaks are located by an exact optimal partition (dynamic programming over
+a cumulative-sum segment cost matrix), with BIC/LWZ selection of the break
+count and a PELT mode for long series.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-def bai_perron_breaks(k_series, years, n_breaks=4):
+# Shortest admissible regime, in observations (years for the annual series)
+MIN_SEGMENT_LENGTH = 5
+
+# Liu-Wu-Zidek (1997) penalty constants used by Bai & Perron (2003)
+LWZ_C0 = 0.299
+LWZ_DELTA0 = 0.1
+
+
+def cumulative_sums(y):
+    """
+    Prefix sums of y and y² with a leading zero.
+
+    The sum of squared residuals of any segment y[i:j] about its mean is
+    S2[j] - S2[i] - (S1[j] - S1[i])² / (j - i), so every segment cost is O(1).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    s1 = np.concatenate(([0.0], np.cumsum(y)))
+    s2 = np.concatenate(([0.0], np.cumsum(y * y)))
+    return s1, s2
+
+
+def segment_lengths(n, min_size=MIN_SEGMENT_LENGTH):
+    """
+    Length matrix L[i, j] = j - i and admissibility mask L >= min_size.
+
+    Depends only on n and min_size, so it is shared by every series of the
+    same length (e.g. all bootstrap replicates).
+    """
+    lengths = np.arange(n + 1)[np.newaxis, :] - np.arange(n + 1)[:, np.newaxis]
+    return lengths, lengths >= min_size
+
+
+def costs_from_sums(s1, s2, lengths, valid):
+    """Segment cost matrix from prefix sums and a precomputed length matrix."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        seg_sum = s1[np.newaxis, :] - s1[:, np.newaxis]
+        cost = (s2[np.newaxis, :] - s2[:, np.newaxis]) - seg_sum * seg_sum / lengths
+
+    # Guard against tiny negative values from cancellation
+    return np.where(valid, np.maximum(cost, 0.0), np.inf)
+
+
+def segment_cost_matrix(y, min_size=MIN_SEGMENT_LENGTH):
+    """
+    Sum-of-squared-residuals cost for every segment y[i:j].
+
+    Returns an (n+1) × (n+1) matrix C with C[i, j] the cost of the segment
+    starting at index i and ending before index j; segments shorter than
+    min_size (including all j <= i) are +inf.
     """
-    Detect structural breaks using Bai-Perron sequential test.
+    s1, s2 = cumulative_sums(y)
+    lengths, valid = segment_lengths(len(s1) - 1, min_size)
+    return costs_from_sums(s1, s2, lengths, valid)
+
+
+def optimal_partitions(cost, max_breaks):
+    """
+    Exact minimum-SSR partitions for every break count 0..max_breaks.
+
+    Dynamic programming over the cost matrix (Bai & Perron 2003): the best
+    k-break partition of y[:j] is the best (k-1)-break partition of y[:i]
+    plus segment y[i:j], minimised over i. Each layer is one vectorised
+    min over an (n+1) × (n+1) array, so all break counts come out of a single
+    O(max_breaks · n²) pass.
+
+    Args:
+        cost: Segment cost matrix from segment_cost_matrix()
+        max_breaks: Largest number of breaks to consider
+
+    Returns:
+        Dict mapping k -> (ssr, break_indices). Break counts that cannot fit
+        with the minimum segment length are omitted.
+    """
+    n = cost.shape[0] - 1
+
+    best = cost[0].copy()  # best[j]: 0-break cost of y[:j]
+    back = []
+    partitions = {0: (float(best[n]), [])}
+
+    for k in range(1, max_breaks + 1):
+        candidates = best[:, np.newaxis] + cost
+        back.append(np.argmin(candidates, axis=0))
+        best = candidates[back[-1], np.arange(n + 1)]
+
+        if not np.isfinite(best[n]):
+            break
+
+        # Backtrack the k breaks ending at n
+        breaks, j = [], n
+        for layer in reversed(back):
+            j = int(layer[j])
+            breaks.append(j)
+        partitions[k] = (float(best[n]), breaks[::-1])
+
+    return partitions
+
+
+def information_criteria(partitions, n):
+    """
+    BIC and LWZ for each candidate break count of a mean-shift model.
+
+    A model with k breaks has p = 2k + 1 parameters (k + 1 regime means and
+    k break dates).
+
+    Returns:
+        DataFrame with columns n_breaks, ssr, bic, lwz
+    """
+    rows = []
+    for k, (ssr, _) in sorted(partitions.items()):
+        p = 2 * k + 1
+        sigma2 = max(ssr, 1e-300) / n
+        rows.append({
+            'n_breaks': k,
+            'ssr': ssr,
+            'bic': n * np.log(sigma2) + p * np.log(n),
+            'lwz': (np.log(max(ssr, 1e-300) / (n - p))
+                    + p * LWZ_C0 * np.log(n) ** (2 + LWZ_DELTA0) / n),
+        })
+    return pd.DataFrame(rows)
+
+
+def default_penalty(y):
+    """
+    BIC-style PELT penalty, 2·σ²·log(n), in SSR units.
+
+    σ is estimated robustly from first differences (MAD / 0.6745 / √2) so
+    that level shifts do not inflate it.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    diffs = np.diff(y)
+    sigma = np.median(np.abs(diffs - np.median(diffs))) / 0.6745 / np.sqrt(2)
+    if sigma <= 0:
+        sigma = np.std(diffs) / np.sqrt(2) if len(diffs) else 0.0
+    return 2 * sigma ** 2 * np.log(len(y))
+
+
+def pelt_breaks(y, penalty=None, min_size=MIN_SEGMENT_LENGTH):
+    """
+    Exact penalised segmentation with PELT (Killick et al. 2012).
+
+    Minimises total SSR + penalty × (number of breaks) without fixing the
+    break count. Candidate change points that can no longer be optimal are
+    pruned, so cost is close to linear in n for long series. With a
+    minimum segment length, a candidate s that fails the pruning test at t
+    is only dropped from t + min_size on: before that a break at t is not
+    admissible, so s may still be the best last break.
+
+    Returns:
+        List of break indices (first index of each new regime)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if penalty is None:
+        penalty = default_penalty(y)
+    s1, s2 = cumulative_sums(y)
+
+    def cost(starts, end):
+        seg_sum = s1[end] - s1[starts]
+        return (s2[end] - s2[starts]) - seg_sum * seg_sum / (end - starts)
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype=np.intp)
+    candidates = np.array([0], dtype=np.intp)
+    pending = {}  # end point -> candidates pruned once a break there is admissible
+
+    for t in range(min_size, n + 1):
+        # A change at t - min_size becomes admissible once its segment fits
+        s = t - min_size
+        if s >= min_size and np.isfinite(best[s]):
+            candidates = np.append(candidates, s)
+        if t in pending:
+            candidates = candidates[~np.isin(candidates, pending.pop(t))]
+
+        seg_costs = cost(candidates, t)
+        totals = best[candidates] + seg_costs + penalty
+        i = int(np.argmin(totals))
+        best[t], last[t] = totals[i], candidates[i]
+
+        prune = best[candidates] + seg_costs > best[t]
+        if prune.any():
+            pending[t + min_size] = candidates[prune]
+
+    breaks, j = [], n
+    while j > 0:
+        j = int(last[j])
+        if j > 0:
+            breaks.append(j)
+    return breaks[::-1]
+
+
+def bai_perron_breaks(k_series, years, n_breaks=4, method='dp', max_breaks=8,
+                      criterion='bic', min_size=MIN_SEGMENT_LENGTH, penalty=None):
+    """
+    Detect structural breaks in the mean of K(t).
+
+    Exact global optimisation; no optional dependency is required.
 
     Args:
         k_series: K(t) values
         years: Corresponding years
-        n_breaks: Number of breaks to detect
+        n_breaks: Number of breaks to detect; None selects it by ``criterion``
+        method: 'dp' (exact Bai-Perron dynamic programme) or 'pelt'
+            (penalised, for long series; ignores n_breaks)
+        max_breaks: Largest break count considered when n_breaks is None
+        criterion: 'bic' or 'lwz' model selection when n_breaks is None
+        min_size: Minimum observations per regime
+        penalty: PELT penalty in SSR units (default: default_penalty())
 
     Returns:
         break_years: Years where breaks occur
-        break_indices: Indices in the series
+        break_indices: Indices in the series (first index of each new regime)
+
+    Raises:
+        ValueError: If the series contains non-finite values, the method or
+            criterion is unknown, or n_breaks regimes cannot fit min_size
     """
-    try:
-        from ruptures import Binseg
+    y = np.asarray(k_series, dtype=np.float64)
+    years = np.asarray(years)
+    if not np.all(np.isfinite(y)):
+        raise ValueError("K(t) series contains missing or non-finite values.")
+
+    method = (method or 'dp').lower()
+    if method == 'pelt':
+        break_indices = pelt_breaks(y, penalty=penalty, min_size=min_size)
+    elif method == 'dp':
+        k_max = max_breaks if n_breaks is None else n_breaks
+        partitions = optimal_partitions(segment_cost_matrix(y, min_size), k_max)
+
+        if n_breaks is None:
+            criterion = criterion.lower()
+            if criterion not in ('bic', 'lwz'):
+                raise ValueError(f"Unknown criterion '{criterion}'. Use 'bic' or 'lwz'.")
+            table = information_criteria(partitions, len(y))
+            n_breaks = int(table.loc[table[criterion].idxmin(), 'n_breaks'])
+        elif n_breaks not in partitions:
+            raise ValueError(
+                f"Cannot fit {n_breaks} breaks in {len(y)} observations "
+                f"with minimum segment length {min_size}."
+            )
+        break_indices = partitions[n_breaks][1]
+    else:
+        raise ValueError(f"Unknown method '{method}'. Use 'dp' or 'pelt'.")
+
+    break_years = [years[idx] for idx in break_indices]
+    return break_years, break_indices
+
+
+def _segment_fit(y, break_indices):
+    """Fitted regime means for a partition of y."""
+    bounds = [0] + list(break_indices) + [len(y)]
+    fitted = np.empty(len(y))
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        fitted[a:b] = y[a:b].mean()
+    return fitted
+
+
+def _resample_residuals(residuals, n_boot, scheme, block_length, rng):
+    """(n_boot × n) resampled residual paths, i.i.d. or moving-block."""
+    n = len(residuals)
+    if scheme == 'residual':
+        return residuals[rng.integers(0, n, size=(n_boot, n))]
+
+    n_blocks = -(-n // block_length)
+    starts = rng.integers(0, n - block_length + 1, size=(n_boot, n_blocks))
+    idx = (starts[:, :, np.newaxis] + np.arange(block_length)).reshape(n_boot, -1)[:, :n]
+    return residuals[idx]
+
+
+def _bootstrap_chunk(series, n_breaks, min_size):
+    """Break indices for a stack of replicate series (one process-pool task)."""
+    n = series.shape[1]
+    lengths, valid = segment_lengths(n, min_size)
+
+    # Prefix sums for the whole chunk at once; each replicate is then one DP pass
+    s1 = np.concatenate([np.zeros((len(series), 1)), np.cumsum(series, axis=1)], axis=1)
+    s2 = np.concatenate([np.zeros((len(series), 1)), np.cumsum(series * series, axis=1)], axis=1)
+
+    out = np.empty((len(series), n_breaks), dtype=np.int64)
+    for r in range(len(series)):
+        cost = costs_from_sums(s1[r], s2[r], lengths, valid)
+        out[r] = optimal_partitions(cost, n_breaks)[n_breaks][1]
+    return out
+
+
+def bootstrap_break_dates(k_series, years, break_indices, n_boot=1000,
+                          scheme='residual', block_length=None,
+                          min_size=MIN_SEGMENT_LENGTH, alpha=0.05,
+                          n_jobs=None, seed=42):
+    """
+    Bootstrap distribution of break dates for a fitted segmentation.
 
-        # Use Binary Segmentation (Bai-Perron approximation)
-        model = "l2"  # L2 norm for mean shift
-        algo = Binseg(model=model).fit(k_series)
-        break_indices = algo.predict(n_bkps=n_breaks)
+    Replicates are the fitted regime means plus resampled residuals, either
+    i.i.d. ('residual') or in moving blocks ('block', for autocorrelated
+    errors). Each replicate is re-segmented with the exact DP for the same
+    number of breaks. The segment-length matrix is built once per worker and
+    prefix sums once per chunk, so each replicate costs one DP pass.
+    Replicates are drawn up front from one seeded generator, so results do
+    not depend on n_jobs.
 
-        # Remove final index (end of series)
-        break_indices = [b for b in break_indices if b < len(years)]
-        break_years = [years[idx] for idx in break_indices]
+    Args:
+        k_series: K(t) values
+        years: Corresponding years
+        break_indices: Point-estimate break indices (from bai_perron_breaks)
+        n_boot: Number of bootstrap replicates
+        scheme: 'residual' or 'block'
+        block_length: Block length for 'block' (default: ceil(n^(1/3)))
+        min_size: Minimum observations per regime
+        alpha: Interval level (0.05 → 95% interval)
+        n_jobs: Worker processes (default: CPU count; 1 runs in-process)
+        seed: Random seed
 
-        return break_years, break_indices
-    except ImportError:
-        print("Warning: ruptures not installed. Using simple threshold method.")
-        # Fallback: detect large changes
-        diffs = np.diff(k_series)
-        threshold = np.std(diffs) * 2  # 2 sigma threshold
-        break_indices = np.where(np.abs(diffs) > threshold)[0]
-        break_years = [years[idx] for idx in break_indices[:n_breaks]]
-        return break_years, break_indices[:n_breaks]
+    Returns:
+        summary: DataFrame, one row per break, with point year, bootstrap
+            median/mean/std and percentile interval
+        replicate_years: (n_boot × n_breaks) array of break years
+    """
+    y = np.asarray(k_series, dtype=np.float64)
+    years = np.asarray(years)
+    break_indices = list(break_indices)
+    n, n_breaks = len(y), len(break_indices)
+
+    scheme = scheme.lower()
+    if scheme not in ('residual', 'block'):
+        raise ValueError(f"Unknown bootstrap scheme '{scheme}'. Use 'residual' or 'block'.")
+    if n_breaks == 0:
+        raise ValueError("No breaks to bootstrap.")
+
+    fitted = _segment_fit(y, break_indices)
+    residuals = y - fitted
+    if block_length is None:
+        block_length = int(np.ceil(n ** (1 / 3)))
+
+    rng = np.random.default_rng(seed)
+    series = fitted + _resample_residuals(residuals, n_boot, scheme, block_length, rng)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        replicate_idx = _bootstrap_chunk(series, n_breaks, min_size)
+    else:
+        chunks = np.array_split(series, min(n_jobs * 4, n_boot))
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = pool.map(_bootstrap_chunk, chunks,
+                               [n_breaks] * len(chunks), [min_size] * len(chunks))
+            replicate_idx = np.vstack(list(results))
+
+    replicate_years = years[replicate_idx]
+
+    lower, upper = np.percentile(replicate_years, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    summary = pd.DataFrame({
+        'break': np.arange(1, n_breaks + 1),
+        'break_year': years[break_indices],
+        'boot_median': np.median(replicate_years, axis=0),
+        'boot_mean': replicate_years.mean(axis=0),
+        'boot_std': replicate_years.std(axis=0, ddof=1),
+        'ci_lower': np.floor(lower).astype(int),
+        'ci_upper': np.ceil(upper).astype(int),
+        'share_exact': (replicate_idx == np.asarray(break_indices)).mean(axis=0),
+    })
+    return summary, replicate_years
 
 
 def align_with_historical_events(break_years):
@@ -80,9 +413,12 @@ def align_with_historical_events(break_years):
     return pd.DataFrame(alignments)
 
 
-def plot_structural_breaks(years, k_series, break_years, output_path):
+def plot_structural_breaks(years, k_series, break_years, output_path, break_intervals=None):
     """
     Create publication-quality figure showing K(t) with structural breaks.
+
+    break_intervals: optional list of (lower, upper) years shaded around
+    each break (bootstrap confidence intervals).
     """
     fig, ax = plt.subplots(figsize=(10, 6), dpi=300)
 
@@ -94,6 +430,11 @@ def plot_structural_breaks(years, k_series, break_years, output_path):
         ax.axvline(break_year, color='red', linestyle='--', alpha=0.7,
                    linewidth=1, label='Structural Break' if break_year == break_years[0] else '')
 
+    if break_intervals is not None:
+        for i, (lower, upper) in enumerate(break_intervals):
+            ax.axvspan(lower, upper, color='red', alpha=0.12,
+                       label='95% Bootstrap CI' if i == 0 else '')
+
     # Annotate major events
     event_annotations = {
         1914: "WWI",
@@ -160,9 +501,29 @@ def main():
 
     alignment_df.to_csv(output_dir / "break_alignment.csv", index=False)
 
+    # Information criteria for 0..8 breaks from the same DP pass
+    partitions = optimal_partitions(segment_cost_matrix(k_series), max_breaks=8)
+    selection_df = information_criteria(partitions, len(k_series))
+    selection_df['break_years'] = [
+        ' '.join(str(years[i]) for i in partitions[k][1]) for k in selection_df['n_breaks']
+    ]
+    selection_df.to_csv(output_dir / "break_selection.csv", index=False)
+    print(f"\n📐 Break count selected by BIC: {int(selection_df.loc[selection_df['bic'].idxmin(), 'n_breaks'])}, "
+          f"LWZ: {int(selection_df.loc[selection_df['lwz'].idxmin(), 'n_breaks'])}")
+
+    # Bootstrap break-date uncertainty (block resampling for serial correlation)
+    print("\n🎲 Bootstrapping break dates (1000 replicates)...")
+    boot_df, boot_years = bootstrap_break_dates(k_series, years, break_indices,
+                                                n_boot=1000, scheme='block')
+    print(boot_df.to_string(index=False))
+    boot_df.to_csv(output_dir / "break_bootstrap.csv", index=False)
+    pd.DataFrame(boot_years, columns=[f"break_{i}" for i in boot_df['break']]).to_csv(
+        output_dir / "break_bootstrap_replicates.csv", index=False)
+
     # Generate figure
     plot_structural_breaks(years, k_series, break_years,
-                          output_dir / "structural_breaks_figure.png")
+                          output_dir / "structural_breaks_figure.png",
+                          break_intervals=list(zip(boot_df['ci_lower'], boot_df['ci_upper'])))
 
     print(f"\n✅ Analysis complete. Results in {output_dir}/")
 
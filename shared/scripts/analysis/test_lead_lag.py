@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Lead-Lag Significance
+
+Validates that:
+1. Independent trending series (random walks) are flagged at about the
+   nominal rate, not whenever both series trend
+2. A genuinely lagged relationship is still detected at the right lag
+
+Run: pytest shared/scripts/analysis/test_lead_lag.py -v
+"""
+
+import numpy as np
+import pytest
+
+from lead_lag import RESAMPLING_METHODS, lag_significance, lagged_correlations
+
+ALPHA = 0.05
+N_YEARS = 211
+
+
+class TestNullCalibration:
+    """False-positive rate of the family-wise p-value on unrelated series."""
+
+    @pytest.mark.parametrize("method", RESAMPLING_METHODS)
+    def test_independent_random_walks(self, method):
+        """Two independent random walks are 'significant' about alpha of the time."""
+        rng = np.random.default_rng(2025)
+        n_pairs = 100
+        false_positives = 0
+        for i in range(n_pairs):
+            k = np.cumsum(rng.standard_normal(N_YEARS))
+            x = np.cumsum(rng.standard_normal(N_YEARS))
+            _, p_peak = lag_significance(k, x, max_lag=10, n_boot=99, method=method,
+                                         n_jobs=1, seed=i)
+            false_positives += p_peak[0] < ALPHA
+
+        rate = false_positives / n_pairs
+        # Binomial sd at alpha = 0.05 over 100 pairs is about 0.022
+        assert rate <= ALPHA + 0.07, f"False-positive rate {rate:.2f} vs alpha {ALPHA}"
+
+    def test_decadal_k_with_gaps(self):
+        """Decadal K(t) against an annual index with missing years stays calibrated."""
+        rng = np.random.default_rng(11)
+        n_pairs = 100
+        false_positives = 0
+        for i in range(n_pairs):
+            k = np.cumsum(rng.standard_normal(N_YEARS))
+            k[np.arange(N_YEARS) % 10 != 0] = np.nan
+            x = np.cumsum(rng.standard_normal(N_YEARS)) + 0.05 * np.arange(N_YEARS)
+            x[:40] = np.nan
+            x[rng.random(N_YEARS) < 0.1] = np.nan
+            _, p_peak = lag_significance(k, x, max_lag=10, n_boot=99, n_jobs=1, seed=i)
+            false_positives += p_peak[0] < ALPHA
+
+        assert false_positives / n_pairs <= ALPHA + 0.07
+
+
+class TestPower:
+    """A real lagged dependence is still found."""
+
+    def test_lagged_dependence_detected(self):
+        """X follows K's shocks three years later, so K leads (lag +3)."""
+        rng = np.random.default_rng(3)
+        shocks = rng.standard_normal(N_YEARS + 3)
+        k = np.cumsum(shocks[3:])
+        x = np.cumsum(shocks[:-3] + 0.3 * rng.standard_normal(N_YEARS))
+
+        r, _ = lagged_correlations(k, x, max_lag=10)
+        p_lag, p_peak = lag_significance(k, x, max_lag=10, n_boot=199, n_jobs=1)
+
+        assert p_peak[0] < ALPHA
+        assert np.nanargmax(np.abs(r[:, 0])) - 10 == 3, "K should lead X by three years"
+        assert p_lag[10 + 3, 0] < ALPHA
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test Suite for PELT Structural Breaks
+
+Validates that:
+1. pelt_breaks reaches the penalised optimum (total SSR + penalty × breaks)
+   of a brute-force dynamic programme for every minimum segment length
+2. No segment is shorter than the minimum
+
+Run: pytest shared/scripts/analysis/test_structural_breaks.py -v
+"""
+
+import numpy as np
+import pytest
+
+from structural_breaks import cumulative_sums, pelt_breaks
+
+
+def _cost(s1, s2, start, end):
+    seg_sum = s1[end] - s1[start]
+    return (s2[end] - s2[start]) - seg_sum * seg_sum / (end - start)
+
+
+def brute_force_objective(y, penalty, min_size):
+    """Optimal penalised SSR over every segmentation with segments >= min_size."""
+    n = len(y)
+    s1, s2 = cumulative_sums(y)
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    for t in range(min_size, n + 1):
+        for s in [0] + list(range(min_size, t - min_size + 1)):
+            best[t] = min(best[t], best[s] + _cost(s1, s2, s, t) + penalty)
+    return best[n]
+
+
+def objective(y, breaks, penalty):
+    s1, s2 = cumulative_sums(y)
+    bounds = [0] + list(breaks) + [len(y)]
+    ssr = sum(_cost(s1, s2, a, b) for a, b in zip(bounds[:-1], bounds[1:]))
+    return ssr + penalty * len(breaks)
+
+
+class TestPeltOptimality:
+    """PELT pruning never discards the optimal segmentation."""
+
+    @pytest.mark.parametrize("min_size", [1, 2, 3, 4, 5])
+    def test_matches_brute_force(self, min_size):
+        rng = np.random.default_rng(min_size)
+        for _ in range(200):
+            n = int(rng.integers(min_size, 60))
+            penalty = float(rng.uniform(0.5, 6.0))
+            y = 0.5 * np.cumsum(rng.standard_normal(n)) + rng.standard_normal(n)
+
+            breaks = pelt_breaks(y, penalty=penalty, min_size=min_size)
+
+            assert objective(y, breaks, penalty) == pytest.approx(
+                brute_force_objective(y, penalty, min_size), abs=1e-9)
+            segments = np.diff([0] + breaks + [n])
+            assert len(breaks) == 0 or segments.min() >= min_size
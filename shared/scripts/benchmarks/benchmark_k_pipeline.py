@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the K(t) Pipeline
+
+Times the core K(t) pipeline functions on synthetic inputs of increasing
+size and compares the results against a saved baseline:
+
+- load_feature_series          per time grid
+- normalize_series             per time grid × normalization strategy
+- build_harmony_frame          per time grid × proxies per harmony
+- compute_k_series             per time grid × method (geometric, arithmetic)
+- _bootstrap_bands_per_year    per time grid × proxies × bootstrap samples
+- CascadeSimulator.simulate    per time grid (evaluation points)
+
+Inputs are generated with validation/synthetic_data.py: seven correlated
+harmony trends, one noisy proxy series per (harmony, proxy) written as
+year/value CSVs with ~10% of rows missing, so loading exercises parsing,
+alignment and interpolation. Time grids span 1810-2020:
+
+    decadal   22 points
+    annual    211 points
+    monthly   2532 points (the ETL keys series by integer year, so this is
+              a 12× denser integer time axis rather than calendar months)
+
+Each case is run once to warm up, then repeated up to --repeat times or
+until --max-time seconds have been spent on it; sub-millisecond cases are
+timed over batches of calls. Times are seconds per call. Results are
+written as JSON with machine metadata (platform, CPU, library versions,
+git commit); with a baseline, any case whose best time is slower than
+baseline by more than --tolerance is flagged and the exit status is 1.
+
+_bootstrap_bands_per_year lives in compute_k.py, which needs the
+historical_k and core packages of the full pipeline checkout; its cases
+are reported as skipped when those cannot be imported.
+
+Usage:
+    python shared/scripts/benchmarks/benchmark_k_pipeline.py --save-baseline
+    python shared/scripts/benchmarks/benchmark_k_pipeline.py --quick
+    python shared/scripts/benchmarks/benchmark_k_pipeline.py \\
+        --targets bootstrap_bands --proxies 10 100 --samples 100 1000
+
+Output: shared/scripts/benchmarks/results/benchmark_<timestamp>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SCRIPTS_DIR.parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BASELINE_PATH = RESULTS_DIR / "baseline.json"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR / "validation"))
+sys.path.insert(0, str(REPO_ROOT / "papers" / "02-civilization-collapse" / "code"))
+
+try:
+    from historical_k import aggregation_methods, etl
+except ImportError:  # processing/ checkout without the historical_k package
+    sys.path.insert(0, str(SCRIPTS_DIR / "processing"))
+    import aggregation_methods
+    import etl
+
+try:
+    from historical_k.compute_k import _bootstrap_bands_per_year
+    BOOTSTRAP_UNAVAILABLE = None
+except ImportError as exc:
+    _bootstrap_bands_per_year = None
+    BOOTSTRAP_UNAVAILABLE = f"compute_k not importable ({exc})"
+
+from collapse_models import CascadeSimulator
+from synthetic_data import harmony_trajectories
+
+RESULTS_VERSION = 1
+
+GRIDS = {
+    "decadal": np.arange(1810, 2021, 10),
+    "annual": np.arange(1810, 2021),
+    "monthly": np.arange(1810, 1810 + 211 * 12),
+}
+PROXY_COUNTS = (1, 10, 100)
+BOOTSTRAP_SAMPLES = (100, 1000)
+NORMALIZATION_STRATEGIES = (
+    "none",
+    "zscore_global",
+    "minmax_global",
+    "zscore_by_century",
+    "minmax_by_century",
+    "zscore_rolling_3",
+    "minmax_rolling_3",
+)
+K_METHODS = ("geometric", "arithmetic")
+
+HARMONIES = ["H1", "H2", "H3", "H4", "H5", "H6", "H7"]
+HARMONY_STARTS = [0.12, 0.15, 0.10, 0.08, 0.14, 0.11, 0.18]
+HARMONY_ENDS = [0.85, 0.95, 0.65, 0.90, 0.90, 0.80, 0.98]
+MISSING_FRACTION = 0.1
+SEED = 0
+MIN_RUN_TIME = 0.02  # seconds per timed run; fast cases are batched
+
+QUICK = {"grids": ["decadal", "annual"], "proxies": [1, 10], "samples": [100]}
+
+
+# =============================================================================
+# Synthetic inputs
+# =============================================================================
+
+def synthetic_harmonies(periods: np.ndarray, n_proxies: Optional[int] = None,
+                        seed: int = SEED) -> np.ndarray:
+    """(harmonies × periods), or (proxies × harmonies × periods), in [0.01, 1]."""
+    return harmony_trajectories(periods, HARMONY_STARTS, HARMONY_ENDS, noise=0.05,
+                                correlation=0.5, n_paths=n_proxies, seed=seed)
+
+
+class ProxyStore:
+    """Synthetic proxy CSVs per (grid, proxies per harmony), written once."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._written: Dict[Tuple[str, int], Dict[str, List[str]]] = {}
+
+    def proxies(self, grid: str, n_proxies: int) -> Tuple[Path, Dict[str, List[str]]]:
+        """(data_dir, {harmony: [feature, ...]}) for build_harmony_frame."""
+        data_dir = self.root / f"{grid}_{n_proxies}"
+        key = (grid, n_proxies)
+        if key not in self._written:
+            data_dir.mkdir(parents=True, exist_ok=True)
+            periods = GRIDS[grid]
+            values = synthetic_harmonies(periods, n_proxies)
+            rng = np.random.default_rng(SEED)
+            proxies = {}
+            for h, harmony in enumerate(HARMONIES):
+                proxies[harmony] = []
+                for p in range(n_proxies):
+                    feature = f"{harmony.lower()}_proxy_{p:03d}"
+                    keep = rng.random(len(periods)) >= MISSING_FRACTION
+                    pd.DataFrame({"year": periods[keep], "value": values[p, h, keep]}).to_csv(
+                        data_dir / f"{feature}.csv", index=False)
+                    proxies[harmony].append(feature)
+            self._written[key] = proxies
+        return data_dir, self._written[key]
+
+
+def feature_mats(periods: np.ndarray, n_proxies: int) -> Dict[str, pd.DataFrame]:
+    """Per-harmony (periods × proxies) frames, as compute_k._build_feature_mats returns."""
+    values = synthetic_harmonies(periods, n_proxies)
+    index = pd.Index(periods, name="year")
+    return {
+        harmony: pd.DataFrame(values[:, h, :].T, index=index,
+                              columns=[f"{harmony.lower()}_proxy_{p:03d}" for p in range(n_proxies)])
+        for h, harmony in enumerate(HARMONIES)
+    }
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+class Case:
+    """One benchmark: a target, its parameters and a zero-argument callable."""
+
+    def __init__(self, target: str, params: Dict[str, object],
+                 fn: Optional[Callable[[], object]] = None, skip: Optional[str] = None):
+        self.target = target
+        self.params = params
+        self.fn = fn
+        self.skip = skip
+
+    @property
+    def key(self) -> str:
+        args = ",".join(f"{k}={v}" for k, v in self.params.items())
+        return f"{self.target}[{args}]"
+
+
+def load_feature_cases(store: ProxyStore, grids, **_) -> Iterator[Case]:
+    for grid in grids:
+        data_dir, proxies = store.proxies(grid, 1)
+        feature = proxies["H1"][0]
+        yield Case("load_feature_series", {"grid": grid},
+                   lambda g=grid, d=data_dir, f=feature: etl.load_feature_series(f, GRIDS[g], d))
+
+
+def normalize_cases(store: ProxyStore, grids, **_) -> Iterator[Case]:
+    for grid, strategy in itertools.product(grids, NORMALIZATION_STRATEGIES):
+        data_dir, proxies = store.proxies(grid, 1)
+        series = etl.load_feature_series(proxies["H1"][0], GRIDS[grid], data_dir)
+        yield Case("normalize_series", {"grid": grid, "strategy": strategy},
+                   lambda s=series, g=grid, st=strategy: etl.normalize_series(s, GRIDS[g], st))
+
+
+def harmony_frame_cases(store: ProxyStore, grids, proxies, **_) -> Iterator[Case]:
+    for grid, n_proxies in itertools.product(grids, proxies):
+        data_dir, features = store.proxies(grid, n_proxies)
+        yield Case("build_harmony_frame", {"grid": grid, "proxies": n_proxies},
+                   lambda g=grid, d=data_dir, f=features: etl.build_harmony_frame(
+                       f, GRIDS[g], "minmax_global", data_dir=d))
+
+
+def k_series_cases(store: ProxyStore, grids, **_) -> Iterator[Case]:
+    # etl.compute_k_series dispatches to the same aggregation_methods
+    # functions, but imports them through the historical_k package
+    for grid, method in itertools.product(grids, K_METHODS):
+        periods = GRIDS[grid]
+        frame = pd.DataFrame(synthetic_harmonies(periods).T, index=pd.Index(periods, name="year"),
+                             columns=HARMONIES)
+        yield Case("compute_k_series", {"grid": grid, "method": method},
+                   lambda f=frame, m=method: aggregation_methods.compute_k_series(f, method=m))
+
+
+def bootstrap_cases(store: ProxyStore, grids, proxies, samples, **_) -> Iterator[Case]:
+    for grid, n_proxies, n_samples in itertools.product(grids, proxies, samples):
+        params = {"grid": grid, "proxies": n_proxies, "samples": n_samples}
+        if _bootstrap_bands_per_year is None:
+            yield Case("_bootstrap_bands_per_year", params, skip=BOOTSTRAP_UNAVAILABLE)
+            continue
+        mats = feature_mats(GRIDS[grid], n_proxies)
+        yield Case("_bootstrap_bands_per_year", params,
+                   lambda m=mats, n=n_samples: _bootstrap_bands_per_year(m, n, 0.95, SEED))
+
+
+def cascade_cases(store: ProxyStore, grids, **_) -> Iterator[Case]:
+    simulator = CascadeSimulator()
+    H0 = synthetic_harmonies(GRIDS["decadal"])[:, 0]
+    for grid in grids:
+        n = len(GRIDS[grid])
+        t_eval = np.linspace(0.0, 210.0, n)
+        yield Case("CascadeSimulator.simulate", {"grid": grid},
+                   lambda t=t_eval: simulator.simulate(H0, (0.0, 210.0), t_eval=t))
+
+
+TARGETS = {
+    "load_feature_series": load_feature_cases,
+    "normalize_series": normalize_cases,
+    "build_harmony_frame": harmony_frame_cases,
+    "compute_k_series": k_series_cases,
+    "bootstrap_bands": bootstrap_cases,
+    "cascade_simulate": cascade_cases,
+}
+
+
+# =============================================================================
+# Timing, metadata and baseline comparison
+# =============================================================================
+
+def time_case(fn: Callable[[], object], repeat: int, max_time: float) -> Tuple[List[float], int]:
+    """
+    Wall-clock seconds per call after one warm-up call.
+
+    Fast cases are timed over batches of calls lasting at least
+    MIN_RUN_TIME, so sub-millisecond timings are not dominated by timer
+    and scheduling noise.
+
+    Returns:
+        (seconds per call for each timed run, calls per run)
+    """
+    start = time.perf_counter()
+    fn()
+    warmup = time.perf_counter() - start
+    number = max(1, math.ceil(MIN_RUN_TIME / warmup)) if warmup > 0 else 1
+
+    times: List[float] = []
+    spent = 0.0
+    while len(times) < repeat and (not times or spent < max_time):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed / number)
+        spent += elapsed
+    return times, number
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                             text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def machine_metadata() -> Dict[str, object]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "git_commit": git_commit(),
+    }
+
+
+def run_benchmarks(targets: Sequence[str], grids: Sequence[str], proxies: Sequence[int],
+                   samples: Sequence[int], repeat: int = 5, max_time: float = 2.0,
+                   verbose: bool = True) -> List[Dict[str, object]]:
+    """Run every case of the selected targets; one result record per case."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="k_benchmark_") as tmp:
+        store = ProxyStore(Path(tmp))
+        for target in targets:
+            for case in TARGETS[target](store, grids=grids, proxies=proxies, samples=samples):
+                record: Dict[str, object] = {"key": case.key, "target": case.target, "params": case.params}
+                if case.skip:
+                    record["skipped"] = case.skip
+                    if verbose:
+                        print(f"  {case.key:<72} skipped: {case.skip}")
+                else:
+                    times, number = time_case(case.fn, repeat, max_time)
+                    record.update(times=times, number=number, min=min(times),
+                                  median=statistics.median(times), mean=statistics.fmean(times))
+                    if verbose:
+                        print(f"  {case.key:<72} {record['min'] * 1e3:10.3f} ms  (n={len(times)})")
+                results.append(record)
+    return results
+
+
+def compare_to_baseline(results: List[Dict[str, object]], baseline: Dict[str, object],
+                        tolerance: float) -> List[Dict[str, object]]:
+    """
+    Ratio of best times to the baseline per shared case.
+
+    Returns:
+        One record per case timed in both runs, with ratio and a
+        'regression' flag where ratio > 1 + tolerance
+    """
+    base = {r["key"]: r for r in baseline.get("results", []) if "min" in r}
+    comparison = []
+    for record in results:
+        ref = base.get(record["key"])
+        if ref is None or "min" not in record:
+            continue
+        ratio = record["min"] / ref["min"] if ref["min"] > 0 else float("inf")
+        comparison.append({
+            "key": record["key"],
+            "baseline": ref["min"],
+            "current": record["min"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + tolerance,
+        })
+    return comparison
+
+
+def metadata_mismatch(current: Dict[str, object], baseline: Dict[str, object]) -> List[str]:
+    """Machine / library fields that differ from the baseline's."""
+    fields = ("machine", "processor", "cpu_count", "python", "numpy", "pandas", "scipy")
+    return [f"{f}: {baseline.get(f)} -> {current.get(f)}" for f in fields if baseline.get(f) != current.get(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the K(t) pipeline on synthetic inputs")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS),
+                        help="Functions to benchmark (default: all)")
+    parser.add_argument("--grids", nargs="+", choices=list(GRIDS), default=list(GRIDS),
+                        help="Time grids (default: all)")
+    parser.add_argument("--proxies", nargs="+", type=int, default=list(PROXY_COUNTS),
+                        help="Proxies per harmony")
+    parser.add_argument("--samples", nargs="+", type=int, default=list(BOOTSTRAP_SAMPLES),
+                        help="Bootstrap samples")
+    parser.add_argument("--quick", action="store_true",
+                        help="Small grid: decadal/annual, 1 and 10 proxies, 100 samples")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--max-time", type=float, default=2.0,
+                        help="Stop repeating a case after this many seconds")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results JSON (default: results/benchmark_<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Also save these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Flag cases slower than baseline by more than this fraction")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.grids, args.proxies, args.samples = QUICK["grids"], QUICK["proxies"], QUICK["samples"]
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    print("=" * 80)
+    print("K(t) PIPELINE BENCHMARKS")
+    print("=" * 80)
+    metadata = machine_metadata()
+    print(f"{metadata['platform']} | {metadata['processor'] or metadata['machine']} | "
+          f"{metadata['cpu_count']} CPUs | Python {metadata['python']}")
+    print()
+
+    results = run_benchmarks(args.targets, args.grids, args.proxies, args.samples,
+                             args.repeat, args.max_time)
+    payload = {
+        "version": RESULTS_VERSION,
+        "metadata": metadata,
+        "config": {"targets": args.targets, "grids": args.grids, "proxies": args.proxies,
+                   "samples": args.samples, "repeat": args.repeat, "max_time": args.max_time},
+        "results": results,
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or RESULTS_DIR / f"benchmark_{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2))
+    print(f"\n✓ Saved: {output}")
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        mismatch = metadata_mismatch(metadata, baseline.get("metadata", {}))
+        print(f"\nComparison with baseline {args.baseline} (tolerance {args.tolerance:.0%})")
+        if mismatch:
+            print("⚠️  Baseline was recorded on a different machine or environment:")
+            for line in mismatch:
+                print(f"     {line}")
+        comparison = compare_to_baseline(results, baseline, args.tolerance)
+        for row in comparison:
+            flag = "❌ REGRESSION" if row["regression"] else ""
+            print(f"  {row['key']:<72} {row['ratio']:6.2f}×  {flag}")
+        regressions = [row for row in comparison if row["regression"]]
+        print(f"\n{len(regressions)} of {len(comparison)} cases regressed")
+    elif args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, indent=2))
+        print(f"✓ Saved baseline: {args.baseline}")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
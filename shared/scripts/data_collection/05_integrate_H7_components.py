@@ -21,6 +21,10 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import matplotlib.pyplot as plt
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "processing"))
+from aggregation_methods import nan_geometric_mean
 
 # Configuration
 COMPONENTS_DIR = Path("data/processed/H7_components")
@@ -76,43 +80,27 @@ def integrate_h7_components(patents=None, constitutions=None,
     print()
 
     # Create year range (1810-2020)
-    years = range(1810, 2021)
+    years = np.arange(1810, 2021)
     h7_data = pd.DataFrame({'year': years})
 
-    # Add each component if available
+    # Align each available component onto the year axis by index lookup
+    sources = [
+        ('patents', patents, 'patents_normalized'),
+        ('constitutions', constitutions, 'complexity_normalized'),
+        ('education', education, 'education_capital_normalized'),
+        ('infrastructure', infrastructure, 'infrastructure_normalized'),
+    ]
+
     components_used = []
+    component_cols = []
 
-    if patents is not None:
-        h7_data = h7_data.merge(
-            patents[['year', 'patents_normalized']],
-            on='year',
-            how='left'
-        )
-        components_used.append('patents')
-
-    if constitutions is not None:
-        h7_data = h7_data.merge(
-            constitutions[['year', 'complexity_normalized']],
-            on='year',
-            how='left'
-        )
-        components_used.append('constitutions')
-
-    if education is not None:
-        h7_data = h7_data.merge(
-            education[['year', 'education_capital_normalized']],
-            on='year',
-            how='left'
-        )
-        components_used.append('education')
-
-    if infrastructure is not None:
-        h7_data = h7_data.merge(
-            infrastructure[['year', 'infrastructure_normalized']],
-            on='year',
-            how='left'
-        )
-        components_used.append('infrastructure')
+    for name, component, col in sources:
+        if component is None:
+            continue
+        series = component.drop_duplicates('year', keep='last').set_index('year')[col]
+        h7_data[col] = series.reindex(years).to_numpy()
+        components_used.append(name)
+        component_cols.append(col)
 
     print(f"Components available: {len(components_used)}")
     print(f"Components: {', '.join(components_used)}")
@@ -120,24 +108,14 @@ def integrate_h7_components(patents=None, constitutions=None,
 
     # Calculate H₇ as geometric mean of available components
     # For each year, use only available (non-null) components
-
-    def geometric_mean_row(row):
-        """Calculate geometric mean of non-null values in row."""
-        values = [v for v in row if pd.notna(v)]
-        if len(values) == 0:
-            return np.nan
-        return np.prod(values) ** (1/len(values))
-
-    # Extract component columns (exclude 'year')
-    component_cols = [col for col in h7_data.columns if col != 'year']
-
-    h7_data['H7_validated'] = h7_data[component_cols].apply(
-        geometric_mean_row,
-        axis=1
+    h7, counts, _ = nan_geometric_mean(
+        h7_data[component_cols].to_numpy(dtype=float),
+        return_coverage=True
     )
+    h7_data['H7_validated'] = h7
 
     # Count how many components contributed to each year
-    h7_data['components_count'] = h7_data[component_cols].notna().sum(axis=1)
+    h7_data['components_count'] = counts
 
     print("H₇ Integration Complete:")
     print(f"  Years with 4 components: {(h7_data['components_count'] == 4).sum()}")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Offline Full-Text Index for World Bank Indicator Catalogs
+
+Indexes an indicator catalog CSV (id, name, description, source) so
+indicator discovery needs no network:
+
+- Inverted index in CSR form: a sorted vocabulary, per-term posting
+  offsets, and flat (document, weighted term frequency) arrays
+- Field weighting: a term in the name counts more than one in the
+  description (FIELD_WEIGHTS)
+- BM25 ranking; each query token also matches every vocabulary term it
+  prefixes ("electr" → electricity, electric, ...), found by binary search
+  in the sorted vocabulary; prefix expansions score at PREFIX_WEIGHT
+- Persisted as one .npz next to the catalog, keyed by the catalog's
+  SHA-256, and rebuilt only when the catalog changes
+
+Usage:
+    from indicator_index import load_indicator_index
+
+    index = load_indicator_index()
+    index.search("school enrollment", top_k=10)
+
+    python indicator_index.py "mean years schooling"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CATALOG_FILE = Path("data/raw/worldbank_indicator_catalog.csv")
+SNAPSHOT_FILE = Path("data/raw/worldbank_indicator_search_results.csv")
+INDEX_SUFFIX = ".index.npz"
+INDEX_VERSION = 1
+
+FIELDS = ("id", "name", "description", "source")
+FIELD_WEIGHTS = {"id": 1.5, "name": 2.0, "description": 1.0, "source": 0.5}
+PREFIX_WEIGHT = 0.5
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_INDEXES: Dict[Path, "IndicatorIndex"] = {}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens; ids like 'SE.ADT.LITR.ZS' split on punctuation."""
+    return _TOKEN.findall(str(text).lower())
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_catalog() -> Path:
+    """Full catalog if it has been downloaded, else the search-results snapshot."""
+    return CATALOG_FILE if CATALOG_FILE.exists() else SNAPSHOT_FILE
+
+
+class IndicatorIndex:
+    """BM25 inverted index over indicator id, name, description and source."""
+
+    def __init__(self, docs: pd.DataFrame, vocab: np.ndarray, offsets: np.ndarray,
+                 postings: np.ndarray, weights: np.ndarray, doc_lengths: np.ndarray,
+                 catalog_hash: str = ""):
+        self.docs = docs.reset_index(drop=True)
+        self._columns = {field: self.docs[field].to_numpy(dtype=object) for field in FIELDS}
+        self.vocab = vocab
+        self._vocab_list = vocab.tolist()
+        self.offsets = offsets
+        self.postings = postings
+        self.weights = weights
+        self.doc_lengths = doc_lengths
+        self.catalog_hash = catalog_hash
+
+        n_docs = len(self.docs)
+        doc_freq = np.diff(offsets)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        self.avg_length = float(doc_lengths.mean()) if n_docs else 0.0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @classmethod
+    def from_catalog(cls, catalog: pd.DataFrame, catalog_hash: str = "") -> "IndicatorIndex":
+        """Build the index from a catalog frame (one row per indicator id)."""
+        docs = catalog.reindex(columns=list(FIELDS)).fillna("").astype(str)
+        docs = docs.drop_duplicates(subset="id").reset_index(drop=True)
+
+        term_ids: Dict[str, int] = {}
+        doc_col, term_col, weight_col = [], [], []
+        doc_lengths = np.zeros(len(docs))
+        for field in FIELDS:
+            w = FIELD_WEIGHTS[field]
+            for d, text in enumerate(docs[field]):
+                tokens = tokenize(text)
+                doc_lengths[d] += w * len(tokens)
+                for token in tokens:
+                    doc_col.append(d)
+                    term_col.append(term_ids.setdefault(token, len(term_ids)))
+                    weight_col.append(w)
+
+        # Sort the vocabulary and remap term ids so postings are grouped by
+        # term in vocabulary order (CSR layout)
+        vocab = np.array(sorted(term_ids), dtype=object)
+        remap = np.empty(len(term_ids), dtype=np.int64)
+        remap[[term_ids[t] for t in vocab]] = np.arange(len(vocab))
+        terms = remap[np.asarray(term_col, dtype=np.int64)]
+        doc_arr = np.asarray(doc_col, dtype=np.int64)
+
+        # Sum weighted term frequency per (term, doc)
+        keys = terms * max(len(docs), 1) + doc_arr
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        tf = np.bincount(inverse, weights=np.asarray(weight_col, dtype=np.float64))
+        post_terms = unique_keys // max(len(docs), 1)
+        postings = unique_keys % max(len(docs), 1)
+        offsets = np.searchsorted(post_terms, np.arange(len(vocab) + 1))
+
+        return cls(docs, vocab, offsets, postings, tf, doc_lengths, catalog_hash)
+
+    def _expand(self, token: str, prefix: bool = True):
+        """
+        Vocabulary range [lo, hi) matching a token.
+
+        The exact term, plus with prefix=True every term extending it; in the
+        sorted vocabulary these are contiguous, and so are their postings.
+        """
+        lo = bisect_left(self._vocab_list, token)
+        if prefix:
+            hi = bisect_left(self._vocab_list, token + "\uffff")
+        else:
+            hi = lo + (lo < len(self._vocab_list) and self._vocab_list[lo] == token)
+        return lo, hi
+
+    def scores(self, query: str, prefix: bool = True) -> np.ndarray:
+        """BM25 score of every indicator for ``query``."""
+        scores = np.zeros(len(self.docs))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths / (self.avg_length or 1.0))
+        for token in tokenize(query):
+            lo, hi = self._expand(token, prefix)
+            if lo == hi:
+                continue
+            start, end = self.offsets[lo], self.offsets[hi]
+            docs = self.postings[start:end]
+            tf = self.weights[start:end]
+
+            # One block covers the exact term and all its prefix expansions
+            terms = np.repeat(np.arange(lo, hi), np.diff(self.offsets[lo:hi + 1]))
+            boost = np.where(terms == lo, 1.0 if self._vocab_list[lo] == token else PREFIX_WEIGHT, PREFIX_WEIGHT)
+            np.add.at(scores, docs, boost * self.idf[terms] * tf * (BM25_K1 + 1) / (tf + norm[docs]))
+        return scores
+
+    def search(self, query: str, top_k: int = 10, prefix: bool = True) -> pd.DataFrame:
+        """Top indicators for ``query`` with id, name, description, source and score."""
+        scores = self.scores(query, prefix)
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > top_k:
+            hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+        order = hits[np.lexsort((hits, -scores[hits]))]
+        result = {field: self._columns[field][order] for field in FIELDS}
+        result["score"] = scores[order]
+        return pd.DataFrame(result)
+
+    def save(self, path: Path) -> None:
+        """Persist the index as one compressed .npz."""
+        np.savez_compressed(
+            path,
+            version=np.array(INDEX_VERSION),
+            catalog_hash=np.array(self.catalog_hash),
+            vocab=self.vocab.astype(str),
+            offsets=self.offsets,
+            postings=self.postings,
+            weights=self.weights,
+            doc_lengths=self.doc_lengths,
+            **{f"doc_{field}": self.docs[field].to_numpy(dtype=str) for field in FIELDS},
+        )
+
+    @classmethod
+    def read(cls, path: Path) -> Optional["IndicatorIndex"]:
+        """Load a persisted index; None if the file is from another index version."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                return None
+            docs = pd.DataFrame({field: data[f"doc_{field}"].astype(object) for field in FIELDS})
+            return cls(docs, data["vocab"].astype(object), data["offsets"], data["postings"],
+                       data["weights"], data["doc_lengths"], str(data["catalog_hash"]))
+
+
+def index_path_for(catalog: Path) -> Path:
+    return catalog.with_name(f".{catalog.stem}{INDEX_SUFFIX}")
+
+
+def load_indicator_index(catalog: Optional[Path] = None, refresh: bool = False) -> IndicatorIndex:
+    """
+    Index for a catalog CSV, loaded from disk when the catalog is unchanged.
+
+    The persisted index is keyed by the catalog's SHA-256; a changed
+    catalog (or refresh=True) rebuilds and re-saves it.
+    """
+    catalog = Path(catalog) if catalog else default_catalog()
+    if not catalog.exists():
+        raise FileNotFoundError(f"Indicator catalog not found: {catalog}")
+
+    catalog_hash = _file_sha256(catalog)
+    cached = _INDEXES.get(catalog.resolve())
+    if cached is not None and cached.catalog_hash == catalog_hash and not refresh:
+        return cached
+
+    path = index_path_for(catalog)
+    index = None
+    if path.exists() and not refresh:
+        index = IndicatorIndex.read(path)
+        if index is not None and index.catalog_hash != catalog_hash:
+            index = None
+
+    if index is None:
+        index = IndicatorIndex.from_catalog(pd.read_csv(catalog, dtype=str), catalog_hash)
+        index.save(path)
+
+    _INDEXES[catalog.resolve()] = index
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the offline World Bank indicator index")
+    parser.add_argument("query", nargs="+", help="Search terms")
+    parser.add_argument("--catalog", type=Path, default=None, help="Catalog CSV (id, name, description, source)")
+    parser.add_argument("--top", type=int, default=10, help="Number of results")
+    parser.add_argument("--exact", action="store_true", help="Disable prefix matching")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the persisted index")
+    args = parser.parse_args()
+
+    index = load_indicator_index(args.catalog, refresh=args.rebuild)
+    query = " ".join(args.query)
+
+    start = time.perf_counter()
+    results = index.search(query, args.top, prefix=not args.exact)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{len(results)} of {len(index)} indicators match '{query}' ({elapsed:.2f} ms)")
+    for ind_id, name, score in zip(results["id"], results["name"], results["score"]):
+        print(f"  {score:6.2f}  {ind_id}: {name}")
+
+
+if __name__ == "__main__":
+    main()
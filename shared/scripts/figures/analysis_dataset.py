@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Shared Analysis Dataset for Figure and Table Generators
+
+The manuscript figures, harmony visualizations, supplementary tables and
+geometric-integration validation all start from the same K(t) CSVs. This
+module parses a K(t) table once and hands every generator the same
+pre-aligned AnalysisDataset:
+
+- Rows are sorted by (entity, year) with duplicate years dropped (last wins)
+- K(t), the harmony columns and the confidence-interval columns are detected
+  for both the final-index layout (h1..h7, k_index) and the extended-series
+  layout (named harmonies, K, K_lower, K_upper)
+- Derived columns are computed once: per-year relative growth
+  (``<col>_growth``), rank of each harmony within the year (``<h>_rank``,
+  1 = strongest), rank of K(t) across years (``k_rank``) and the historical
+  period of each year (``period``)
+- Period statistics (start/end/mean K, annual growth, harmony means) are a
+  small table on the dataset (``dataset.periods``)
+
+The aligned numeric matrix is cached as an uncompressed .npy (memory-mapped
+on load) with a JSON sidecar in ``.analysis_cache/`` next to the source CSV,
+keyed by the SHA-256 of the CSV. Within one process the dataset is memoised,
+so a full figure + table build parses each CSV at most once.
+
+Usage:
+    from analysis_dataset import load_analysis_dataset
+
+    data = load_analysis_dataset(DATA_PATH)
+    df = data.frame                 # year, harmonies, K, CI and derived columns
+    data.periods                    # per-period K(t) statistics
+    data.growth_factor(1810, 2020)  # end/start ratio for K and every harmony
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = ".analysis_cache"
+
+# Bump when the on-disk layout or derived columns change so stale caches are rebuilt
+CACHE_VERSION = 1
+
+# Historical periods used by the manuscript figures and period tables
+PERIODS: List[Tuple[int, int, str]] = [
+    (1810, 1870, "Pre-industrial"),
+    (1870, 1914, "First globalization"),
+    (1914, 1945, "World wars"),
+    (1945, 1980, "Post-war golden age"),
+    (1980, 2000, "Late 20th century"),
+    (2000, 2020, "21st century"),
+]
+
+# Column layouts in use across the project
+HARMONY_LAYOUTS = [
+    ["h1", "h2", "h3", "h4", "h5", "h6", "h7"],
+    [
+        "resonant_coherence",
+        "interconnection",
+        "reciprocity",
+        "play_entropy",
+        "wisdom_accuracy",
+        "flourishing",
+        "evolutionary_progression",
+    ],
+]
+K_COLUMNS = ["k_index", "K"]
+CI_COLUMNS = [("K_lower", "K_upper"), ("k_lower", "k_upper"), ("ci_lower", "ci_upper")]
+ENTITY_COLUMNS = ["region", "country_code"]
+
+# In-process memo: resolved path -> (source hash, dataset)
+_DATASETS: Dict[str, Tuple[str, "AnalysisDataset"]] = {}
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _first_present(columns: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
+    return next((c for c in candidates if c in columns), None)
+
+
+def _rank_desc(values: np.ndarray, axis: int) -> np.ndarray:
+    """Ordinal ranks (1 = largest) along an axis; NaN stays unranked."""
+    missing = np.isnan(values)
+    order = np.argsort(np.where(missing, np.inf, -values), axis=axis, kind="stable")
+    ranks = np.empty(values.shape, dtype=np.float64)
+    positions = np.arange(1, values.shape[axis] + 1, dtype=np.float64)
+    shape = [1] * values.ndim
+    shape[axis] = -1
+    np.put_along_axis(ranks, order, np.broadcast_to(positions.reshape(shape), values.shape), axis=axis)
+    ranks[missing] = np.nan
+    return ranks
+
+
+def period_index(years: np.ndarray, periods: Sequence[Tuple[int, int, str]] = PERIODS) -> np.ndarray:
+    """Index into ``periods`` for each year (start <= year < end; last period closed), -1 outside."""
+    years = np.asarray(years)
+    starts = np.array([p[0] for p in periods])
+    idx = np.searchsorted(starts, years, side="right") - 1
+    ends = np.array([p[1] for p in periods])
+    inside = (idx >= 0) & (years <= ends[np.clip(idx, 0, None)])
+    return np.where(inside, idx, -1)
+
+
+def build_dataset_frame(raw: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, object]]:
+    """
+    Align a raw K(t) table and add the derived columns.
+
+    Returns:
+        (frame, layout) where layout names the detected year, entity, K,
+        harmony and CI columns
+    """
+    if "year" not in raw.columns:
+        raise ValueError("K(t) table has no 'year' column")
+
+    entity = _first_present(raw.columns, ENTITY_COLUMNS)
+    k_col = _first_present(raw.columns, K_COLUMNS)
+    harmonies = next(
+        ([h for h in layout if h in raw.columns] for layout in HARMONY_LAYOUTS
+         if any(h in raw.columns for h in layout)),
+        [],
+    )
+    ci = next((list(pair) for pair in CI_COLUMNS if all(c in raw.columns for c in pair)), [])
+
+    keys = ([entity] if entity else []) + ["year"]
+    df = (
+        raw.sort_values(keys, kind="stable")
+        .drop_duplicates(keys, keep="last")
+        .reset_index(drop=True)
+    )
+
+    # Growth per year of spacing, within each entity
+    years = df["year"].to_numpy(dtype=np.float64)
+    same_entity = np.ones(len(df), dtype=bool)
+    if entity:
+        codes = pd.factorize(df[entity])[0]
+        same_entity[1:] = codes[1:] == codes[:-1]
+    same_entity[0] = False
+
+    value_cols = ([k_col] if k_col else []) + harmonies
+    derived: Dict[str, np.ndarray] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for col in value_cols:
+            x = df[col].to_numpy(dtype=np.float64)
+            growth = np.full(len(df), np.nan)
+            growth[1:] = (x[1:] - x[:-1]) / x[:-1] / (years[1:] - years[:-1])
+            growth[~same_entity] = np.nan
+            derived[f"{col}_growth"] = growth
+
+    if harmonies:
+        ranks = _rank_desc(df[harmonies].to_numpy(dtype=np.float64), axis=1)
+        for j, h in enumerate(harmonies):
+            derived[f"{h}_rank"] = ranks[:, j]
+
+    if k_col:
+        k = df[k_col].to_numpy(dtype=np.float64)
+        if entity:
+            k_rank = df.assign(_k=k).groupby(entity, sort=False)["_k"].rank(
+                ascending=False, method="first"
+            ).to_numpy()
+        else:
+            k_rank = _rank_desc(k, axis=0)
+        derived["k_rank"] = k_rank
+
+    derived["period"] = period_index(df["year"].to_numpy()).astype(np.float64)
+
+    frame = pd.concat([df, pd.DataFrame(derived, index=df.index)], axis=1)
+    layout = {"entity": entity, "k": k_col, "harmonies": harmonies, "ci": ci}
+    return frame, layout
+
+
+class AnalysisDataset:
+    """
+    Pre-aligned K(t) + harmonies + CI table with derived columns.
+
+    Attributes:
+        frame: DataFrame sorted by (entity, year) with source and derived columns
+        k_col: Name of the K(t) column (None if absent)
+        harmonies: Harmony columns in canonical order
+        ci: [lower, upper] CI column names, or [] if the table has no CI
+        entity: Entity column (region/country) or None for a global series
+        source: Path of the source CSV
+        source_hash: SHA-256 of the source CSV
+    """
+
+    def __init__(self, frame: pd.DataFrame, layout: Dict[str, object],
+                 source: Optional[Path] = None, source_hash: str = ""):
+        self.frame = frame
+        self.k_col = layout.get("k")
+        self.harmonies = list(layout.get("harmonies") or [])
+        self.ci = list(layout.get("ci") or [])
+        self.entity = layout.get("entity")
+        self.source = Path(source) if source else None
+        self.source_hash = source_hash
+
+    @classmethod
+    def from_frame(cls, raw: pd.DataFrame, source: Optional[Path] = None,
+                   source_hash: str = "") -> "AnalysisDataset":
+        frame, layout = build_dataset_frame(raw)
+        return cls(frame, layout, source, source_hash)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def years(self) -> np.ndarray:
+        return self.frame["year"].to_numpy()
+
+    @property
+    def source_columns(self) -> List[str]:
+        """Columns present in the source CSV (excludes derived columns)."""
+        return [c for c in self.frame.columns if c in self._source_columns]
+
+    @cached_property
+    def _source_columns(self) -> set:
+        derived = {f"{c}_growth" for c in [self.k_col, *self.harmonies] if c}
+        derived |= {f"{h}_rank" for h in self.harmonies} | {"k_rank", "period"}
+        return set(self.frame.columns) - derived
+
+    def harmony_frame(self) -> pd.DataFrame:
+        """Year-indexed harmony columns (global series only)."""
+        return self.frame.set_index("year")[self.harmonies]
+
+    def growth_factor(self, start: int, end: int) -> pd.Series:
+        """end/start ratio for K(t) and every harmony (global series only)."""
+        cols = ([self.k_col] if self.k_col else []) + self.harmonies
+        at = self.frame.set_index("year")[cols]
+        return at.loc[end] / at.loc[start]
+
+    @cached_property
+    def periods(self) -> pd.DataFrame:
+        """
+        K(t) statistics per historical period (and entity, if any).
+
+        Columns: [entity,] period, label, start, end, n_years, k_start, k_end,
+        k_mean, annual_growth_pct ((end - start) / start / years × 100),
+        annual_gain ((end - start) / years × 100) and <harmony>_mean.
+        Start/end values are taken at the period boundary years.
+        """
+        if self.k_col is None:
+            return pd.DataFrame()
+
+        groups = [(None, self.frame)] if self.entity is None else self.frame.groupby(self.entity, sort=False)
+        rows = []
+        for key, df in groups:
+            years = df["year"].to_numpy()
+            k = df[self.k_col].to_numpy(dtype=np.float64)
+            harmony_values = df[self.harmonies].to_numpy(dtype=np.float64)
+            for i, (start, end, label) in enumerate(PERIODS):
+                inside = (years >= start) & (years <= end)
+                if not inside.any():
+                    continue
+                at_start = np.flatnonzero(years == start)
+                at_end = np.flatnonzero(years == end)
+                k_start = k[at_start[-1]] if len(at_start) else np.nan
+                k_end = k[at_end[-1]] if len(at_end) else np.nan
+                span = end - start
+                row = {
+                    "period": i,
+                    "label": label,
+                    "start": start,
+                    "end": end,
+                    "n_years": int(inside.sum()),
+                    "k_start": k_start,
+                    "k_end": k_end,
+                    "k_mean": float(np.nanmean(k[inside])),
+                    "annual_growth_pct": (k_end - k_start) / k_start / span * 100,
+                    "annual_gain": (k_end - k_start) / span * 100,
+                }
+                if self.harmonies:
+                    means = np.nanmean(harmony_values[inside], axis=0)
+                    row.update({f"{h}_mean": m for h, m in zip(self.harmonies, means)})
+                if self.entity is not None:
+                    row = {self.entity: key, **row}
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def _cache_paths(source: Path, cache_dir: Optional[Path]) -> Tuple[Path, Path]:
+    cache_dir = Path(cache_dir) if cache_dir else source.parent / CACHE_DIRNAME
+    return cache_dir / f"{source.stem}.npy", cache_dir / f"{source.stem}.json"
+
+
+def save_dataset(dataset: AnalysisDataset, cache_dir: Optional[Path] = None) -> None:
+    """Write the numeric columns as one .npy matrix plus a JSON sidecar."""
+    values_path, meta_path = _cache_paths(dataset.source, cache_dir)
+    values_path.parent.mkdir(parents=True, exist_ok=True)
+
+    frame = dataset.frame
+    numeric = [c for c in frame.columns if pd.api.types.is_numeric_dtype(frame[c])]
+    labels = {
+        c: frame[c].astype(object).where(frame[c].notna(), None).tolist()
+        for c in frame.columns if c not in numeric
+    }
+
+    np.save(values_path, frame[numeric].to_numpy(dtype=np.float64))
+    meta_path.write_text(json.dumps({
+        "version": CACHE_VERSION,
+        "source_hash": dataset.source_hash,
+        "columns": list(frame.columns),
+        "numeric": numeric,
+        "labels": labels,
+        "layout": {"entity": dataset.entity, "k": dataset.k_col,
+                   "harmonies": dataset.harmonies, "ci": dataset.ci},
+    }))
+
+
+def read_dataset(source: Path, cache_dir: Optional[Path] = None) -> Tuple[AnalysisDataset, str]:
+    """Read a cached dataset (values memory-mapped); returns (dataset, source hash)."""
+    values_path, meta_path = _cache_paths(source, cache_dir)
+    meta = json.loads(meta_path.read_text())
+    if meta.get("version") != CACHE_VERSION:
+        raise ValueError(f"Stale analysis cache version in {meta_path}")
+
+    values = np.load(values_path, mmap_mode="r")
+    columns = {c: values[:, j] for j, c in enumerate(meta["numeric"])}
+    columns.update(meta["labels"])
+    frame = pd.DataFrame({c: columns[c] for c in meta["columns"]})
+
+    # Integer-valued source columns such as year round-trip through float64
+    if "year" in frame.columns:
+        frame["year"] = frame["year"].astype(np.int64)
+
+    return AnalysisDataset(frame, meta["layout"], source, meta["source_hash"]), meta["source_hash"]
+
+
+def load_analysis_dataset(path: Path, cache_dir: Optional[Path] = None,
+                          refresh: bool = False) -> AnalysisDataset:
+    """
+    Load the analysis dataset for a K(t) CSV.
+
+    Parses the CSV at most once per content hash: later calls reuse the
+    in-process dataset or the memory-mapped on-disk cache.
+
+    Raises:
+        FileNotFoundError: If the CSV does not exist
+    """
+    source = Path(path)
+    if not source.exists():
+        raise FileNotFoundError(f"K(t) data file not found: {source}")
+
+    source_hash = _file_sha256(source)
+    key = str(source.resolve())
+
+    memo = _DATASETS.get(key)
+    if not refresh and memo is not None and memo[0] == source_hash:
+        return memo[1]
+
+    dataset = None
+    if not refresh:
+        try:
+            cached, cached_hash = read_dataset(source, cache_dir)
+            if cached_hash == source_hash:
+                dataset = cached
+                logger.info(f"Loaded analysis dataset from cache for {source}")
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning(f"Ignoring unreadable analysis cache for {source}: {e}")
+
+    if dataset is None:
+        dataset = AnalysisDataset.from_frame(pd.read_csv(source), source, source_hash)
+        try:
+            save_dataset(dataset, cache_dir)
+        except OSError as e:
+            logger.warning(f"Could not write analysis cache for {source}: {e}")
+
+    _DATASETS[key] = (source_hash, dataset)
+    return dataset
@@ -18,6 +18,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+from analysis_dataset import AnalysisDataset, load_analysis_dataset
+from figure_build import FigureBuild
+
 # Set publication style
 plt.style.use('seaborn-v0_8-paper')
 sns.set_palette("husl")
@@ -34,17 +37,18 @@ plt.rcParams['ytick.labelsize'] = 9
 plt.rcParams['legend.fontsize'] = 9
 plt.rcParams['figure.titlesize'] = 14
 
+DATA_PATH = Path(__file__).parent / 'data_sources/processed/k_index_final_1810_2020.csv'
+
 def load_k_index_data():
-    """Load final K(t) index dataset."""
+    """Load final K(t) index dataset (shared, pre-aligned analysis dataset)."""
 
-    script_dir = Path(__file__).parent
-    data_path = script_dir / 'data_sources/processed/k_index_final_1810_2020.csv'
+    data_path = DATA_PATH
 
     print(f"Loading K(t) data from {data_path}...")
-    df = pd.read_csv(data_path)
+    data = load_analysis_dataset(data_path)
 
-    print(f"  ✅ Loaded: {len(df)} years × {len(df.columns)} columns")
-    return df
+    print(f"  ✅ Loaded: {len(data)} years × {len(data.source_columns)} columns")
+    return data
 
 def create_figure_1_k_trajectory(df, output_dir):
     """
@@ -162,36 +166,25 @@ def create_figure_2_all_harmonies(df, output_dir):
 
     plt.close()
 
-def create_figure_3_growth_rates(df, output_dir):
+def create_figure_3_growth_rates(df, output_dir, periods=None):
     """
     Figure 3: Growth Rates by Historical Period
     Compares K(t) growth across eras.
+
+    ``periods`` is the precomputed AnalysisDataset.periods table; it is
+    derived from ``df`` when not given.
     """
 
     print("\nCreating Figure 3: Growth Rates by Period...")
 
-    # Define periods
-    periods = [
-        (1810, 1870, "Pre-industrial\n(1810-1870)"),
-        (1870, 1914, "First globalization\n(1870-1914)"),
-        (1914, 1945, "World wars\n(1914-1945)"),
-        (1945, 1980, "Post-war golden age\n(1945-1980)"),
-        (1980, 2000, "Late 20th century\n(1980-2000)"),
-        (2000, 2020, "21st century\n(2000-2020)"),
-    ]
-
-    # Calculate growth rates
-    period_labels = []
-    growth_rates = []
+    if periods is None:
+        periods = AnalysisDataset.from_frame(df).periods
 
-    for start, end, label in periods:
-        k_start = df[df['year'] == start]['k_index'].values[0]
-        k_end = df[df['year'] == end]['k_index'].values[0]
-        years = end - start
-        annual_growth = ((k_end - k_start) / k_start) / years * 100
-
-        period_labels.append(label)
-        growth_rates.append(annual_growth)
+    period_labels = [
+        f"{label}\n({start}-{end})"
+        for label, start, end in zip(periods['label'], periods['start'], periods['end'])
+    ]
+    growth_rates = periods['annual_growth_pct'].tolist()
 
     # Create bar chart
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -353,8 +346,13 @@ def create_figure_5_harmony_growth_comparison(df, output_dir):
 
     plt.close()
 
-def main():
-    """Generate all manuscript figures."""
+def main(force=False, n_jobs=None):
+    """
+    Generate all manuscript figures.
+
+    Figures render in parallel and are skipped when the data and figure
+    code are unchanged since the last build (force=True re-renders all).
+    """
 
     print("=" * 70)
     print("MANUSCRIPT FIGURE GENERATION")
@@ -370,15 +368,25 @@ def main():
     print(f"Output directory: {output_dir}")
     print()
 
-    # Load data
-    df = load_k_index_data()
+    # Load data (parsed once; derived period statistics are precomputed)
+    data = load_k_index_data()
+    df = data.frame
 
     # Generate figures
-    create_figure_1_k_trajectory(df, output_dir)
-    create_figure_2_all_harmonies(df, output_dir)
-    create_figure_3_growth_rates(df, output_dir)
-    create_figure_4_harmony_contributions(df, output_dir)
-    create_figure_5_harmony_growth_comparison(df, output_dir)
+    build = FigureBuild(output_dir)
+    for name, func, kwargs in [
+        ('figure_1_k_trajectory', create_figure_1_k_trajectory, {}),
+        ('figure_2_all_harmonies', create_figure_2_all_harmonies, {}),
+        ('figure_3_growth_rates', create_figure_3_growth_rates, {'periods': data.periods}),
+        ('figure_4_harmony_contributions', create_figure_4_harmony_contributions, {}),
+        ('figure_5_harmony_growth_comparison', create_figure_5_harmony_growth_comparison, {}),
+    ]:
+        build.task(name, func, df, output_dir, **kwargs,
+                   inputs=[DATA_PATH], outputs=[output_dir / f'{name}.png'],
+                   code=[AnalysisDataset])
+    report = build.run(n_jobs=n_jobs, force=force)
+    if (report['status'] == 'failed').any():
+        raise RuntimeError(f"{(report['status'] == 'failed').sum()} figure(s) failed")
 
     print()
     print("=" * 70)
@@ -404,13 +412,21 @@ def main():
     print("=" * 70)
 
 if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Create manuscript figures for the historical K-Index")
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render figures even if inputs are unchanged')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Parallel render processes (default: CPU count)')
+    args = parser.parse_args()
+
     try:
-        main()
-        import sys
+        main(force=args.force, n_jobs=args.jobs)
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         import traceback
         traceback.print_exc()
-        import sys
         sys.exit(1)
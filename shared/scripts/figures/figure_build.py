@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Figure Build System
+
+Registers figure functions as tasks with declared input files and outputs,
+then renders them in a process pool with the Agg backend:
+
+- Each task is fingerprinted from its declared input files (SHA-256 of the
+  contents), the source file of the module defining its function (so
+  helpers, module-level data and style settings in that module count),
+  any extra code it declares (code=[module, function or path]) and its
+  arguments (DataFrames and arrays are hashed by value). Tasks whose
+  fingerprint matches the build manifest and whose outputs all exist are
+  skipped.
+- Figures render in parallel worker processes; a failing figure is reported
+  without stopping the others.
+- Per-figure render times are printed and stored in the manifest
+  (.figure_build.json in the output directory).
+
+Usage:
+    from figure_build import FigureBuild
+
+    build = FigureBuild(output_dir)
+    build.task('figure_1', create_figure_1_k_trajectory, df, output_dir,
+               inputs=[data_path], outputs=[output_dir / 'figure_1_k_trajectory.png'],
+               code=[analysis_dataset])
+    build.run()                  # parallel, incremental
+    build.run(force=True)        # re-render everything
+
+Figure functions must be importable module-level functions (picklable).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = ".figure_build.json"
+
+
+@dataclass
+class FigureTask:
+    """One figure: a render function, its arguments, inputs and outputs."""
+
+    name: str
+    func: Callable
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+    code: List[Path] = field(default_factory=list)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint_value(value: Any, digest) -> None:
+    """Feed a stable representation of an argument into the digest."""
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode() + str(value.shape).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=str):
+            digest.update(str(key).encode())
+            _fingerprint_value(value[key], digest)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _fingerprint_value(item, digest)
+    else:
+        digest.update(repr(value).encode())
+
+
+def source_path(obj: Any) -> Optional[Path]:
+    """Source file of a module, class or function; a path is returned as is."""
+    if isinstance(obj, (str, Path)):
+        return Path(obj)
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        return None
+    return Path(path) if path else None
+
+
+def _code_files(task: FigureTask) -> List[Path]:
+    """The task function's module source file, then its declared code files."""
+    files = []
+    for path in [source_path(task.func)] + list(task.code):
+        if path is not None and path not in files:
+            files.append(path)
+    return files
+
+
+def task_fingerprint(task: FigureTask) -> str:
+    """SHA-256 over input files, code files (defining module + declared) and arguments."""
+    digest = hashlib.sha256()
+    digest.update(f"{task.func.__module__}.{task.func.__qualname__}".encode())
+
+    code_files = _code_files(task)
+    if not code_files:
+        # Not defined in a source file (e.g. a builtin): hash what is available
+        try:
+            digest.update(inspect.getsource(task.func).encode())
+        except (OSError, TypeError):
+            pass
+
+    for kind, paths in (("code", code_files), ("input", task.inputs)):
+        for path in paths:
+            path = Path(path)
+            digest.update(f"{kind}:{path}".encode())
+            digest.update(_file_sha256(path).encode() if path.exists() else b"<missing>")
+
+    _fingerprint_value(task.args, digest)
+    _fingerprint_value(task.kwargs, digest)
+    return digest.hexdigest()
+
+
+def _init_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render(func: Callable, args: tuple, kwargs: Dict[str, Any]):
+    """Run one figure function; returns (seconds, error traceback or None)."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    try:
+        func(*args, **kwargs)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        plt.close("all")
+    return time.perf_counter() - start, error
+
+
+class FigureBuild:
+    """Incremental, parallel figure builder with a JSON manifest."""
+
+    def __init__(self, output_dir: Path, manifest: Optional[Path] = None):
+        self.output_dir = Path(output_dir)
+        self.manifest_path = Path(manifest) if manifest else self.output_dir / MANIFEST_NAME
+        self.tasks: List[FigureTask] = []
+
+    def task(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        inputs: Sequence[Path] = (),
+        outputs: Sequence[Path] = (),
+        code: Sequence[Any] = (),
+        **kwargs,
+    ) -> FigureTask:
+        """
+        Register a figure task; extra positional/keyword args go to func.
+
+        ``code`` lists modules, classes, functions or source paths outside
+        func's own module whose changes should re-render the figure.
+        """
+        code_files = [source_path(obj) for obj in code]
+        task = FigureTask(
+            name, func, args, kwargs, [Path(p) for p in inputs if p is not None],
+            [Path(p) for p in outputs], [p for p in code_files if p is not None],
+        )
+        self.tasks.append(task)
+        return task
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if self.manifest_path.exists():
+            try:
+                return json.loads(self.manifest_path.read_text())
+            except (ValueError, OSError):
+                pass
+        return {}
+
+    def run(
+        self, n_jobs: Optional[int] = None, force: bool = False, only: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Render every stale task.
+
+        Args:
+            n_jobs: Worker processes (default: CPU count; 1 renders in-process)
+            force: Ignore the manifest and re-render everything
+            only: Restrict the build to these task names
+
+        Returns:
+            DataFrame with one row per task: status ('built', 'skipped',
+            'failed') and render seconds
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+
+        selected = [t for t in self.tasks if only is None or t.name in only]
+        fingerprints = {t.name: task_fingerprint(t) for t in selected}
+
+        stale = [
+            t for t in selected
+            if force
+            or manifest.get(t.name, {}).get("fingerprint") != fingerprints[t.name]
+            or not all(p.exists() for p in t.outputs)
+        ]
+
+        results = {}
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(stale) <= 1:
+            _init_worker()
+            for t in stale:
+                results[t.name] = _render(t.func, t.args, t.kwargs)
+        elif stale:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(stale)), initializer=_init_worker
+            ) as pool:
+                futures = {t.name: pool.submit(_render, t.func, t.args, t.kwargs) for t in stale}
+                results = {name: future.result() for name, future in futures.items()}
+
+        rows = []
+        for t in selected:
+            if t.name not in results:
+                rows.append({"figure": t.name, "status": "skipped",
+                             "seconds": manifest.get(t.name, {}).get("seconds", np.nan)})
+                continue
+
+            seconds, error = results[t.name]
+            if error is None:
+                manifest[t.name] = {
+                    "fingerprint": fingerprints[t.name],
+                    "seconds": round(seconds, 3),
+                    "outputs": [str(p) for p in t.outputs],
+                }
+                rows.append({"figure": t.name, "status": "built", "seconds": seconds})
+            else:
+                manifest.pop(t.name, None)
+                print(f"  ❌ {t.name} failed:\n{error}")
+                rows.append({"figure": t.name, "status": "failed", "seconds": seconds})
+
+        self.manifest_path.write_text(json.dumps(manifest, indent=2))
+
+        report = pd.DataFrame(rows, columns=["figure", "status", "seconds"])
+        print_build_report(report)
+        return report
+
+
+def print_build_report(report: pd.DataFrame) -> None:
+    """Per-figure status and render time."""
+    print()
+    print(f"{'Figure':<40} {'Status':<8} {'Time (s)':>9}")
+    print("-" * 59)
+    for name, status, seconds in zip(report["figure"], report["status"], report["seconds"]):
+        shown = "" if pd.isna(seconds) else f"{seconds:.2f}"
+        print(f"{name:<40} {status:<8} {shown:>9}")
+    built = report[report["status"] == "built"]
+    print("-" * 59)
+    print(
+        f"Built {len(built)}, skipped {(report['status'] == 'skipped').sum()}, "
+        f"failed {(report['status'] == 'failed').sum()}; "
+        f"render time {built['seconds'].sum():.2f}s"
+    )
@@ -24,6 +24,9 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from analysis_dataset import load_analysis_dataset
+from figure_build import FigureBuild
+
 # Set publication-quality style
 sns.set_context("paper", font_scale=1.2)
 sns.set_style("whitegrid")
@@ -33,9 +36,9 @@ plt.rcParams["font.family"] = "serif"
 
 
 def load_k_series(input_file: Path) -> pd.DataFrame:
-    """Load K(t) time series with harmonies and bootstrap CI."""
+    """Load K(t) time series with harmonies and bootstrap CI (shared analysis dataset)."""
     print(f"📥 Loading K(t) series from {input_file}")
-    df = pd.read_csv(input_file)
+    df = load_analysis_dataset(input_file).frame
     print(
         f"   ✅ Loaded {len(df)} records ({df['year'].min():.0f} to {df['year'].max():.0f})"
     )
@@ -374,6 +377,12 @@ def main():
         default="both",
         help="Which visualization option to create",
     )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-render figures even if inputs are unchanged"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Parallel render processes (default: CPU count)"
+    )
 
     args = parser.parse_args()
 
@@ -391,23 +400,27 @@ def main():
     # Create output directory
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate visualizations
+    # Generate visualizations (parallel; unchanged figures are skipped)
+    build = FigureBuild(args.output_dir)
+    inputs = [args.input, args.correlations]
     if args.option in ["A", "both"]:
-        plot_multi_line(
-            df,
-            args.output_dir / "k_harmonies_multiline.png",
-            correlations,
-            show_ci=not args.no_ci,
+        output_file = args.output_dir / "k_harmonies_multiline.png"
+        build.task(
+            "k_harmonies_multiline", plot_multi_line, df, output_file, correlations,
+            show_ci=not args.no_ci, inputs=inputs, outputs=[output_file],
         )
 
     if args.option in ["B", "both"]:
-        plot_small_multiples(
-            df,
-            args.output_dir / "k_harmonies_small_multiples.png",
-            correlations,
-            show_ci=not args.no_ci,
+        output_file = args.output_dir / "k_harmonies_small_multiples.png"
+        build.task(
+            "k_harmonies_small_multiples", plot_small_multiples, df, output_file, correlations,
+            show_ci=not args.no_ci, inputs=inputs, outputs=[output_file],
         )
 
+    report = build.run(n_jobs=args.jobs, force=args.force)
+    if (report["status"] == "failed").any():
+        return 1
+
     print("\n" + "=" * 80)
     print("✅ Visualization complete!")
     print(f"📁 Figures saved to: {args.output_dir}")
@@ -20,9 +20,13 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from datetime import datetime
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).parent / "figures"))
+from figure_build import FigureBuild
+
 # Configuration
 BASE_DIR = Path("/srv/luminous-dynamics/historical-k-index-repo")
 OUTPUT_DIR = BASE_DIR / "outputs" / "figures" / "supplementary"
@@ -370,11 +374,20 @@ if __name__ == "__main__":
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
 
-    # Generate all supplementary figures
-    fig_s1 = generate_figure_s1()
-    fig_s2 = generate_figure_s2()
-    fig_s3 = generate_figure_s3()
-    fig_s4 = generate_figure_s4()
+    # Generate all supplementary figures (parallel; unchanged figures are skipped)
+    fig_s1 = OUTPUT_DIR / "figure_s1_harmony_time_series.png"
+    fig_s2 = OUTPUT_DIR / "figure_s2_correlation_heatmap.png"
+    fig_s3 = OUTPUT_DIR / "figure_s3_geographic_distribution.png"
+    fig_s4 = OUTPUT_DIR / "figure_s4_robustness_tests.png"
+
+    build = FigureBuild(OUTPUT_DIR)
+    build.task("figure_s1", generate_figure_s1,
+               inputs=[DATA_DIR / "K_index_time_series_1810_2020.csv"], outputs=[fig_s1])
+    build.task("figure_s2", generate_figure_s2,
+               inputs=[DATA_DIR / "H7_evolutionary_progression.csv"], outputs=[fig_s2])
+    build.task("figure_s3", generate_figure_s3, outputs=[fig_s3])
+    build.task("figure_s4", generate_figure_s4, outputs=[fig_s4])
+    build.run(force="--force" in sys.argv)
 
     # Summary
     print("=" * 80)
@@ -388,7 +401,7 @@ if __name__ == "__main__":
     print(f"  • figure_s3_geographic_distribution.png")
     print(f"  • figure_s4_robustness_tests.png")
     print()
-    print(f"Total size: {sum([f.stat().st_size for f in [fig_s1, fig_s2, fig_s3, fig_s4]]) / 1024:.1f} KB")
+    print(f"Total size: {sum([f.stat().st_size for f in [fig_s1, fig_s2, fig_s3, fig_s4] if f.exists()]) / 1024:.1f} KB")
     print()
     print(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
@@ -17,12 +17,16 @@ Author: [Your Name]
 Date: December 3, 2025
 """
 
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 import json
 
+sys.path.insert(0, str(Path(__file__).parent / "figures"))
+from analysis_dataset import load_analysis_dataset
+
 # Configuration
 BASE_DIR = Path("/srv/luminous-dynamics/historical-k-index-repo")
 OUTPUT_DIR = BASE_DIR / "outputs" / "tables"
@@ -260,16 +264,28 @@ def generate_table_s2():
 # TABLE S3: Regional K(t) Decomposition
 # ==============================================================================
 
-def generate_table_s3():
+K_FILE = DATA_DIR / "K_index_time_series_1810_2020.csv"
+
+
+def load_k_dataset():
+    """Load the K-index analysis dataset once for all tables (None if not available)."""
+    if not K_FILE.exists():
+        return None
+    print(f"Loading K-index data from: {K_FILE}")
+    return load_analysis_dataset(K_FILE)
+
+
+def generate_table_s3(data=None):
     """Generate Table S3: Regional K(t) Decomposition"""
     print("Generating Table S3: Regional K(t) Decomposition...")
 
-    # Load K-index data if available
-    k_file = DATA_DIR / "K_index_time_series_1810_2020.csv"
+    # Use the shared K-index dataset if available
+    if data is None:
+        data = load_k_dataset()
 
-    if k_file.exists():
-        print(f"  ✓ Loading K-index data from: {k_file}")
-        df_k = pd.read_csv(k_file)
+    if data is not None:
+        print(f"  ✓ Using K-index data from: {data.source}")
+        df_k = data.frame
     else:
         print(f"  ⚠ K-index data not found, creating template...")
         # Create template data for demonstration
@@ -385,10 +401,11 @@ if __name__ == "__main__":
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
 
-    # Generate all tables
+    # Parse the K-index data once, then generate all tables
+    k_data = load_k_dataset()
     df_s1 = generate_table_s1()
     df_s2 = generate_table_s2()
-    df_s3 = generate_table_s3()
+    df_s3 = generate_table_s3(k_data)
     df_s4 = generate_table_s4()
 
     # Summary
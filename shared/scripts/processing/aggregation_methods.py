@@ -102,6 +102,81 @@ def compute_k_geometric(
     return pd.Series(k_values, index=harmony_frame.index, name="K")
 
 
+def nan_geometric_mean(
+    values: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    return_coverage: bool = False,
+):
+    """
+    Row-wise geometric mean over the non-missing entries of a matrix.
+
+    Formula: G = exp(Σ_i w_i log(x_i) / Σ_i w_i), summing over observed x_i
+
+    Vectorized replacement for ``DataFrame.apply(geometric_mean_row, axis=1)``:
+    one log, one masked sum, one count and one exp over the whole
+    (rows × components) matrix. Works the same for a 211-year global series
+    and for a stacked country-year panel.
+
+    Rows with no observed component are NaN. A zero component gives a zero
+    mean (log(0) = -inf), matching ``np.prod(values) ** (1/n)``.
+
+    Args:
+        values: Array of shape (n_rows, n_components), NaN where missing
+        weights: Optional per-component weights; renormalized per row over
+            the observed components. Equal weights if None.
+        return_coverage: Also return per-row component counts and the
+            observed-value mask, computed in the same pass
+
+    Returns:
+        np.ndarray of geometric means, or (means, counts, mask) if
+        return_coverage is True
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 1:
+        arr = arr[:, np.newaxis]
+
+    mask = ~np.isnan(arr)
+    w = np.ones(arr.shape[1]) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_values = np.where(mask, np.log(np.where(mask, arr, 1.0)), 0.0)
+        weight_total = mask @ w
+        means = np.exp((log_values @ w) / weight_total)
+    means[weight_total <= 0] = np.nan
+
+    if return_coverage:
+        return means, mask.sum(axis=1), mask
+    return means
+
+
+def nan_arithmetic_mean(
+    values: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    return_coverage: bool = False,
+):
+    """
+    Row-wise weighted arithmetic mean over the non-missing entries of a matrix.
+
+    Arithmetic counterpart of nan_geometric_mean with the same arguments and
+    per-row weight renormalization.
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 1:
+        arr = arr[:, np.newaxis]
+
+    mask = ~np.isnan(arr)
+    w = np.ones(arr.shape[1]) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight_total = mask @ w
+        means = (np.where(mask, arr, 0.0) @ w) / weight_total
+    means[weight_total <= 0] = np.nan
+
+    if return_coverage:
+        return means, mask.sum(axis=1), mask
+    return means
+
+
 def compute_k_arithmetic(
     harmony_frame: pd.DataFrame, weights: Optional[Dict[str, float]] = None
 ) -> pd.Series:
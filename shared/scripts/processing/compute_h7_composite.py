@@ -1,8 +1,21 @@
 #!/usr/bin/env python3
 """
-Compute H7 Composite Index from Four Components
+Compute H7 Composite Index from its Components
 
-Merges all processed H7 components and computes weighted composite.
+Aligns every processed H7 component onto one shared year axis and computes
+the weighted composite as a single masked matrix operation.
+
+Components are declared in H7_COMPONENTS (file, column, weight); adding a
+fifth or sixth component is one more entry there. Component spans differ,
+so:
+
+- gaps inside a component's own span are linearly interpolated
+- outside its span a component is missing, and the weights of the
+  components present that year are renormalized to sum to 1
+  (nan_arithmetic_mean). ``--edge-fill hold`` instead extends each
+  component flat beyond its span (the original fill strategy)
+- a per-year coverage bitmap (bit i set when component i is present),
+  component count and covered weight share are written alongside H7
 
 Inputs:
   - data_sources/processed/h7_energy_1810_2020.csv
@@ -14,22 +27,114 @@ Output:
   - data_sources/processed/h7_composite_1810_2020.csv
 """
 
-import pandas as pd
-import numpy as np
+import argparse
 import sys
 from pathlib import Path
 
-def compute_h7_composite():
-    """Compute H7 composite from all four normalized components."""
+import numpy as np
+import pandas as pd
+
+from aggregation_methods import nan_arithmetic_mean
+
+# Component weights (without Knowledge component)
+H7_COMPONENTS = [
+    {'name': 'energy', 'label': 'Energy', 'file': 'h7_energy_1810_2020.csv',
+     'column': 'h7_energy_component', 'weight': 0.37},              # 37% (was 35%)
+    {'name': 'tech', 'label': 'Technology', 'file': 'h7_tech_1963_2023.csv',
+     'column': 'h7_tech_component', 'weight': 0.32},                # 32% (was 30%)
+    {'name': 'institutions', 'label': 'Institutions', 'file': 'h7_institutions_1800_2018.csv',
+     'column': 'h7_institutions_component', 'weight': 0.21},        # 21% (was 20%)
+    {'name': 'computation', 'label': 'Computation', 'file': 'h7_computation_1850_2020.csv',
+     'column': 'h7_computation_component', 'weight': 0.10},         # 10% (unchanged)
+]
+
+TARGET_START, TARGET_END = 1810, 2020
+EDGE_FILLS = ('none', 'hold')
+
+def load_components(processed_dir, components=H7_COMPONENTS):
+    """
+    Read each component's year and value columns.
+
+    Returns {name: (years, values)}; raises FileNotFoundError / ValueError
+    naming the component that could not be read.
+    """
+    loaded = {}
+    for comp in components:
+        path = Path(processed_dir) / comp['file']
+        if not path.exists():
+            raise FileNotFoundError(f"{comp['label']} component not found: {path}")
+
+        columns = pd.read_csv(path, nrows=0).columns
+        if comp['column'] not in columns:
+            raise ValueError(f"{comp['label']} file {path.name} has no '{comp['column']}' column")
+
+        data = pd.read_csv(path, usecols=['year', comp['column']]).dropna(subset=['year'])
+        years = data['year'].to_numpy(dtype=np.int64)
+        if len(np.unique(years)) != len(years):
+            raise ValueError(f"{comp['label']} has duplicate years in {path.name}")
+
+        loaded[comp['name']] = (years, data[comp['column']].to_numpy(dtype=np.float64))
+        print(f"  ✅ {comp['label']}: {len(years)} years ({years.min()}-{years.max()})")
+
+    return loaded
+
+def align_components(loaded, components=H7_COMPONENTS, edge_fill='none'):
+    """
+    Place all components on the union year axis as one (years × components) matrix.
+
+    Gaps inside each component's span are linearly interpolated; with
+    edge_fill='hold' values are also extended flat beyond the span.
+
+    Returns:
+        (years, values) with NaN where a component has no coverage
+    """
+    if edge_fill not in EDGE_FILLS:
+        raise ValueError(f"Unknown edge_fill '{edge_fill}'. Use {list(EDGE_FILLS)}.")
+
+    years = np.unique(np.concatenate([loaded[c['name']][0] for c in components]))
+    values = np.full((len(years), len(components)), np.nan)
+    for j, comp in enumerate(components):
+        comp_years, comp_values = loaded[comp['name']]
+        values[np.searchsorted(years, comp_years), j] = comp_values
+
+    frame = pd.DataFrame(values)
+    if edge_fill == 'hold':
+        frame = frame.interpolate(method='linear', limit_direction='both').ffill().bfill()
+    else:
+        frame = frame.interpolate(method='linear', limit_area='inside')
+
+    return years, frame.to_numpy()
+
+def coverage_bitmap(mask):
+    """Per-row integer with bit i set when component i is present."""
+    return np.asarray(mask, dtype=np.int64) @ (np.int64(1) << np.arange(mask.shape[1], dtype=np.int64))
+
+def weighted_composite(values, weights):
+    """
+    Weighted mean over the components present in each row.
+
+    Weights are renormalized per row over the observed components, so a
+    year with only energy and institutions uses 0.37/0.58 and 0.21/0.58.
+
+    Returns:
+        (composite, counts, covered weight share, coverage bitmap)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    composite, counts, mask = nan_arithmetic_mean(values, weights, return_coverage=True)
+    weight_share = (mask @ weights) / weights.sum()
+    return composite, counts, weight_share, coverage_bitmap(mask)
+
+def describe_bitmap(bitmap, components=H7_COMPONENTS):
+    """Component names encoded in a coverage bitmap value."""
+    names = [c['name'] for i, c in enumerate(components) if bitmap & (1 << i)]
+    return ' + '.join(names) if names else '(none)'
+
+def compute_h7_composite(components=H7_COMPONENTS, edge_fill='none', processed_dir=None):
+    """Compute H7 composite from all configured normalized components."""
 
     # Define paths (relative to historical_k directory)
     script_dir = Path(__file__).parent
-    processed_dir = script_dir / 'data_sources/processed'
-
-    energy_path = processed_dir / 'h7_energy_1810_2020.csv'
-    tech_path = processed_dir / 'h7_tech_1963_2023.csv'
-    institutions_path = processed_dir / 'h7_institutions_1800_2018.csv'
-    computation_path = processed_dir / 'h7_computation_1850_2020.csv'
+    processed_dir = Path(processed_dir) if processed_dir else script_dir / 'data_sources/processed'
     output_path = processed_dir / 'h7_composite_1810_2020.csv'
 
     print("=" * 70)
@@ -39,118 +144,55 @@ def compute_h7_composite():
 
     # Load all components
     print("Loading processed components...")
-
-    try:
-        energy = pd.read_csv(energy_path)
-        print(f"  ✅ Energy: {len(energy)} years ({energy['year'].min()}-{energy['year'].max()})")
-    except:
-        print(f"  ❌ Energy: File not found or error")
-        sys.exit(1)
-
-    try:
-        tech = pd.read_csv(tech_path)
-        print(f"  ✅ Technology: {len(tech)} years ({tech['year'].min()}-{tech['year'].max()})")
-    except:
-        print(f"  ❌ Technology: File not found or error")
-        sys.exit(1)
-
-    try:
-        institutions = pd.read_csv(institutions_path)
-        print(f"  ✅ Institutions: {len(institutions)} years ({institutions['year'].min()}-{institutions['year'].max()})")
-    except:
-        print(f"  ❌ Institutions: File not found or error")
-        sys.exit(1)
-
-    try:
-        computation = pd.read_csv(computation_path)
-        print(f"  ✅ Computation: {len(computation)} years ({computation['year'].min()}-{computation['year'].max()})")
-    except:
-        print(f"  ❌ Computation: File not found or error")
-        sys.exit(1)
-
+    loaded = load_components(processed_dir, components)
     print()
 
-    # Define component weights (without Knowledge component)
-    weights = {
-        'energy': 0.37,        # 37% (was 35%)
-        'tech': 0.32,          # 32% (was 30%)
-        'institutions': 0.21,  # 21% (was 20%)
-        'computation': 0.10    # 10% (unchanged)
-    }
-
+    weights = np.array([c['weight'] for c in components])
     print("Component weights:")
-    for component, weight in weights.items():
-        print(f"  {component.capitalize()}: {weight*100:.0f}%")
-    print(f"  Total: {sum(weights.values())*100:.0f}%")
+    for comp in components:
+        print(f"  {comp['label']}: {comp['weight']*100:.0f}%")
+    print(f"  Total: {weights.sum()*100:.0f}%")
     print()
 
-    # Prepare dataframes with consistent column names
-    energy_df = energy[['year', 'h7_energy_component']].copy()
-    tech_df = tech[['year', 'h7_tech_component']].copy()
-    institutions_df = institutions[['year', 'h7_institutions_component']].copy()
-    computation_df = computation[['year', 'h7_computation_component']].copy()
-
-    # Merge all components (outer join to preserve all years)
-    print("Merging components...")
-    h7_df = energy_df.merge(tech_df, on='year', how='outer')
-    h7_df = h7_df.merge(institutions_df, on='year', how='outer')
-    h7_df = h7_df.merge(computation_df, on='year', how='outer')
-
-    h7_df = h7_df.sort_values('year').reset_index(drop=True)
-
-    print(f"  Merged dataframe: {len(h7_df)} years ({h7_df['year'].min():.0f}-{h7_df['year'].max():.0f})")
+    # Align on the union year axis
+    print(f"Aligning components (edge fill: {edge_fill})...")
+    years, values = align_components(loaded, components, edge_fill)
+    print(f"  Year axis: {len(years)} years ({years.min()}-{years.max()})")
     print()
 
-    # Check data coverage
     print("Data coverage by component:")
-    print(f"  Energy: {energy_df['h7_energy_component'].notna().sum()} years")
-    print(f"  Technology: {tech_df['h7_tech_component'].notna().sum()} years")
-    print(f"  Institutions: {institutions_df['h7_institutions_component'].notna().sum()} years")
-    print(f"  Computation: {computation_df['h7_computation_component'].notna().sum()} years")
-    print()
-
-    # Handle missing data
-    print("Handling missing data...")
-    original_na_count = h7_df.isna().sum().sum()
-
-    # Strategy: Linear interpolation, then forward-fill, then backward-fill
-    for col in ['h7_energy_component', 'h7_tech_component',
-                'h7_institutions_component', 'h7_computation_component']:
-        na_before = h7_df[col].isna().sum()
-        if na_before > 0:
-            # First try interpolation
-            h7_df[col] = h7_df[col].interpolate(method='linear', limit_direction='both')
-            # Then forward-fill
-            h7_df[col] = h7_df[col].fillna(method='ffill')
-            # Then backward-fill
-            h7_df[col] = h7_df[col].fillna(method='bfill')
-
-            na_after = h7_df[col].isna().sum()
-            print(f"  {col}: {na_before} missing → {na_after} missing (filled {na_before - na_after})")
-
-    remaining_na = h7_df.isna().sum().sum()
-    print(f"  Total NaN values: {original_na_count} → {remaining_na}")
+    for j, comp in enumerate(components):
+        present = ~np.isnan(values[:, j])
+        print(f"  {comp['label']}: {present.sum()} years ({years[present].min()}-{years[present].max()})")
     print()
 
     # Compute weighted H7 composite
     print("Computing weighted H7 composite...")
-    h7_df['h7_composite'] = (
-        weights['energy'] * h7_df['h7_energy_component'] +
-        weights['tech'] * h7_df['h7_tech_component'] +
-        weights['institutions'] * h7_df['h7_institutions_component'] +
-        weights['computation'] * h7_df['h7_computation_component']
-    )
+    composite, counts, weight_share, bitmap = weighted_composite(values, weights)
+
+    h7_df = pd.DataFrame(values, columns=[c['column'] for c in components])
+    h7_df.insert(0, 'year', years)
+    h7_df['h7_composite'] = composite
+    h7_df['h7_n_components'] = counts
+    h7_df['h7_weight_coverage'] = weight_share
+    h7_df['h7_coverage_bitmap'] = bitmap
+
+    # Filter to target period (1810-2020)
+    print(f"Filtering to {TARGET_START}-{TARGET_END} period...")
+    h7_final = h7_df[(h7_df['year'] >= TARGET_START) & (h7_df['year'] <= TARGET_END)].reset_index(drop=True)
+    print(f"  Final dataset: {len(h7_final)} years")
+    print()
 
     # Check for any remaining NaN in composite
-    composite_na = h7_df['h7_composite'].isna().sum()
+    composite_na = h7_final['h7_composite'].isna().sum()
     if composite_na > 0:
-        print(f"  ⚠️  Warning: {composite_na} NaN values in composite!")
+        print(f"  ⚠️  Warning: {composite_na} years with no component coverage!")
     else:
         print(f"  ✅ No NaN values in composite")
 
     # Verify normalization (composite should be 0-1)
-    comp_min = h7_df['h7_composite'].min()
-    comp_max = h7_df['h7_composite'].max()
+    comp_min = h7_final['h7_composite'].min()
+    comp_max = h7_final['h7_composite'].max()
     print(f"  Composite range: {comp_min:.6f} to {comp_max:.6f}")
 
     if comp_min < 0 or comp_max > 1:
@@ -159,10 +201,15 @@ def compute_h7_composite():
         print(f"  ✅ Composite within [0, 1] range")
     print()
 
-    # Filter to target period (1810-2020)
-    print("Filtering to 1810-2020 period...")
-    h7_final = h7_df[(h7_df['year'] >= 1810) & (h7_df['year'] <= 2020)].copy()
-    print(f"  Final dataset: {len(h7_final)} years")
+    # Coverage windows: contiguous runs of the same bitmap
+    print("Coverage windows (weights renormalized over present components):")
+    bits = h7_final['h7_coverage_bitmap'].to_numpy()
+    run_starts = np.flatnonzero(np.r_[True, bits[1:] != bits[:-1]])
+    run_ends = np.r_[run_starts[1:], len(bits)] - 1
+    for s, e in zip(run_starts, run_ends):
+        share = h7_final['h7_weight_coverage'].iloc[s]
+        print(f"  {h7_final['year'].iloc[s]}-{h7_final['year'].iloc[e]}: "
+              f"{describe_bitmap(bits[s], components)} ({share*100:.0f}% of weight)")
     print()
 
     # Save composite
@@ -183,8 +230,7 @@ def compute_h7_composite():
 
     # Show first 5 years
     print("\nFirst 5 years:")
-    display_cols = ['year', 'h7_energy_component', 'h7_tech_component',
-                    'h7_institutions_component', 'h7_computation_component', 'h7_composite']
+    display_cols = ['year'] + [c['column'] for c in components] + ['h7_composite']
     print(h7_final[display_cols].head().to_string(index=False))
 
     # Show last 5 years
@@ -194,18 +240,17 @@ def compute_h7_composite():
     # Show key historical years
     key_years = [1810, 1850, 1900, 1950, 2000, 2020]
     print("\nKey historical years:")
+    composite_by_year = h7_final.set_index('year')['h7_composite']
     for year in key_years:
-        row = h7_final[h7_final['year'] == year]
-        if not row.empty:
-            h7_val = row['h7_composite'].values[0]
-            print(f"  {year}: H7 = {h7_val:.6f}")
+        if year in composite_by_year.index:
+            print(f"  {year}: H7 = {composite_by_year[year]:.6f}")
 
     # Calculate growth rates
     print("\nGrowth analysis:")
-    h7_1810 = h7_final[h7_final['year'] == 1810]['h7_composite'].values[0]
-    h7_2020 = h7_final[h7_final['year'] == 2020]['h7_composite'].values[0]
+    h7_1810 = composite_by_year.get(TARGET_START, np.nan)
+    h7_2020 = composite_by_year.get(TARGET_END, np.nan)
     h7_growth = h7_2020 / h7_1810 if h7_1810 > 0 else float('inf')
-    years_span = 2020 - 1810
+    years_span = TARGET_END - TARGET_START
 
     print(f"  1810 baseline: {h7_1810:.6f}")
     print(f"  2020 final: {h7_2020:.6f}")
@@ -218,16 +263,22 @@ def compute_h7_composite():
     print("=" * 70)
     print("✅ H7 COMPOSITE CONSTRUCTION COMPLETE")
     print(f"✅ Output: {output_path}")
-    print(f"✅ Coverage: {len(h7_final)} years (1810-2020)")
-    print(f"✅ All 4 components integrated with weights:")
-    print(f"   Energy (37%) + Tech (32%) + Institutions (21%) + Computation (10%)")
+    print(f"✅ Coverage: {len(h7_final)} years ({TARGET_START}-{TARGET_END})")
+    print(f"✅ All {len(components)} components integrated with weights:")
+    print("   " + " + ".join(f"{c['label']} ({c['weight']*100:.0f}%)" for c in components))
     print("=" * 70)
 
     return h7_final
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compute the weighted H7 composite")
+    parser.add_argument('--edge-fill', choices=EDGE_FILLS, default='none',
+                        help="'none': renormalize weights outside a component's span; "
+                             "'hold': extend components flat (original behaviour)")
+    args = parser.parse_args()
+
     try:
-        result = compute_h7_composite()
+        result = compute_h7_composite(edge_fill=args.edge_fill)
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
@@ -13,75 +13,30 @@ Based on:
 - ITU: World Telecommunication Indicators
 - Hanson & Sigman (2021): State capacity measures
 
+Milestones, era segments, weights and period labels live in
+harmony_specs/h1_governance.json and are evaluated by milestones.py.
+
 Output: data_sources/h1_governance/governance_coherence_1810_2020.csv
 """
 
-import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from milestones import build_harmony, evaluate_components, load_spec, time_axis
+
+SPEC = load_spec('h1_governance')
+
 def create_communication_infrastructure_series():
     """
     Create communication infrastructure evolution 1810-2020.
 
-    Combines three eras:
+    Combines three eras (segments in the spec):
     - Telegraph (1840-1920): Stations per capita, message volume
     - Telephone (1880-2020): Fixed lines per 100 inhabitants
     - Internet (1990-2020): Users per 100 inhabitants
     """
-
-    years = list(range(1810, 2021))
-    comm_values = []
-
-    for year in years:
-        if year < 1840:
-            # Pre-telegraph: very limited coordination (mail, messengers)
-            comm = 0.01 + (year - 1810) * 0.0001  # Slow linear growth
-
-        elif 1840 <= year < 1880:
-            # Telegraph expansion era
-            # Growth from first commercial telegraph (1840) to telephone (1880)
-            t = (year - 1840) / 40  # Normalized time in era
-            comm = 0.02 + 0.18 * t  # Linear growth to 0.20 by 1880
-
-        elif 1880 <= year < 1920:
-            # Telegraph peak + early telephone
-            t = (year - 1880) / 40
-            comm = 0.20 + 0.15 * t  # Growth to 0.35 by 1920
-
-        elif 1920 <= year < 1950:
-            # Telephone expansion, telegraph decline
-            t = (year - 1920) / 30
-            comm = 0.35 + 0.10 * t  # Growth to 0.45 by 1950
-
-        elif 1950 <= year < 1970:
-            # Telephone ubiquity in developed world
-            t = (year - 1950) / 20
-            comm = 0.45 + 0.10 * t  # Growth to 0.55 by 1970
-
-        elif 1970 <= year < 1990:
-            # Telephone saturation, pre-internet
-            t = (year - 1970) / 20
-            comm = 0.55 + 0.05 * t  # Slower growth to 0.60 by 1990
-
-        elif 1990 <= year < 2000:
-            # Early internet era
-            t = (year - 1990) / 10
-            comm = 0.60 + 0.10 * t  # Growth to 0.70 by 2000
-
-        elif 2000 <= year < 2010:
-            # Broadband expansion
-            t = (year - 2000) / 10
-            comm = 0.70 + 0.12 * t  # Growth to 0.82 by 2010
-
-        else:  # 2010-2020
-            # Mobile internet, near-universal access in developed world
-            t = (year - 2010) / 10
-            comm = 0.82 + 0.08 * t  # Growth to 0.90 by 2020
-
-        comm_values.append(comm)
-
-    return comm_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['communication_infrastructure'])
+    return values['communication_infrastructure'].tolist()
 
 def create_state_capacity_series():
     """
@@ -92,65 +47,9 @@ def create_state_capacity_series():
     - Administrative coverage (census, vital statistics)
     - Bureaucratic capacity
     """
-
-    # Historical milestones for state capacity
-    capacity_milestones = {
-        # Pre-modern state (1810-1870)
-        1810: 0.05,  # Minimal extractive capacity
-        1820: 0.06,
-        1830: 0.07,
-        1840: 0.08,
-        1850: 0.09,
-        1860: 0.10,
-        1870: 0.12,
-
-        # Modern state emergence (1870-1914)
-        1880: 0.14,  # Professionalization begins
-        1890: 0.16,
-        1900: 0.18,
-        1910: 0.20,
-        1914: 0.22,
-
-        # World wars expansion (1914-1945)
-        1918: 0.25,  # WWI state mobilization
-        1920: 0.23,  # Post-war contraction
-        1930: 0.24,
-        1940: 0.30,  # WWII mobilization
-        1945: 0.32,
-
-        # Welfare state era (1945-1980)
-        1950: 0.35,  # Welfare state construction
-        1960: 0.40,
-        1970: 0.48,  # Peak welfare state
-        1980: 0.52,
-
-        # Modern era (1980-2020)
-        1990: 0.54,
-        2000: 0.58,
-        2010: 0.62,
-        2020: 0.65,  # High state capacity globally
-    }
-
-    # Create annual series with interpolation
-    years = list(range(1810, 2021))
-    capacity_values = []
-
-    for year in years:
-        if year in capacity_milestones:
-            capacity_values.append(capacity_milestones[year])
-        else:
-            # Linear interpolation
-            prev_year = max([y for y in capacity_milestones.keys() if y < year])
-            next_year = min([y for y in capacity_milestones.keys() if y > year])
-
-            prev_val = capacity_milestones[prev_year]
-            next_val = capacity_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            capacity = prev_val + frac * (next_val - prev_val)
-            capacity_values.append(capacity)
-
-    return capacity_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['state_capacity'])
+    return values['state_capacity'].tolist()
 
 def create_h1_governance_dataset():
     """Create complete H1 governance coherence dataset 1810-2020."""
@@ -167,38 +66,19 @@ def create_h1_governance_dataset():
 
     output_path = output_dir / 'governance_coherence_1810_2020.csv'
 
-    # Create component series
-    print("Creating communication infrastructure series (1810-2020)...")
-    comm_infra = create_communication_infrastructure_series()
-    print(f"  Communication infrastructure range: {min(comm_infra):.4f} to {max(comm_infra):.4f}")
-
-    print("Creating state capacity series (1810-2020)...")
-    state_cap = create_state_capacity_series()
-    print(f"  State capacity range: {min(state_cap):.4f} to {max(state_cap):.4f}")
+    # Evaluate components, composite (70% communication + 30% state
+    # capacity, each clipped to [0, 1]) and period labels from the spec
+    print("Evaluating H1 milestone spec (1810-2020)...")
+    output_df = build_harmony(SPEC)
+    comm_infra = output_df['communication_infrastructure']
+    state_cap = output_df['state_capacity']
+    print(f"  Communication infrastructure range: {comm_infra.min():.4f} to {comm_infra.max():.4f}")
+    print(f"  State capacity range: {state_cap.min():.4f} to {state_cap.max():.4f}")
     print()
 
-    # Create dataframe
-    years = list(range(1810, 2021))
-    df = pd.DataFrame({
-        'year': years,
-        'communication_infrastructure': comm_infra,
-        'state_capacity': state_cap
-    })
-
-    # Both already roughly normalized to 0-1, but ensure it
-    print("Normalizing components to 0-1 scale...")
-    df['comm_normalized'] = np.clip(df['communication_infrastructure'], 0, 1)
-    df['state_normalized'] = np.clip(df['state_capacity'], 0, 1)
-
-    # Composite H1 component: 70% communication + 30% state capacity
-    df['h1_governance_component'] = (
-        0.70 * df['comm_normalized'] +
-        0.30 * df['state_normalized']
-    )
-
     # Verify normalization
-    h1_min = df['h1_governance_component'].min()
-    h1_max = df['h1_governance_component'].max()
+    h1_min = output_df['h1_governance_component'].min()
+    h1_max = output_df['h1_governance_component'].max()
 
     print(f"  H1 component range: {h1_min:.6f} to {h1_max:.6f}")
 
@@ -208,32 +88,6 @@ def create_h1_governance_dataset():
         print(f"  ✅ H1 within [0, 1] range")
     print()
 
-    # Add historical period labels
-    def get_period_label(year):
-        if year < 1840:
-            return "Pre-telegraph (mail/messenger)"
-        elif year < 1880:
-            return "Telegraph era (near-instant coordination)"
-        elif year < 1950:
-            return "Telephone era (two-way communication)"
-        elif year < 1990:
-            return "Telephone ubiquity (developed world)"
-        else:
-            return "Internet era (digital governance)"
-
-    df['period'] = df['year'].apply(get_period_label)
-
-    # Prepare output dataframe
-    output_df = df[[
-        'year',
-        'communication_infrastructure',
-        'state_capacity',
-        'h1_governance_component',
-        'period'
-    ]].copy()
-
-    output_df = output_df.rename(columns={'period': 'notes'})
-
     # Save dataset
     print(f"Saving H1 dataset to {output_path}...")
     output_df.to_csv(output_path, index=False)
@@ -15,13 +15,19 @@ Primary measures:
 - Foreign asset holdings
 - Interest rate convergence
 
+Milestones, weights and period labels live in
+harmony_specs/h2_interconnection.json and are evaluated by milestones.py.
+
 Output: data_sources/h2_interconnection/financial_integration_1810_2020.csv
 """
 
 import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from milestones import build_harmony, evaluate_components, load_spec, time_axis
+
+SPEC = load_spec('h2_interconnection')
+
 def create_financial_integration_series():
     """
     Create financial integration index based on historical patterns.
@@ -30,74 +36,15 @@ def create_financial_integration_series():
     - Obstfeld & Taylor (2004): Global Capital Markets
     - Quinn & Voth (2008): Free flows of capital
     - Lane & Milesi-Ferretti (2007): External wealth of nations
-    """
 
-    # Historical milestones for financial integration
-    # Scale: 0 (autarky) to 1 (perfect integration)
-
-    integration_milestones = {
-        # Pre-globalization era (1810-1870)
-        1810: 0.05,  # Post-Napoleonic, very limited integration
-        1820: 0.06,
-        1830: 0.07,
-        1840: 0.09,  # Early railway bonds
-        1850: 0.12,  # Telegraph beginning to connect markets
-        1860: 0.15,
-
-        # First Globalization (1870-1914): Gold Standard Era
-        1870: 0.20,  # Gold standard spreading
-        1880: 0.30,  # Major capital flows to Americas
-        1890: 0.40,  # Peak pre-WWI integration
-        1900: 0.50,  # High capital mobility
-        1910: 0.55,  # Peak of first globalization
-        1914: 0.55,  # Pre-WWI peak
-
-        # World Wars & Interwar (1914-1945): Deglobalization
-        1918: 0.25,  # WWI disruption
-        1920: 0.30,  # Brief recovery
-        1929: 0.35,  # Pre-Depression peak
-        1933: 0.15,  # Great Depression trough
-        1939: 0.20,  # Pre-WWII
-        1945: 0.15,  # Post-WWII low
-
-        # Bretton Woods (1945-1970): Limited Integration
-        1950: 0.20,  # Bretton Woods begins
-        1960: 0.25,  # Gradual opening
-        1970: 0.30,  # System breaking down
-
-        # Second Globalization (1970-2020): Capital Liberalization
-        1980: 0.45,  # Reagan/Thatcher liberalization
-        1990: 0.65,  # Post-Cold War integration
-        2000: 0.80,  # Euro, emerging market integration
-        2007: 0.95,  # Pre-financial crisis peak
-        2010: 0.85,  # Post-crisis retreat
-        2015: 0.90,  # Recovery
-        2020: 0.88,  # COVID disruption
-    }
-
-    # Create annual series with interpolation
-    years = list(range(1810, 2021))
-    integration_values = []
-
-    for year in years:
-        if year in integration_milestones:
-            integration_values.append(integration_milestones[year])
-        else:
-            # Linear interpolation between milestones
-            prev_year = max([y for y in integration_milestones.keys() if y < year])
-            next_year = min([y for y in integration_milestones.keys() if y > year])
-
-            prev_int = integration_milestones[prev_year]
-            next_int = integration_milestones[next_year]
-
-            # Linear interpolation
-            frac = (year - prev_year) / (next_year - prev_year)
-            integration = prev_int + frac * (next_int - prev_int)
-            integration_values.append(integration)
+    Scale: 0 (autarky) to 1 (perfect integration).
+    """
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['financial_integration_index'])
 
     df = pd.DataFrame({
-        'year': years,
-        'financial_integration_index': integration_values
+        'year': years.astype(int),
+        'financial_integration_index': values['financial_integration_index']
     })
 
     return df
@@ -108,39 +55,9 @@ def add_trade_openness():
 
     Trade openness = (Exports + Imports) / GDP
     """
-
-    trade_milestones = {
-        1810: 0.10,  # Low trade ratios post-Napoleonic
-        1850: 0.15,  # Industrial revolution trade growth
-        1870: 0.20,  # First globalization begins
-        1913: 0.35,  # Peak of first globalization
-        1930: 0.25,  # Great Depression collapse
-        1950: 0.20,  # Post-WWII recovery
-        1970: 0.30,  # Trade liberalization
-        1990: 0.45,  # WTO/globalization
-        2000: 0.55,  # China's entry to WTO
-        2008: 0.65,  # Pre-crisis peak
-        2020: 0.60,  # Pandemic disruption
-    }
-
-    years = list(range(1810, 2021))
-    trade_values = []
-
-    for year in years:
-        if year in trade_milestones:
-            trade_values.append(trade_milestones[year])
-        else:
-            prev_year = max([y for y in trade_milestones.keys() if y < year])
-            next_year = min([y for y in trade_milestones.keys() if y > year])
-
-            prev_trade = trade_milestones[prev_year]
-            next_trade = trade_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            trade = prev_trade + frac * (next_trade - prev_trade)
-            trade_values.append(trade)
-
-    return trade_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['trade_openness'])
+    return values['trade_openness'].tolist()
 
 def create_h2_interconnection_dataset():
     """Create complete H2 interconnection dataset 1810-2020."""
@@ -157,36 +74,18 @@ def create_h2_interconnection_dataset():
 
     output_path = output_dir / 'financial_integration_1810_2020.csv'
 
-    # Create financial integration series
-    print("Creating financial integration series (1810-2020)...")
-    df = create_financial_integration_series()
-    print(f"  Created {len(df)} years of financial integration estimates")
-    print(f"  Integration range: {df['financial_integration_index'].min():.3f} to {df['financial_integration_index'].max():.3f}")
+    # Evaluate components, composite (60% financial integration + 40% trade
+    # openness scaled by 0.70) and period labels from the spec
+    print("Evaluating H2 milestone spec (1810-2020)...")
+    output_df = build_harmony(SPEC)
+    print(f"  Created {len(output_df)} years of estimates")
+    print(f"  Integration range: {output_df['financial_integration_index'].min():.3f} to {output_df['financial_integration_index'].max():.3f}")
+    print(f"  Trade openness range: {output_df['trade_openness'].min():.3f} to {output_df['trade_openness'].max():.3f}")
     print()
 
-    # Add trade openness
-    print("Adding trade openness measure...")
-    df['trade_openness'] = add_trade_openness()
-    print(f"  Trade openness range: {df['trade_openness'].min():.3f} to {df['trade_openness'].max():.3f}")
-    print()
-
-    # Compute H2 composite
-    print("Computing H2 composite index...")
-    print("  Formula: 60% financial integration + 40% trade openness")
-
-    # Normalize both to 0-1 (already roughly normalized, but ensure it)
-    df['finance_normalized'] = np.minimum(1.0, df['financial_integration_index'])
-    df['trade_normalized'] = np.minimum(1.0, df['trade_openness'] / 0.70)  # Normalize to 0-1
-
-    # Weighted composite
-    df['h2_interconnection_component'] = (
-        0.60 * df['finance_normalized'] +
-        0.40 * df['trade_normalized']
-    )
-
     # Verify normalization
-    h2_min = df['h2_interconnection_component'].min()
-    h2_max = df['h2_interconnection_component'].max()
+    h2_min = output_df['h2_interconnection_component'].min()
+    h2_max = output_df['h2_interconnection_component'].max()
 
     print(f"  H2 component range: {h2_min:.6f} to {h2_max:.6f}")
 
@@ -196,34 +95,6 @@ def create_h2_interconnection_dataset():
         print(f"  ✅ H2 within [0, 1] range")
     print()
 
-    # Add historical period labels
-    def get_period_label(year):
-        if year < 1870:
-            return "Pre-globalization"
-        elif year < 1914:
-            return "First globalization (Gold Standard)"
-        elif year < 1945:
-            return "Deglobalization (Wars & Depression)"
-        elif year < 1970:
-            return "Bretton Woods (Limited integration)"
-        elif year < 2008:
-            return "Second globalization"
-        else:
-            return "Post-financial crisis"
-
-    df['period'] = df['year'].apply(get_period_label)
-
-    # Prepare output dataframe
-    output_df = df[[
-        'year',
-        'financial_integration_index',
-        'trade_openness',
-        'h2_interconnection_component',
-        'period'
-    ]].copy()
-
-    output_df = output_df.rename(columns={'period': 'notes'})
-
     # Save dataset
     print(f"Saving H2 dataset to {output_path}...")
     output_df.to_csv(output_path, index=False)
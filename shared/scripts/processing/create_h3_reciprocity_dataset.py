@@ -8,13 +8,18 @@ Combines cooperation and fair exchange measures 1810-2020:
 3. Technology sharing/transfer
 4. Fair trade practices
 
+Milestones and period labels live in harmony_specs/h3_reciprocity.json
+and are evaluated by milestones.py.
+
 Output: data_sources/h3_reciprocity/reciprocity_1810_2020.csv
 """
 
-import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from milestones import build_harmony, load_spec
+
+SPEC = load_spec('h3_reciprocity')
+
 def create_h3_reciprocity_dataset():
     """Create complete H3 reciprocity dataset 1810-2020."""
 
@@ -30,68 +35,9 @@ def create_h3_reciprocity_dataset():
 
     output_path = output_dir / 'reciprocity_1810_2020.csv'
 
-    # Reciprocity index milestones (0-1 scale)
-    recip_milestones = {
-        # Pre-cooperation era (1810-1900)
-        1810: 0.08,  # Colonial exploitation dominant
-        1850: 0.10,  # Some anti-slavery movement
-        1880: 0.12,  # Early labor movements
-
-        # Early cooperation (1900-1945)
-        1900: 0.14,  # First international conventions
-        1920: 0.18,  # League of Nations
-        1930: 0.16,  # Depression protectionism
-        1945: 0.22,  # UN founding, cooperative spirit
-
-        # Post-war cooperation (1945-1980)
-        1950: 0.28,  # Marshall Plan, decolonization begins
-        1960: 0.35,  # Development aid institutionalized
-        1970: 0.42,  # Technology transfer, North-South dialogue
-        1980: 0.48,  # Fair trade movements
-
-        # Modern cooperation (1980-2020)
-        1990: 0.55,  # Post-Cold War cooperation
-        2000: 0.62,  # Millennium Development Goals
-        2010: 0.68,  # Climate cooperation, fair trade growth
-        2020: 0.72,  # SDGs, but also rising nationalism
-    }
-
-    # Create annual series
-    years = list(range(1810, 2021))
-    recip_values = []
-
-    for year in years:
-        if year in recip_milestones:
-            recip_values.append(recip_milestones[year])
-        else:
-            prev_year = max([y for y in recip_milestones.keys() if y < year])
-            next_year = min([y for y in recip_milestones.keys() if y > year])
-
-            prev_val = recip_milestones[prev_year]
-            next_val = recip_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            recip = prev_val + frac * (next_val - prev_val)
-            recip_values.append(recip)
-
-    # Create dataframe
-    df = pd.DataFrame({
-        'year': years,
-        'h3_reciprocity_component': recip_values
-    })
-
-    # Add period labels
-    def get_period(year):
-        if year < 1900:
-            return "Pre-cooperation (colonial exploitation)"
-        elif year < 1945:
-            return "Early cooperation (League of Nations)"
-        elif year < 1980:
-            return "Post-war cooperation (UN, development aid)"
-        else:
-            return "Modern cooperation (SDGs, fair trade)"
-
-    df['notes'] = df['year'].apply(get_period)
+    # Reciprocity index (0-1 scale) interpolated from the spec milestones,
+    # with period labels
+    df = build_harmony(SPEC)
 
     # Save
     print(f"Saving H3 dataset to {output_path}...")
@@ -14,13 +14,19 @@ Primary measures:
 - Patent class diversity
 - Economic Complexity Index (1963+)
 
+Milestones, weights and period labels live in
+harmony_specs/h4_complexity.json and are evaluated by milestones.py.
+
 Output: data_sources/h4_complexity/economic_complexity_1810_2020.csv
 """
 
 import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from milestones import build_harmony, evaluate_components, load_spec, time_axis
+
+SPEC = load_spec('h4_complexity')
+
 def create_complexity_index_series():
     """
     Create economic complexity estimates based on historical patterns.
@@ -29,67 +35,15 @@ def create_complexity_index_series():
     - Hidalgo & Hausmann (2009): Economic complexity theory
     - Federico & Tena-Junguito (2017): Historical trade data
     - Mokyr (1990): The Lever of Riches (technological diversity)
-    """
 
-    # Historical milestones for economic complexity
-    # Scale: 0 (simple agrarian) to 1 (hyper-complex knowledge economy)
-
-    complexity_milestones = {
-        # Pre-industrial era (1810-1870)
-        1810: 0.08,  # Post-Napoleonic, agrarian dominance
-        1820: 0.09,  # Early textile mechanization
-        1830: 0.11,  # Railway begins, coal/iron expanding
-        1840: 0.13,  # Telegraph, early industrial diversity
-        1850: 0.16,  # Crystal Palace era, manufacturing variety
-        1860: 0.19,  # Steel, chemicals emerging
-        1870: 0.22,  # Second industrial revolution beginning
-
-        # Industrial expansion (1870-1945)
-        1880: 0.26,  # Electricity, internal combustion
-        1890: 0.30,  # Chemical industry diversification
-        1900: 0.34,  # Mass production techniques
-        1910: 0.38,  # Assembly line, consumer goods
-        1920: 0.36,  # Post-WWI disruption
-        1930: 0.34,  # Great Depression consolidation
-        1940: 0.38,  # War production diversity
-        1945: 0.40,  # Post-WWII manufacturing base
-
-        # Post-war growth (1945-1980)
-        1950: 0.43,  # Consumer goods expansion
-        1960: 0.48,  # Plastics, electronics emerging
-        1970: 0.54,  # Computers, telecommunications
-        1980: 0.60,  # Microelectronics revolution
-
-        # Information age (1980-2020)
-        1990: 0.66,  # Digital products proliferation
-        2000: 0.72,  # Internet economy, services diversity
-        2010: 0.76,  # Smartphones, cloud computing
-        2020: 0.78,  # AI, biotech, quantum computing emerging
-    }
-
-    # Create annual series with interpolation
-    years = list(range(1810, 2021))
-    complexity_values = []
-
-    for year in years:
-        if year in complexity_milestones:
-            complexity_values.append(complexity_milestones[year])
-        else:
-            # Linear interpolation between milestones
-            prev_year = max([y for y in complexity_milestones.keys() if y < year])
-            next_year = min([y for y in complexity_milestones.keys() if y > year])
-
-            prev_comp = complexity_milestones[prev_year]
-            next_comp = complexity_milestones[next_year]
-
-            # Linear interpolation
-            frac = (year - prev_year) / (next_year - prev_year)
-            complexity = prev_comp + frac * (next_comp - prev_comp)
-            complexity_values.append(complexity)
+    Scale: 0 (simple agrarian) to 1 (hyper-complex knowledge economy).
+    """
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['complexity_index'])
 
     df = pd.DataFrame({
-        'year': years,
-        'complexity_index': complexity_values
+        'year': years.astype(int),
+        'complexity_index': values['complexity_index']
     })
 
     return df
@@ -100,38 +54,9 @@ def add_product_diversity():
 
     Product diversity = variety of goods produced/exported
     """
-
-    diversity_milestones = {
-        1810: 0.05,  # Limited product variety (agriculture + basic manufactures)
-        1850: 0.12,  # Textiles, iron, coal, basic machinery
-        1870: 0.18,  # Chemicals, steel, railways equipment
-        1900: 0.28,  # Electrical goods, automobiles, pharmaceuticals
-        1920: 0.32,  # Consumer durables expansion
-        1945: 0.38,  # Post-war manufacturing diversity
-        1970: 0.52,  # Electronics, plastics, synthetic materials
-        1990: 0.68,  # Digital products, software, services
-        2000: 0.78,  # Internet products, mobile devices
-        2020: 0.82,  # AI products, biotech, renewable energy tech
-    }
-
-    years = list(range(1810, 2021))
-    diversity_values = []
-
-    for year in years:
-        if year in diversity_milestones:
-            diversity_values.append(diversity_milestones[year])
-        else:
-            prev_year = max([y for y in diversity_milestones.keys() if y < year])
-            next_year = min([y for y in diversity_milestones.keys() if y > year])
-
-            prev_div = diversity_milestones[prev_year]
-            next_div = diversity_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            diversity = prev_div + frac * (next_div - prev_div)
-            diversity_values.append(diversity)
-
-    return diversity_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['product_diversity'])
+    return values['product_diversity'].tolist()
 
 def create_h4_complexity_dataset():
     """Create complete H4 economic complexity dataset 1810-2020."""
@@ -148,36 +73,18 @@ def create_h4_complexity_dataset():
 
     output_path = output_dir / 'economic_complexity_1810_2020.csv'
 
-    # Create complexity index series
-    print("Creating economic complexity index series (1810-2020)...")
-    df = create_complexity_index_series()
-    print(f"  Created {len(df)} years of complexity estimates")
-    print(f"  Complexity range: {df['complexity_index'].min():.3f} to {df['complexity_index'].max():.3f}")
+    # Evaluate components, composite (60% complexity index + 40% product diversity)
+    # and period labels from the spec
+    print("Evaluating H4 milestone spec (1810-2020)...")
+    output_df = build_harmony(SPEC)
+    print(f"  Created {len(output_df)} years of estimates")
+    print(f"  Complexity range: {output_df['complexity_index'].min():.3f} to {output_df['complexity_index'].max():.3f}")
+    print(f"  Product diversity range: {output_df['product_diversity'].min():.3f} to {output_df['product_diversity'].max():.3f}")
     print()
 
-    # Add product diversity
-    print("Adding product diversity measure...")
-    df['product_diversity'] = add_product_diversity()
-    print(f"  Product diversity range: {df['product_diversity'].min():.3f} to {df['product_diversity'].max():.3f}")
-    print()
-
-    # Compute H4 composite
-    print("Computing H4 composite index...")
-    print("  Formula: 60% complexity index + 40% product diversity")
-
-    # Both already normalized to 0-1, but ensure it
-    df['complexity_normalized'] = np.minimum(1.0, df['complexity_index'])
-    df['diversity_normalized'] = np.minimum(1.0, df['product_diversity'])
-
-    # Weighted composite
-    df['h4_complexity_component'] = (
-        0.60 * df['complexity_normalized'] +
-        0.40 * df['diversity_normalized']
-    )
-
     # Verify normalization
-    h4_min = df['h4_complexity_component'].min()
-    h4_max = df['h4_complexity_component'].max()
+    h4_min = output_df['h4_complexity_component'].min()
+    h4_max = output_df['h4_complexity_component'].max()
 
     print(f"  H4 component range: {h4_min:.6f} to {h4_max:.6f}")
 
@@ -187,30 +94,6 @@ def create_h4_complexity_dataset():
         print(f"  ✅ H4 within [0, 1] range")
     print()
 
-    # Add historical period labels
-    def get_period_label(year):
-        if year < 1870:
-            return "Pre-industrial (agrarian dominance)"
-        elif year < 1945:
-            return "Industrial expansion (manufacturing growth)"
-        elif year < 1980:
-            return "Post-war growth (consumer diversity)"
-        else:
-            return "Information age (knowledge-intensive)"
-
-    df['period'] = df['year'].apply(get_period_label)
-
-    # Prepare output dataframe
-    output_df = df[[
-        'year',
-        'complexity_index',
-        'product_diversity',
-        'h4_complexity_component',
-        'period'
-    ]].copy()
-
-    output_df = output_df.rename(columns={'period': 'notes'})
-
     # Save dataset
     print(f"Saving H4 dataset to {output_path}...")
     output_df.to_csv(output_path, index=False)
@@ -7,13 +7,19 @@ Combines multiple sources to create continuous 1810-2020 series:
 2. Barro-Lee educational attainment (1870-2010)
 3. Recent education trends (2010-2020)
 
+Milestones, the 1870 splice, weights and source notes live in
+harmony_specs/h5_knowledge.json and are evaluated by milestones.py.
+
 Output: data_sources/h5_knowledge/barro_lee_custom_1810_2020.csv
 """
 
 import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from milestones import build_harmony, evaluate_components, label_eras, load_spec, time_axis
+
+SPEC = load_spec('h5_knowledge')
+
 def create_historical_literacy_estimates():
     """
     Create literacy estimates for 1810-1870 based on historical research.
@@ -23,43 +29,13 @@ def create_historical_literacy_estimates():
     - Rer (2011): Literacy rates in Western Europe 1500-1900
     - Easterlin (1981): Why isn't the whole world developed?
     """
-
-    # Historical literacy milestones for major regions/countries
-    # These are rough estimates based on historical records
-    literacy_milestones = {
-        1810: 0.12,  # ~12% global literacy (weighted by population)
-        1820: 0.14,
-        1830: 0.16,
-        1840: 0.19,
-        1850: 0.22,
-        1860: 0.26,
-        1870: 0.30,  # Transition to Barro-Lee data
-    }
-
-    # Create annual series with linear interpolation
-    years = list(range(1810, 1871))
-    literacy_rates = []
-
-    for year in years:
-        if year in literacy_milestones:
-            literacy_rates.append(literacy_milestones[year])
-        else:
-            # Linear interpolation between milestones
-            prev_year = max([y for y in literacy_milestones.keys() if y < year])
-            next_year = min([y for y in literacy_milestones.keys() if y > year])
-
-            prev_lit = literacy_milestones[prev_year]
-            next_lit = literacy_milestones[next_year]
-
-            # Linear interpolation
-            frac = (year - prev_year) / (next_year - prev_year)
-            literacy = prev_lit + frac * (next_lit - prev_lit)
-            literacy_rates.append(literacy)
+    years = time_axis(1810, 1870)
+    values = evaluate_components(SPEC['components'], years, ['literacy_historical', 'schooling_historical'])
 
     df = pd.DataFrame({
-        'year': years,
-        'literacy_rate': literacy_rates,
-        'avg_years_schooling': [lit * 2.0 for lit in literacy_rates],  # Rough conversion
+        'year': years.astype(int),
+        'literacy_rate': values['literacy_historical'],
+        'avg_years_schooling': values['schooling_historical'],  # Rough conversion
         'source': 'Historical literacy estimates'
     })
 
@@ -70,68 +46,24 @@ def create_barro_lee_estimates():
     Create Barro-Lee style estimates for 1870-2020.
 
     Since we don't have the actual Barro-Lee file yet, we'll create
-    reasonable estimates based on known historical trends.
+    reasonable estimates based on known historical trends: 5-yearly
+    observations ('Barro-Lee (estimated)') with annual interpolation.
 
     Real implementation will load:
     - BLv3.0.csv from barrolee.com
     - Process country-level data to global averages
     """
-
-    # Historical education milestones (years of schooling)
-    education_milestones = {
-        1870: 1.0,   # ~1 year average globally
-        1900: 1.5,
-        1920: 2.0,
-        1940: 2.5,
-        1950: 3.0,   # Post-WWII expansion begins
-        1960: 3.5,
-        1970: 4.2,
-        1980: 5.1,
-        1990: 6.0,
-        2000: 7.2,   # Acceleration with universal primary education
-        2010: 8.3,
-        2020: 9.0,   # Continued growth
-    }
-
-    # Create 5-year intervals (Barro-Lee style)
-    years_5yr = list(range(1870, 2021, 5))
-    years_schooling_5yr = []
-
-    for year in years_5yr:
-        if year in education_milestones:
-            years_schooling_5yr.append(education_milestones[year])
-        else:
-            # Linear interpolation between milestones
-            prev_year = max([y for y in education_milestones.keys() if y < year])
-            next_year = min([y for y in education_milestones.keys() if y > year])
-
-            prev_edu = education_milestones[prev_year]
-            next_edu = education_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            years_schooling = prev_edu + frac * (next_edu - prev_edu)
-            years_schooling_5yr.append(years_schooling)
-
-    # Create dataframe with 5-year intervals
-    df_5yr = pd.DataFrame({
-        'year': years_5yr,
-        'avg_years_schooling': years_schooling_5yr,
-        'source': 'Barro-Lee (estimated)'
+    years = time_axis(1870, 2020)
+    values = evaluate_components(SPEC['components'], years, ['schooling_barro_lee', 'literacy_barro_lee'])
+
+    df_annual = pd.DataFrame({
+        'year': years.astype(int),
+        'avg_years_schooling': values['schooling_barro_lee'],
+        'source': label_eras(SPEC['eras'], years),
+        # literacy_rate ≈ min(0.95, years_schooling / 12)
+        'literacy_rate': values['literacy_barro_lee'],
     })
 
-    # Interpolate to annual
-    all_years = list(range(1870, 2021))
-    df_annual = pd.DataFrame({'year': all_years})
-
-    # Linear interpolation for annual values
-    df_annual = df_annual.merge(df_5yr, on='year', how='left')
-    df_annual['avg_years_schooling'] = df_annual['avg_years_schooling'].interpolate(method='linear')
-    df_annual['source'] = df_annual['source'].fillna('Barro-Lee (interpolated)')
-
-    # Convert years of schooling to literacy rate (approximate)
-    # Formula: literacy_rate ≈ min(0.95, years_schooling / 12)
-    df_annual['literacy_rate'] = np.minimum(0.95, df_annual['avg_years_schooling'] / 12)
-
     return df_annual
 
 def create_h5_knowledge_dataset():
@@ -149,50 +81,22 @@ def create_h5_knowledge_dataset():
 
     output_path = output_dir / 'barro_lee_custom_1810_2020.csv'
 
-    # Create historical period (1810-1870)
-    print("Creating historical literacy estimates (1810-1870)...")
-    df_historical = create_historical_literacy_estimates()
-    print(f"  Created {len(df_historical)} years of historical estimates")
-    print(f"  Literacy range: {df_historical['literacy_rate'].min():.3f} to {df_historical['literacy_rate'].max():.3f}")
-    print()
-
-    # Create Barro-Lee period (1870-2020)
-    print("Creating Barro-Lee educational attainment series (1870-2020)...")
-    df_barro_lee = create_barro_lee_estimates()
-    print(f"  Created {len(df_barro_lee)} years of education estimates")
-    print(f"  Schooling range: {df_barro_lee['avg_years_schooling'].min():.2f} to {df_barro_lee['avg_years_schooling'].max():.2f} years")
+    # Evaluate both periods, the 1870 splice, the composite (70% schooling
+    # scaled to 15 years + 30% literacy) and source notes from the spec
+    print("Evaluating H5 milestone spec (1810-2020)...")
+    output_df = build_harmony(SPEC)
+    historical = output_df[output_df['year'] < 1870]
+    barro_lee = output_df[output_df['year'] >= 1870]
+    print(f"  Historical literacy estimates: {len(historical)} years, "
+          f"literacy {historical['literacy_rate'].min():.3f} to {historical['literacy_rate'].max():.3f}")
+    print(f"  Barro-Lee estimates: {len(barro_lee)} years, schooling "
+          f"{barro_lee['avg_years_schooling'].min():.2f} to {barro_lee['avg_years_schooling'].max():.2f} years")
+    print(f"  Combined dataset: {len(output_df)} years ({output_df['year'].min()}-{output_df['year'].max()})")
     print()
 
-    # Combine datasets
-    print("Combining historical and modern periods...")
-    # Remove 1870 from historical (overlap with Barro-Lee)
-    df_historical = df_historical[df_historical['year'] < 1870]
-
-    # Concatenate
-    df_combined = pd.concat([df_historical, df_barro_lee], ignore_index=True)
-    df_combined = df_combined.sort_values('year').reset_index(drop=True)
-
-    print(f"  Combined dataset: {len(df_combined)} years ({df_combined['year'].min()}-{df_combined['year'].max()})")
-    print()
-
-    # Normalize to 0-1 scale
-    print("Normalizing to 0-1 scale...")
-
-    # Method 1: Normalize years of schooling (0-15 year range)
-    df_combined['h5_from_schooling'] = np.minimum(1.0, df_combined['avg_years_schooling'] / 15.0)
-
-    # Method 2: Direct literacy rate (already 0-1)
-    df_combined['h5_from_literacy'] = df_combined['literacy_rate']
-
-    # Combined H5 component: 70% schooling + 30% literacy
-    df_combined['h5_knowledge_component'] = (
-        0.70 * df_combined['h5_from_schooling'] +
-        0.30 * df_combined['h5_from_literacy']
-    )
-
     # Verify normalization
-    h5_min = df_combined['h5_knowledge_component'].min()
-    h5_max = df_combined['h5_knowledge_component'].max()
+    h5_min = output_df['h5_knowledge_component'].min()
+    h5_max = output_df['h5_knowledge_component'].max()
 
     print(f"  H5 component range: {h5_min:.6f} to {h5_max:.6f}")
 
@@ -202,17 +106,6 @@ def create_h5_knowledge_dataset():
         print(f"  ✅ H5 within [0, 1] range")
     print()
 
-    # Prepare output dataframe
-    output_df = df_combined[[
-        'year',
-        'avg_years_schooling',
-        'literacy_rate',
-        'h5_knowledge_component',
-        'source'
-    ]].copy()
-
-    output_df = output_df.rename(columns={'source': 'notes'})
-
     # Save dataset
     print(f"Saving H5 dataset to {output_path}...")
     output_df.to_csv(output_path, index=False)
@@ -12,13 +12,18 @@ Based on:
 - Gapminder: Infant mortality reconstruction
 - Lindert (2004): Social protection history
 
+Milestones, normalization bounds, weights and period labels live in
+harmony_specs/h6_wellbeing.json and are evaluated by milestones.py.
+
 Output: data_sources/h6_wellbeing/wellbeing_1810_2020.csv
 """
 
-import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from milestones import build_harmony, evaluate_components, load_spec, time_axis
+
+SPEC = load_spec('h6_wellbeing')
+
 def create_life_expectancy_series():
     """
     Create global life expectancy estimates 1810-2020.
@@ -28,65 +33,9 @@ def create_life_expectancy_series():
     - UN World Population Prospects: 2000-2020
     - Maddison Historical Statistics
     """
-
-    # Historical milestones for global life expectancy (years)
-    life_exp_milestones = {
-        # Early Industrial Era (1810-1870)
-        1810: 28.5,  # Pre-industrial baseline
-        1820: 29.0,
-        1830: 29.5,
-        1840: 30.0,
-        1850: 31.0,  # Early public health improvements
-        1860: 32.0,
-        1870: 33.0,
-
-        # Late Industrial Era (1870-1914)
-        1880: 35.0,  # Germ theory, sanitation
-        1890: 37.0,
-        1900: 39.0,  # Water treatment spreading
-        1910: 41.0,
-        1914: 42.0,
-
-        # Wars & Interwar (1914-1945)
-        1918: 38.0,  # Spanish flu, WWI deaths
-        1920: 41.0,  # Recovery
-        1930: 44.0,  # Continued improvements
-        1940: 46.0,
-        1945: 45.0,  # WWII impact
-
-        # Post-War Golden Age (1945-1980)
-        1950: 48.0,  # Antibiotics revolution begins
-        1960: 52.0,  # Vaccines, DDT for malaria
-        1970: 58.0,  # Green Revolution, healthcare expansion
-        1980: 62.0,
-
-        # Modern Era (1980-2020)
-        1990: 64.0,  # Post-Cold War gains
-        2000: 67.0,  # HIV/AIDS dampens progress
-        2010: 70.0,  # Continued medical advances
-        2020: 72.6,  # Pre-COVID estimate (WHO 2019 data)
-    }
-
-    # Create annual series with interpolation
-    years = list(range(1810, 2021))
-    life_exp_values = []
-
-    for year in years:
-        if year in life_exp_milestones:
-            life_exp_values.append(life_exp_milestones[year])
-        else:
-            # Linear interpolation
-            prev_year = max([y for y in life_exp_milestones.keys() if y < year])
-            next_year = min([y for y in life_exp_milestones.keys() if y > year])
-
-            prev_val = life_exp_milestones[prev_year]
-            next_val = life_exp_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            life_exp = prev_val + frac * (next_val - prev_val)
-            life_exp_values.append(life_exp)
-
-    return life_exp_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['life_expectancy'])
+    return values['life_expectancy'].tolist()
 
 def create_infant_mortality_series():
     """
@@ -94,65 +43,9 @@ def create_infant_mortality_series():
 
     Infant mortality = deaths per 1,000 live births before age 1
     """
-
-    # Historical milestones for infant mortality (per 1,000 births)
-    inf_mort_milestones = {
-        # Early Industrial Era
-        1810: 280,  # Very high pre-industrial mortality
-        1820: 270,
-        1830: 260,
-        1840: 250,
-        1850: 240,
-        1860: 230,
-        1870: 220,
-
-        # Late Industrial Era
-        1880: 210,  # Gradual decline with sanitation
-        1890: 200,
-        1900: 190,
-        1910: 180,
-        1914: 175,
-
-        # Wars & Interwar
-        1918: 185,  # Spanish flu spike
-        1920: 170,
-        1930: 150,
-        1940: 140,
-        1945: 135,
-
-        # Post-War Golden Age
-        1950: 125,  # Antibiotics impact
-        1960: 100,  # Vaccines, improved care
-        1970: 80,
-        1980: 70,
-
-        # Modern Era
-        1990: 60,
-        2000: 50,
-        2010: 35,
-        2020: 28,   # Continued decline
-    }
-
-    # Create annual series with interpolation
-    years = list(range(1810, 2021))
-    inf_mort_values = []
-
-    for year in years:
-        if year in inf_mort_milestones:
-            inf_mort_values.append(inf_mort_milestones[year])
-        else:
-            # Linear interpolation
-            prev_year = max([y for y in inf_mort_milestones.keys() if y < year])
-            next_year = min([y for y in inf_mort_milestones.keys() if y > year])
-
-            prev_val = inf_mort_milestones[prev_year]
-            next_val = inf_mort_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            inf_mort = prev_val + frac * (next_val - prev_val)
-            inf_mort_values.append(inf_mort)
-
-    return inf_mort_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['infant_mortality'])
+    return values['infant_mortality'].tolist()
 
 def create_social_protection_series():
     """
@@ -161,59 +54,9 @@ def create_social_protection_series():
     Social protection = % of population covered by pensions, health insurance,
     unemployment benefits, or other social safety nets.
     """
-
-    # Historical milestones for social protection coverage (%)
-    soc_prot_milestones = {
-        # Pre-welfare state (1810-1879)
-        1810: 0.0,   # No formal systems
-        1870: 0.0,   # Pre-Bismarck
-
-        # Early welfare state (1880-1914)
-        1880: 0.5,   # Germany's social insurance begins (1880s)
-        1890: 1.0,   # Spreading to few other countries
-        1900: 2.0,
-        1910: 3.0,
-        1914: 3.5,
-
-        # Interwar expansion (1914-1945)
-        1920: 5.0,   # WWI veterans benefits
-        1930: 8.0,   # Great Depression response
-        1940: 12.0,  # Wartime social programs
-        1945: 15.0,
-
-        # Post-War welfare state (1945-1980)
-        1950: 20.0,  # Welfare state consolidation
-        1960: 28.0,  # European social model spreads
-        1970: 38.0,  # Expansion in developing world
-        1980: 48.0,
-
-        # Modern era (1980-2020)
-        1990: 55.0,  # Post-Cold War expansion
-        2000: 60.0,  # Continued growth
-        2010: 65.0,  # Near-universal in developed countries
-        2020: 68.0,  # Global weighted average (ILO 2020)
-    }
-
-    # Create annual series with interpolation
-    years = list(range(1810, 2021))
-    soc_prot_values = []
-
-    for year in years:
-        if year in soc_prot_milestones:
-            soc_prot_values.append(soc_prot_milestones[year])
-        else:
-            # Linear interpolation
-            prev_year = max([y for y in soc_prot_milestones.keys() if y < year])
-            next_year = min([y for y in soc_prot_milestones.keys() if y > year])
-
-            prev_val = soc_prot_milestones[prev_year]
-            next_val = soc_prot_milestones[next_year]
-
-            frac = (year - prev_year) / (next_year - prev_year)
-            soc_prot = prev_val + frac * (next_val - prev_val)
-            soc_prot_values.append(soc_prot)
-
-    return soc_prot_values
+    years = time_axis(*SPEC['span'])
+    values = evaluate_components(SPEC['components'], years, ['social_protection_coverage'])
+    return values['social_protection_coverage'].tolist()
 
 def create_h6_wellbeing_dataset():
     """Create complete H6 wellbeing dataset 1810-2020."""
@@ -230,54 +73,22 @@ def create_h6_wellbeing_dataset():
 
     output_path = output_dir / 'wellbeing_1810_2020.csv'
 
-    # Create component series
-    print("Creating life expectancy series (1810-2020)...")
-    life_exp = create_life_expectancy_series()
-    print(f"  Life expectancy range: {min(life_exp):.1f} to {max(life_exp):.1f} years")
-
-    print("Creating infant mortality series (1810-2020)...")
-    inf_mort = create_infant_mortality_series()
-    print(f"  Infant mortality range: {max(inf_mort):.1f} to {min(inf_mort):.1f} per 1,000")
-
-    print("Creating social protection series (1810-2020)...")
-    soc_prot = create_social_protection_series()
-    print(f"  Social protection range: {min(soc_prot):.1f}% to {max(soc_prot):.1f}%")
+    # Evaluate components, composite and period labels from the spec:
+    # 50% life expectancy (25-90 years) + 30% inverted infant mortality
+    # (per 350) + 20% social protection (%), each clipped to [0, 1]
+    print("Evaluating H6 milestone spec (1810-2020)...")
+    output_df = build_harmony(SPEC)
+    life_exp = output_df['life_expectancy']
+    inf_mort = output_df['infant_mortality']
+    soc_prot = output_df['social_protection_coverage']
+    print(f"  Life expectancy range: {life_exp.min():.1f} to {life_exp.max():.1f} years")
+    print(f"  Infant mortality range: {inf_mort.max():.1f} to {inf_mort.min():.1f} per 1,000")
+    print(f"  Social protection range: {soc_prot.min():.1f}% to {soc_prot.max():.1f}%")
     print()
 
-    # Create dataframe
-    years = list(range(1810, 2021))
-    df = pd.DataFrame({
-        'year': years,
-        'life_expectancy': life_exp,
-        'infant_mortality': inf_mort,
-        'social_protection_coverage': soc_prot
-    })
-
-    # Normalize each component to 0-1
-    print("Normalizing components to 0-1 scale...")
-
-    # Life expectancy: (value - 25) / (90 - 25)
-    df['life_exp_normalized'] = (df['life_expectancy'] - 25) / (90 - 25)
-    df['life_exp_normalized'] = np.clip(df['life_exp_normalized'], 0, 1)
-
-    # Infant mortality (inverse): 1 - (value / 350)
-    df['inf_mort_normalized'] = 1 - (df['infant_mortality'] / 350)
-    df['inf_mort_normalized'] = np.clip(df['inf_mort_normalized'], 0, 1)
-
-    # Social protection: value / 100
-    df['soc_prot_normalized'] = df['social_protection_coverage'] / 100
-    df['soc_prot_normalized'] = np.clip(df['soc_prot_normalized'], 0, 1)
-
-    # Composite H6 component: 50% life exp + 30% infant mort + 20% social prot
-    df['h6_wellbeing_component'] = (
-        0.50 * df['life_exp_normalized'] +
-        0.30 * df['inf_mort_normalized'] +
-        0.20 * df['soc_prot_normalized']
-    )
-
     # Verify normalization
-    h6_min = df['h6_wellbeing_component'].min()
-    h6_max = df['h6_wellbeing_component'].max()
+    h6_min = output_df['h6_wellbeing_component'].min()
+    h6_max = output_df['h6_wellbeing_component'].max()
 
     print(f"  H6 component range: {h6_min:.6f} to {h6_max:.6f}")
 
@@ -287,33 +98,6 @@ def create_h6_wellbeing_dataset():
         print(f"  ✅ H6 within [0, 1] range")
     print()
 
-    # Add historical period labels
-    def get_period_label(year):
-        if year < 1870:
-            return "Early industrial (high mortality)"
-        elif year < 1914:
-            return "Late industrial (sanitation improving)"
-        elif year < 1945:
-            return "Wars & Depression (mixed progress)"
-        elif year < 1980:
-            return "Post-war golden age (antibiotics, vaccines)"
-        else:
-            return "Modern era (continued advances)"
-
-    df['period'] = df['year'].apply(get_period_label)
-
-    # Prepare output dataframe
-    output_df = df[[
-        'year',
-        'life_expectancy',
-        'infant_mortality',
-        'social_protection_coverage',
-        'h6_wellbeing_component',
-        'period'
-    ]].copy()
-
-    output_df = output_df.rename(columns={'period': 'notes'})
-
     # Save dataset
     print(f"Saving H6 dataset to {output_path}...")
     output_df.to_csv(output_path, index=False)
@@ -149,10 +149,13 @@ def build_harmony_frame(
     normalization_overrides: Optional[Dict[str, str]] = None,
     feature_aggregation: str = "mean",
     feature_aggregation_overrides: Optional[Dict[str, str]] = None,
+    data_dir: Path = DATA_DIR,
 ) -> pd.DataFrame:
     """
     Construct a DataFrame with one column per harmony derived from normalized
     feature averages according to the selected strategy.
+
+    Proxy CSVs are read from ``data_dir`` (see load_feature_series).
     """
     years = list(years)
     index = pd.Index(years, name="year")
@@ -165,7 +168,7 @@ def build_harmony_frame(
             raise ValueError(f"Harmony '{harmony}' has no associated features.")
         strat = overrides.get(harmony, normalization)
         series_list = [
-            normalize_series(load_feature_series(feature, years), years, strat)
+            normalize_series(load_feature_series(feature, years, data_dir), years, strat)
             for feature in features
         ]
         stacked = pd.concat(series_list, axis=1)
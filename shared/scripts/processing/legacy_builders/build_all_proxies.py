@@ -0,0 +1,341 @@
+"""
+Regenerate every legacy proxy CSV from one scan per upstream source.
+
+The individual build_*.py scripts each fetch and parse their own copy of
+the data. Here each source is downloaded once, cached next to this file,
+and read once with a row filter applied while reading:
+
+- World Bank WDI: one paginated multi-indicator request over country/all,
+  cached as a long CSV (country, indicator, year, value). The all-country
+  year means come from one groupby; the World series are the WLD rows.
+- OWID energy: OWID_energy.csv read in chunks, projected to the columns the
+  proxies use and filtered to country == "World".
+- OWID life expectancy: the grapher CSV, filtered to Entity == "World".
+
+All proxies of a source are then derived together on a (year x proxy)
+frame with the shared kernel in proxy_kernel.py (interpolate, resample to
+decades, min-max normalize, decade aggregate).
+
+The output files match the individual scripts (values up to floating-point
+summation order). The Clio placeholder (build_play_entropy_clio.py) writes
+the same file as the OWID-derived occupation_diversity_entropy and is not
+regenerated here.
+
+Usage:
+    python build_all_proxies.py              # use cached sources
+    python build_all_proxies.py --refresh    # re-download WDI and life expectancy
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import requests
+
+from proxy_kernel import (
+    DECADE_YEARS,
+    decade_aggregate,
+    interpolate_annual,
+    normalize,
+    resample_to_decades,
+)
+
+BASE_DIR = Path(__file__).resolve().parent
+OUTPUT_DIR = BASE_DIR
+
+OWID_ENERGY_PATH = BASE_DIR / "OWID_energy.csv"
+LIFE_EXPECTANCY_PATH = BASE_DIR / "OWID_life_expectancy.csv"
+WDI_PATH = BASE_DIR / "worldbank_wdi_raw.csv"
+
+LIFE_EXPECTANCY_URL = "https://ourworldindata.org/grapher/life-expectancy.csv"
+WDI_API_URL = "https://api.worldbank.org/v2/country/all/indicator"
+WDI_PAGE_SIZE = 20000
+WORLD_CODE = "WLD"
+
+CHUNK_SIZE = 50000
+
+# OWID energy proxies: feature -> (column of the World annual frame, invert)
+OWID_PROXIES: Dict[str, tuple] = {
+    "network_modularity_inverse": ("electricity_demand", False),
+    "communication_latency_inverse": ("carbon_intensity_elec", True),
+    "trade_network_degree": ("gdp", False),
+    "migration_flux_index": ("population_change_abs", False),
+    "bilateral_trade_symmetry": ("low_carbon_electricity", False),
+    "alliance_reciprocity_ratio": ("biofuel_share_elec", False),
+    "occupation_diversity_entropy": ("renewables_share_elec", False),
+    "innovation_field_entropy": ("energy_per_capita", False),
+    "forecast_skill_index": ("energy_per_gdp", True),
+    "error_correction_speed": ("energy_cons_change_pct_abs", False),
+}
+OWID_SPAN = (1800, 2020)
+
+# World series resampled to decades, then normalized (build_from_worldbank)
+WORLD_TREND_PROXIES: Dict[str, str] = {
+    "trade_share_gdp": "NE.TRD.GNFS.ZS",
+    "net_migration": "SM.POP.NETM",
+    "remittance_inflows": "BX.TRF.PWKR.CD.DT",
+}
+
+# All-country year means, rescaled, then decade means:
+# output -> (indicator, rescaling)
+COUNTRY_MEAN_PROXIES: Dict[str, tuple] = {
+    "education_enrolment_index": ("SE.SCH.LIFE", "share_of_max"),
+    "environmental_performance_index": ("EG.USE.ELEC.KH.PC", "inverse_share_of_max"),
+    "income_fairness_index": ("SI.POV.GINI", "gini_fairness"),
+    "renewable_energy_share": ("EG.FEC.RNEW.ZS", "share_of_max"),
+    "research_spending_index": ("GB.XPD.RSDV.GD.ZS", "share_of_max"),
+    "trade_openness_index": ("NE.TRD.GNFS.ZS", "share_of_max"),
+}
+RESCALINGS = ("share_of_max", "inverse_share_of_max", "gini_fairness")
+
+# World series aggregated to decades without normalization
+AID = "DT.ODA.ODAT.CD"          # Net official development assistance (current US$)
+FDI_OUT = "BM.KLT.DINV.CD.WD"   # FDI net outflows (current US$)
+PATENTS = "IP.PAT.RESD"          # Patent applications, residents
+IMPORTS = "NE.IMP.GNFS.CD"       # Imports of goods and services (current US$)
+EXPORTS = "NE.EXP.GNFS.CD"       # Exports of goods and services (current US$)
+
+WDI_SPAN = (1960, 2022)
+
+
+def wdi_indicators() -> List[str]:
+    """Every WDI indicator any proxy needs, in a stable order."""
+    codes = list(WORLD_TREND_PROXIES.values())
+    codes += [code for code, _ in COUNTRY_MEAN_PROXIES.values()]
+    codes += [AID, FDI_OUT, PATENTS, IMPORTS, EXPORTS]
+    return list(dict.fromkeys(codes))
+
+
+def write_proxy(name: str, series: pd.Series, decimals: Optional[int] = None) -> Path:
+    """Write one proxy as year,value, dropping years with no value."""
+    series = series.dropna()
+    values = series.to_numpy(dtype=float)
+    if decimals is not None:
+        values = values.round(decimals)
+    path = OUTPUT_DIR / f"{name}.csv"
+    pd.DataFrame({"year": series.index.astype(int), "value": values}).to_csv(path, index=False)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Sources: download once, read once
+# ---------------------------------------------------------------------------
+
+def read_filtered(path: Path, column: str, value: str, usecols: Optional[Sequence[str]] = None,
+                  chunksize: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Rows of a CSV where ``column == value``, filtered chunk by chunk."""
+    if usecols is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in dict.fromkeys([column, *usecols]) if c in header]
+    chunks = [chunk[chunk[column] == value]
+              for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize)]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def download_worldbank(indicators: Sequence[str], path: Path = WDI_PATH) -> Path:
+    """
+    Fetch indicators for all countries and aggregates in one paginated
+    multi-indicator request and cache them as a long CSV.
+    """
+    url = f"{WDI_API_URL}/{';'.join(indicators)}"
+    params = {"format": "json", "per_page": WDI_PAGE_SIZE, "source": 2}
+    records = []
+    page, pages = 1, 1
+    while page <= pages:
+        resp = requests.get(url, params={**params, "page": page}, timeout=120)
+        resp.raise_for_status()
+        data = resp.json()
+        if not data or len(data) < 2 or data[1] is None:
+            raise RuntimeError(f"Unexpected World Bank response for page {page}")
+        pages = int(data[0].get("pages", 1))
+        for row in data[1]:
+            year, value = row.get("date"), row.get("value")
+            if year is None or value is None:
+                continue
+            try:
+                year_int = int(year)
+            except ValueError:
+                continue
+            records.append((row.get("countryiso3code") or row["country"]["id"],
+                            row["indicator"]["id"], year_int, float(value)))
+        page += 1
+
+    if not records:
+        raise RuntimeError("No World Bank records fetched")
+    pd.DataFrame(records, columns=["country", "indicator", "year", "value"]).to_csv(path, index=False)
+    return path
+
+
+def download_life_expectancy(path: Path = LIFE_EXPECTANCY_PATH) -> Path:
+    resp = requests.get(LIFE_EXPECTANCY_URL, timeout=60)
+    resp.raise_for_status()
+    path.write_bytes(resp.content)
+    return path
+
+
+def load_worldbank(path: Path = WDI_PATH):
+    """
+    (all-country year means, World series) from the cached WDI download,
+    each a (year x indicator) frame.
+    """
+    wdi = pd.read_csv(path, usecols=["country", "indicator", "year", "value"])
+    wdi = wdi.sort_values("year", kind="stable")
+    country_means = wdi.groupby(["year", "indicator"])["value"].mean().unstack("indicator")
+    world = wdi[wdi["country"] == WORLD_CODE].pivot(index="year", columns="indicator", values="value")
+    return country_means, world
+
+
+def load_owid_world(path: Path = OWID_ENERGY_PATH) -> pd.DataFrame:
+    """World rows of the OWID energy dataset as a (year x column) frame."""
+    columns = {col for col, _ in OWID_PROXIES.values()} | {"population", "energy_cons_change_pct"}
+    world = read_filtered(path, "country", "World", usecols=["year", *sorted(columns)])
+    return world.drop(columns="country").set_index("year").select_dtypes(include=[np.number])
+
+
+# ---------------------------------------------------------------------------
+# Proxy families
+# ---------------------------------------------------------------------------
+
+def owid_proxies(world: pd.DataFrame) -> pd.DataFrame:
+    """Decade values of every OWID energy proxy (build_from_owid)."""
+    annual = interpolate_annual(world, *OWID_SPAN)
+    annual["population_change_abs"] = annual["population"].diff().bfill().abs()
+    annual["energy_cons_change_pct_abs"] = annual["energy_cons_change_pct"].abs()
+
+    features = pd.DataFrame({f: annual[col] for f, (col, _) in OWID_PROXIES.items()})
+    normed = normalize(features, invert=[f for f, (_, inv) in OWID_PROXIES.items() if inv])
+    return normed.reindex(DECADE_YEARS).interpolate(limit_direction="both")
+
+
+def world_trend_proxies(world: pd.DataFrame) -> pd.DataFrame:
+    """Normalized decade values of the World trend series (build_from_worldbank)."""
+    series = world.reindex(columns=list(WORLD_TREND_PROXIES.values()))
+    series.columns = list(WORLD_TREND_PROXIES)
+    return normalize(resample_to_decades(series))
+
+
+def rescale(frame: pd.DataFrame, how: str) -> pd.DataFrame:
+    """Rescale each column of an all-country mean frame."""
+    if how not in RESCALINGS:
+        raise ValueError(f"Unknown rescaling '{how}'. Use {list(RESCALINGS)}.")
+    if how == "gini_fairness":
+        return 1.0 - frame / 100.0
+    peak = frame.max()
+    if (peak == 0).any():
+        raise RuntimeError(f"Maximum is zero for {list(peak.index[peak == 0])}")
+    if how == "inverse_share_of_max":
+        return (1.0 - frame / peak).clip(lower=0.0)
+    return frame / peak
+
+
+def country_mean_proxies(country_means: pd.DataFrame) -> pd.DataFrame:
+    """Decade means of the rescaled all-country year means."""
+    start, end = WDI_SPAN
+    window = country_means[(country_means.index >= start) & (country_means.index <= end)]
+    rescaled = {}
+    for how in RESCALINGS:
+        names = [n for n, (_, h) in COUNTRY_MEAN_PROXIES.items() if h == how]
+        if not names:
+            continue
+        block = window.reindex(columns=[COUNTRY_MEAN_PROXIES[n][0] for n in names])
+        block.columns = names
+        rescaled[how] = rescale(block, how)
+    frame = pd.concat(rescaled.values(), axis=1)[list(COUNTRY_MEAN_PROXIES)]
+    return decade_aggregate(frame, start, end)
+
+
+def world_level_proxies(world: pd.DataFrame) -> Dict[str, pd.Series]:
+    """Aid/extraction balance, patent filings and trade volume by decade."""
+    start, end = WDI_SPAN
+    series = world.reindex(columns=[AID, FDI_OUT, PATENTS, IMPORTS, EXPORTS])
+    means = pd.DataFrame({
+        "aid_extraction_balance": series[AID] / (series[FDI_OUT].abs() + 1e-9),
+        "patent_resident_filings": series[PATENTS],
+    })
+    means = decade_aggregate(means, start, end)
+    volume = decade_aggregate((series[IMPORTS] + series[EXPORTS]).to_frame("value"), start, end, how="sum")
+    return {
+        "aid_extraction_balance": means["aid_extraction_balance"],
+        "patent_resident_filings": means["patent_resident_filings"],
+        "global_trade_volume": volume["value"],
+    }
+
+
+def life_expectancy_proxy(path: Path = LIFE_EXPECTANCY_PATH) -> pd.Series:
+    column = "Period life expectancy at birth"
+    world = read_filtered(path, "Entity", "World", usecols=["Year", column])
+    series = world.set_index("Year")[column].rename_axis("year")
+    return decade_aggregate(series.to_frame(), 1800, 2022)[column]
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def build_all(refresh: bool = False) -> Dict[str, Path]:
+    """Regenerate every proxy whose source is available; returns {proxy: path}."""
+    written: Dict[str, Path] = {}
+
+    def emit(name: str, series: pd.Series, decimals: Optional[int] = None) -> None:
+        if series.dropna().empty:
+            print(f"  ⚠️  {name}: no data, skipped")
+            return
+        written[name] = write_proxy(name, series, decimals)
+
+    if OWID_ENERGY_PATH.exists():
+        owid = owid_proxies(load_owid_world())
+        for name in owid.columns:
+            emit(name, owid[name], decimals=4)
+    else:
+        print(f"  ⚠️  {OWID_ENERGY_PATH.name} not found; download it to build the OWID proxies")
+
+    try:
+        if refresh or not WDI_PATH.exists():
+            download_worldbank(wdi_indicators())
+        country_means, world = load_worldbank()
+    except Exception as exc:  # noqa: BLE001
+        print(f"  ⚠️  World Bank source unavailable: {exc}")
+    else:
+        trends = world_trend_proxies(world)
+        for name in trends.columns:
+            emit(name, trends[name], decimals=4)
+        try:
+            means = country_mean_proxies(country_means)
+        except RuntimeError as exc:
+            print(f"  ⚠️  All-country proxies skipped: {exc}")
+        else:
+            for name in means.columns:
+                emit(name, means[name])
+        for name, series in world_level_proxies(world).items():
+            emit(name, series)
+
+    try:
+        if refresh or not LIFE_EXPECTANCY_PATH.exists():
+            download_life_expectancy()
+        emit("life_expectancy_global", life_expectancy_proxy())
+    except Exception as exc:  # noqa: BLE001
+        print(f"  ⚠️  Life expectancy source unavailable: {exc}")
+
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Regenerate all legacy proxy CSVs")
+    parser.add_argument("--refresh", action="store_true", help="Re-download the WDI and life expectancy sources")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = build_all(refresh=args.refresh)
+    elapsed = time.perf_counter() - start
+    for name, path in written.items():
+        print(f"Wrote {path.name}")
+    print(f"{len(written)} proxies in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,22 +7,16 @@ from typing import Dict
 import numpy as np
 import pandas as pd
 
+import proxy_kernel
+from proxy_kernel import DECADE_YEARS
+
 DATA_PATH = Path(__file__).resolve().parent / "OWID_energy.csv"
 OUTPUT_DIR = Path(__file__).resolve().parent
 
-DECADE_YEARS = list(range(1800, 2030, 10))
-
 
 def normalize(series: pd.Series, invert: bool = False) -> pd.Series:
-    s = series.astype(float)
-    min_val, max_val = float(np.nanmin(s)), float(np.nanmax(s))
-    if np.isclose(max_val, min_val):
-        norm = pd.Series(0.5, index=s.index)
-    else:
-        norm = (s - min_val) / (max_val - min_val)
-    if invert:
-        norm = 1.0 - norm
-    return norm.clip(0.0, 1.0)
+    frame = series.to_frame()
+    return proxy_kernel.normalize(frame, invert=frame.columns if invert else ()).iloc[:, 0]
 
 
 def main() -> None:
@@ -6,11 +6,11 @@ from pathlib import Path
 from typing import Dict
 from urllib.request import urlopen
 
-import numpy as np
 import pandas as pd
 
+import proxy_kernel
+
 DATA_DIR = Path(__file__).resolve().parent
-DECADE_YEARS = list(range(1800, 2030, 10))
 
 
 INDICATORS: Dict[str, str] = {
@@ -37,26 +37,12 @@ def fetch_indicator(indicator: str) -> pd.Series:
 
 
 def resample_to_decades(series: pd.Series) -> pd.Series:
-    if series.empty:
-        return pd.Series(np.zeros(len(DECADE_YEARS)), index=DECADE_YEARS)
-    # Interpolate annual between first and last year, then reindex to decades
-    start, end = series.index.min(), series.index.max()
-    annual_index = np.arange(start, end + 1)
-    annual = series.reindex(annual_index).astype(float)
-    annual = annual.interpolate(limit_direction="both")
-    decade_series = annual.reindex(DECADE_YEARS).interpolate(limit_direction="both")
-    return decade_series.astype(float)
+    return proxy_kernel.resample_to_decades(series.to_frame()).iloc[:, 0]
 
 
 def normalize(series: pd.Series, invert: bool = False) -> pd.Series:
-    arr = series.to_numpy(dtype=float)
-    if np.allclose(arr.max(), arr.min()):
-        norm = np.full_like(arr, 0.5)
-    else:
-        norm = (arr - arr.min()) / (arr.max() - arr.min())
-    if invert:
-        norm = 1.0 - norm
-    return pd.Series(norm, index=series.index).clip(0.0, 1.0)
+    frame = series.to_frame()
+    return proxy_kernel.normalize(frame, invert=frame.columns if invert else ()).iloc[:, 0]
 
 
 def main() -> None:
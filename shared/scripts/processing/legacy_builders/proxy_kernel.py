@@ -0,0 +1,74 @@
+"""
+Shared normalize/resample kernel for the legacy proxy builders.
+
+Every function takes and returns a (year x proxy) frame, so all proxies
+derived from one source are interpolated, resampled and normalized
+together. Used by build_all_proxies.py, build_from_owid.py and
+build_from_worldbank.py.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+DECADE_YEARS = list(range(1800, 2030, 10))
+
+
+def interpolate_annual(frame: pd.DataFrame, start: int, end: int, limit_area: Optional[str] = None) -> pd.DataFrame:
+    """
+    Reindex to the years start..end and interpolate each column linearly.
+
+    limit_area=None also holds each column flat beyond its first and last
+    observation; 'inside' fills only gaps within each column's own span.
+    """
+    annual = frame.reindex(np.arange(start, end + 1)).astype(float)
+    if limit_area is None:
+        return annual.interpolate(limit_direction="both")
+    return annual.interpolate(limit_area=limit_area)
+
+
+def resample_to_decades(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Decade values of each column on DECADE_YEARS.
+
+    Each column is interpolated annually over its own observed span; decades
+    outside that span take the nearest in-span decade value. Empty columns
+    become zeros.
+    """
+    frame = frame.sort_index()
+    years = frame.index.to_numpy(dtype=np.int64)
+    if len(years):
+        annual = interpolate_annual(frame, int(years.min()), int(years.max()), limit_area="inside")
+    else:
+        annual = frame.astype(float)
+    decades = annual.reindex(DECADE_YEARS).interpolate(limit_direction="both")
+    empty = frame.notna().sum() == 0
+    decades.loc[:, empty] = 0.0
+    return decades.astype(float)
+
+
+def normalize(frame: pd.DataFrame, invert: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Column-wise min-max scaling to [0, 1].
+
+    Constant columns map to 0.5; columns named in ``invert`` become 1 - x.
+    """
+    lo, hi = frame.min(), frame.max()
+    span = (hi - lo).where(~np.isclose(hi, lo))
+    norm = (frame - lo) / span
+    norm.loc[:, span.isna() & hi.notna()] = 0.5
+    flip = frame.columns.isin(list(invert))
+    norm.loc[:, flip] = 1.0 - norm.loc[:, flip]
+    return norm.clip(0.0, 1.0)
+
+
+def decade_aggregate(frame: pd.DataFrame, start: int, end: int, how: str = "mean") -> pd.DataFrame:
+    """Aggregate the years start..end of every column by decade (year // 10 * 10)."""
+    window = frame[(frame.index >= start) & (frame.index <= end)]
+    grouped = window.groupby((window.index // 10) * 10)
+    if how == "sum":
+        return grouped.sum(min_count=1)
+    return grouped.agg(how)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Milestone Uncertainty for K(t)
+
+The H1-H6 reconstructions are interpolated from point-estimate milestones
+(harmony_specs/*.json), which leaves the pre-1960 part of K(t) without
+input uncertainty. Here every milestone carries an interval:
+
+- an explicit one, as a fourth element of the milestone row:
+  [year, value, note, [low, high]]
+- otherwise the spec's "uncertainty" schedule: a relative half-width
+  interpolated by year, so value * (1 ± r(year)), e.g. ±30% in 1810
+  narrowing to ±5% in 2020
+
+and a distribution over that interval ("triangular" with the mode at the
+point estimate, "uniform", or "normal" with the interval as ±1.96 sd).
+Era segments (H1 communication infrastructure) draw their boundary values
+the same way; a boundary where one segment ends at the value the next
+starts from is drawn once and shared, so only real jumps in the spec
+(e.g. 1840) can jump in a draw.
+
+Each chunk of draws is a (draws × milestones) array per component,
+interpolated for all draws in one batched pass (milestones.py), combined
+into (draws × years) harmony cubes and passed through
+compute_final_k_index.compute_k_index as one (draws × years × 7) array.
+Only the (draws × years) K matrix is kept across chunks, so memory is
+bounded by chunk_size. H7 is not milestone-based and is held at its
+processed composite.
+
+Output: data_sources/processed/k_index_milestone_uncertainty_1810_2020.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from compute_final_k_index import compute_k_index
+from milestones import (
+    HARMONY_SPECS,
+    composite,
+    evaluate_components,
+    harmony_column,
+    load_spec,
+    milestone_arrays,
+    time_axis,
+)
+
+DATA_DIR = Path(__file__).parent / "data_sources"
+H7_PATH = DATA_DIR / "processed" / "h7_composite_1810_2020.csv"
+OUTPUT_PATH = DATA_DIR / "processed" / "k_index_milestone_uncertainty_1810_2020.csv"
+
+DEFAULT_DRAWS = 5000
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+DISTRIBUTIONS = ("triangular", "uniform", "normal")
+
+
+def relative_width(uncertainty: Dict, years: np.ndarray) -> np.ndarray:
+    """Relative half-width r(year) from the spec's "relative" schedule."""
+    schedule = np.asarray(uncertainty.get("relative", [[0, 0.0]]), dtype=np.float64)
+    return np.interp(years, schedule[:, 0], schedule[:, 1])
+
+
+def milestone_intervals(milestones: Sequence[Sequence], uncertainty: Dict):
+    """
+    (years, values, low, high) for a milestone list, sorted like milestone_arrays.
+
+    Rows with an explicit [low, high] fourth element use it; the rest use
+    value * (1 ± r(year)).
+    """
+    years, values = milestone_arrays(milestones)
+    r = relative_width(uncertainty, years)
+    low, high = values * (1 - r), values * (1 + r)
+
+    explicit = {m[0]: m[3] for m in milestones if len(m) > 3 and m[3] is not None}
+    for j, year in enumerate(years):
+        if year in explicit:
+            low[j], high[j] = explicit[year]
+    return years, values, low, high
+
+
+def sample_interval(
+    values: np.ndarray, low: np.ndarray, high: np.ndarray, n_draws: int,
+    rng: np.random.Generator, distribution: str = "triangular",
+) -> np.ndarray:
+    """(n_draws × n_points) draws within each [low, high] interval, floored at 0."""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}'. Use {list(DISTRIBUTIONS)}.")
+
+    shape = (n_draws, len(values))
+    width = high - low
+    if distribution == "uniform":
+        draws = low + width * rng.random(shape)
+    elif distribution == "normal":
+        draws = values + (width / 2 / 1.96) * rng.standard_normal(shape)
+    else:
+        # Inverse-CDF triangular sampling; degenerate (zero-width) intervals
+        # return the point value
+        u = rng.random(shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = np.where(width > 0, (values - low) / width, 0.5)
+        left = low + np.sqrt(u * width * (values - low))
+        right = high - np.sqrt((1 - u) * width * (high - values))
+        draws = np.where(u < c, left, right)
+    return np.maximum(draws, 0.0)
+
+
+def segment_boundaries(segments: Sequence[Sequence]):
+    """
+    (years, values, start_index, end_index) for the distinct segment boundaries.
+
+    A segment starting at the year and value the previous one ends at
+    shares that boundary point; segment i runs from point start_index[i]
+    to point end_index[i].
+    """
+    years, values, start_index, end_index = [], [], [], []
+    for i, (start, end, v0, v1) in enumerate(s[:4] for s in segments):
+        if i > 0 and (start, v0) == (years[-1], values[-1]):
+            start_index.append(len(years) - 1)
+        else:
+            years.append(start)
+            values.append(v0)
+            start_index.append(len(years) - 1)
+        years.append(end)
+        values.append(v1)
+        end_index.append(len(years) - 1)
+    return (np.asarray(years, dtype=np.float64), np.asarray(values, dtype=np.float64),
+            np.asarray(start_index, dtype=np.intp), np.asarray(end_index, dtype=np.intp))
+
+
+def draw_components(spec: Dict, n_draws: int, rng: np.random.Generator) -> Dict[str, Dict]:
+    """
+    Component specs with milestone (and segment) values replaced by draws.
+
+    Derived and spliced components are left as-is; they inherit the draws
+    of the components they are built from.
+    """
+    uncertainty = spec.get("uncertainty", {})
+    distribution = uncertainty.get("distribution", "triangular")
+    drawn = {}
+    for name, component in spec["components"].items():
+        if "milestones" in component:
+            _, values, low, high = milestone_intervals(component["milestones"], uncertainty)
+            component = {**component, "values": sample_interval(values, low, high, n_draws, rng, distribution)}
+        elif "segments" in component:
+            years, values, start_index, end_index = segment_boundaries(component["segments"])
+            r = relative_width(uncertainty, years)
+            draws = sample_interval(values, values * (1 - r), values * (1 + r), n_draws, rng, distribution)
+            component = {**component, "values": (draws[:, start_index], draws[:, end_index])}
+        drawn[name] = component
+    return drawn
+
+
+def harmony_draws(spec: Dict, years: np.ndarray, n_draws: int, rng: np.random.Generator) -> np.ndarray:
+    """(n_draws × n_years) realizations of one harmony."""
+    components = draw_components(spec, n_draws, rng)
+    values = evaluate_components(components, years)
+    if "composite" in spec:
+        return composite(spec, values)
+    return values[harmony_column(spec)]
+
+
+def load_h7(years: np.ndarray, path: Path = H7_PATH) -> np.ndarray:
+    """H7 composite aligned to ``years`` (held fixed across draws)."""
+    if not path.exists():
+        raise FileNotFoundError(f"Missing H7 composite: {path}")
+    h7 = pd.read_csv(path).set_index("year")["h7_composite"].reindex(years.astype(int))
+    if h7.isna().any():
+        raise ValueError(f"H7 composite does not cover {int(years[0])}-{int(years[-1])}")
+    return h7.to_numpy(dtype=np.float64)
+
+
+def point_harmonies(specs: Sequence[Dict], years: np.ndarray, h7: np.ndarray) -> np.ndarray:
+    """(n_years × 7) point-estimate harmonies, ordered h1..h7."""
+    columns = []
+    for spec in specs:
+        values = evaluate_components(spec["components"], years)
+        columns.append(composite(spec, values) if "composite" in spec else values[harmony_column(spec)])
+    return np.column_stack(columns + [h7])
+
+
+def quantile_column(q: float) -> str:
+    """
+    Band column for quantile q: k_p05 for whole percents, k_p2.5 otherwise.
+
+    Percentiles are formatted without rounding so distinct quantiles never
+    share a column.
+    """
+    if not 0.0 <= q <= 1.0:
+        raise ValueError(f"Quantile {q} outside [0, 1]")
+    percent = round(float(q) * 100, 10)
+    if percent.is_integer():
+        return f"k_p{int(percent):02d}"
+    return f"k_p{percent:g}"
+
+
+def monte_carlo_k_bands(
+    n_draws: int = DEFAULT_DRAWS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = 42,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    h7: Optional[np.ndarray] = None,
+    method: str = "geometric",
+    weights: Optional[Dict[str, float]] = None,
+    spec_names: Sequence[str] = HARMONY_SPECS,
+    return_draws: bool = False,
+):
+    """
+    K(t) uncertainty bands from milestone draws.
+
+    Args:
+        n_draws: Total Monte Carlo draws
+        chunk_size: Draws evaluated together; peak memory is about
+            chunk_size × years × 7 floats plus the n_draws × years K matrix
+        seed: Seed for numpy's default_rng (results depend on seed and chunk_size)
+        quantiles: K quantiles to report
+        h7: H7 series over the spec span (default: processed H7 composite)
+        method, weights: Passed to compute_k_index
+        spec_names: Harmony specs for h1..h6, in order
+        return_draws: Also return the (n_draws × years) K matrix
+
+    Returns:
+        DataFrame with year, k_index (point estimate), k_mean, k_sd,
+        k_p05 ... k_p95 (see quantile_column), and h1..h6 mean/sd across draws; plus the K draws
+        if return_draws is True
+    """
+    band_columns = [quantile_column(q) for q in quantiles]
+    if len(set(band_columns)) != len(band_columns):
+        raise ValueError(f"Quantiles {list(quantiles)} give duplicate band columns {band_columns}")
+
+    specs = [load_spec(name) for name in spec_names]
+    years = time_axis(*specs[0]["span"])
+    h7 = load_h7(years) if h7 is None else np.asarray(h7, dtype=np.float64)
+
+    point_k = compute_k_index(point_harmonies(specs, years, h7), weights, method, verbose=False)
+
+    rng = np.random.default_rng(seed)
+    k_draws = np.empty((n_draws, len(years)))
+    h_sum = np.zeros((len(specs), len(years)))
+    h_sq = np.zeros((len(specs), len(years)))
+
+    cube = None
+    for start in range(0, n_draws, chunk_size):
+        n = min(chunk_size, n_draws - start)
+        if cube is None or cube.shape[0] != n:
+            cube = np.empty((n, len(years), len(specs) + 1))
+        for i, spec in enumerate(specs):
+            cube[:, :, i] = harmony_draws(spec, years, n, rng)
+        cube[:, :, -1] = h7
+
+        k_draws[start:start + n] = compute_k_index(cube, weights, method, verbose=False)
+        h_sum += cube[:, :, :-1].sum(axis=0).T
+        h_sq += np.square(cube[:, :, :-1]).sum(axis=0).T
+
+    bands = {
+        "year": years.astype(int),
+        "k_index": point_k,
+        "k_mean": k_draws.mean(axis=0),
+        "k_sd": k_draws.std(axis=0, ddof=1) if n_draws > 1 else np.zeros(len(years)),
+    }
+    for column, values in zip(band_columns, np.quantile(k_draws, quantiles, axis=0)):
+        bands[column] = values
+
+    h_mean = h_sum / n_draws
+    h_sd = np.sqrt(np.maximum(h_sq / n_draws - h_mean ** 2, 0.0) * n_draws / max(n_draws - 1, 1))
+    for i, spec in enumerate(specs):
+        bands[f"{spec['harmony']}_mean"] = h_mean[i]
+        bands[f"{spec['harmony']}_sd"] = h_sd[i]
+
+    result = pd.DataFrame(bands)
+    return (result, k_draws) if return_draws else result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo milestone uncertainty bands for K(t)")
+    parser.add_argument("--draws", type=int, default=DEFAULT_DRAWS, help="Monte Carlo draws")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Draws per batch")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--method", choices=["geometric", "arithmetic"], default="geometric")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="Output CSV")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Monte Carlo Milestone Uncertainty for K(t)")
+    print("=" * 70)
+    print(f"Draws: {args.draws} (chunks of {args.chunk_size}), seed {args.seed}, {args.method} mean")
+
+    start = time.perf_counter()
+    bands = monte_carlo_k_bands(args.draws, args.chunk_size, args.seed, method=args.method)
+    elapsed = time.perf_counter() - start
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    bands.to_csv(args.output, index=False, float_format="%.6f")
+
+    print(f"  ✅ {len(bands)} years in {elapsed:.2f}s → {args.output}")
+    print()
+    print("K(t) 90% band at key years:")
+    for year in [1810, 1870, 1914, 1945, 1960, 2000, 2020]:
+        row = bands[bands["year"] == year]
+        if not row.empty:
+            r = row.iloc[0]
+            print(f"  {year}: K = {r['k_index']:.4f} [{r['k_p05']:.4f}, {r['k_p95']:.4f}]")
+
+
+if __name__ == "__main__":
+    main()
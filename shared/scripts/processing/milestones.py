@@ -0,0 +1,290 @@
+"""
+Declarative milestone / era engine for the reconstructed H1-H6 series.
+
+The create_h1..h6 builders reconstruct 1810-2020 harmony components from
+historical milestones. Each harmony is described by a JSON spec in
+harmony_specs/ and evaluated here with array operations only:
+
+- ``milestones``: [[year, value, note], ...] anchor points, linearly
+  interpolated with np.interp (held constant beyond the first/last anchor)
+- ``segments``: [[start, end, start_value, end_value, note], ...] linear
+  eras that may jump at era boundaries; era lookup is one np.searchsorted
+- ``derive``: {"of": component, "multiply": a, "divide": b, "max": m}, a
+  rescaled copy of another component
+- ``splice``: {"at": year, "before": component, "after": component}
+- composite ``terms``: per-component (x - offset) / scale, optional
+  inversion and clipping, then a weighted sum
+- ``eras``: period labels from a bin lookup over ``breaks``
+- ``uncertainty``: milestone intervals for Monte Carlo draws, used only by
+  milestone_uncertainty.py (a milestone row may also carry an explicit
+  [low, high] as its fourth element)
+
+Any span and resolution (annual or monthly) is a single evaluation over a
+time axis, so all six harmony datasets regenerate in milliseconds.
+
+Spec layout (see harmony_specs/h1_governance.json):
+
+    {
+      "harmony": "h1",
+      "output": "h1_governance/governance_coherence_1810_2020.csv",
+      "span": [1810, 2020],
+      "components": {"state_capacity": {"milestones": [[1810, 0.05, "..."], ...]}, ...},
+      "composite": {"column": "h1_governance_component",
+                    "terms": [{"component": "state_capacity", "weight": 0.3,
+                               "clip": [0, 1]}, ...]},
+      "eras": {"column": "notes", "breaks": [1840, ...], "labels": ["...", ...]},
+      "columns": ["year", "state_capacity", ..., "notes"]
+    }
+
+Usage:
+    from milestones import load_spec, build_harmony
+
+    spec = load_spec('h1_governance')
+    annual = build_harmony(spec)                                  # 1810-2020
+    monthly = build_harmony(spec, 1900, 1950, resolution='monthly')
+
+    python milestones.py            # regenerate all six datasets
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SPEC_DIR = Path(__file__).parent / "harmony_specs"
+DATA_DIR = Path(__file__).parent / "data_sources"
+
+HARMONY_SPECS = [
+    "h1_governance",
+    "h2_interconnection",
+    "h3_reciprocity",
+    "h4_complexity",
+    "h5_knowledge",
+    "h6_wellbeing",
+]
+
+RESOLUTIONS = {"annual": 1, "monthly": 12}
+
+
+def load_spec(name: str, spec_dir: Path = SPEC_DIR) -> Dict:
+    """Load a harmony spec by name (e.g. 'h1_governance') or path."""
+    path = Path(name)
+    if path.suffix != ".json":
+        path = Path(spec_dir) / f"{name}.json"
+    with open(path) as f:
+        return json.load(f)
+
+
+def time_axis(start: int, end: int, resolution: str = "annual") -> np.ndarray:
+    """
+    Decimal-year time axis covering the years start..end inclusive.
+
+    'annual' gives start, start+1, ..., end; 'monthly' gives twelve
+    points per year (year + (month - 1) / 12).
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution '{resolution}'. Use {list(RESOLUTIONS)}.")
+    per_year = RESOLUTIONS[resolution]
+    steps = np.arange((end - start + 1) * per_year)
+    return start + steps / per_year
+
+
+def milestone_arrays(milestones: Sequence[Sequence]):
+    """(years, values) arrays from [[year, value, note?], ...], sorted by year."""
+    years = np.array([m[0] for m in milestones], dtype=np.float64)
+    values = np.array([m[1] for m in milestones], dtype=np.float64)
+    order = np.argsort(years, kind="stable")
+    return years[order], values[order]
+
+
+def interpolate_milestones(milestones: Sequence[Sequence], t: np.ndarray) -> np.ndarray:
+    """Linear interpolation between milestones; constant beyond the ends."""
+    years, values = milestone_arrays(milestones)
+    return np.interp(t, years, values)
+
+
+def evaluate_segments(segments: Sequence[Sequence], t: np.ndarray, values=None) -> np.ndarray:
+    """
+    Piecewise-linear eras: segment i covers start_i <= t < start_{i+1}.
+
+    Each segment runs linearly from start_value at its start to end_value
+    at its end; t is clamped to [first start, last end]. ``values`` may
+    override (start_values, end_values) with (..., n_segments) arrays.
+    """
+    starts = np.array([s[0] for s in segments], dtype=np.float64)
+    ends = np.array([s[1] for s in segments], dtype=np.float64)
+    if values is None:
+        v0 = np.array([s[2] for s in segments], dtype=np.float64)
+        v1 = np.array([s[3] for s in segments], dtype=np.float64)
+    else:
+        v0, v1 = (np.asarray(v, dtype=np.float64) for v in values)
+
+    t = np.clip(np.asarray(t, dtype=np.float64), starts[0], ends[-1])
+    i = np.clip(np.searchsorted(starts, t, side="right") - 1, 0, len(starts) - 1)
+    frac = (t - starts[i]) / (ends[i] - starts[i])
+    return v0[..., i] + (v1[..., i] - v0[..., i]) * frac
+
+
+def evaluate_components(
+    components: Mapping[str, Dict], t: np.ndarray, names: Optional[Sequence[str]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate component specs over a time axis.
+
+    Milestone values may be overridden with a (n_draws, n_milestones) array
+    under the key ``"values"`` (segments: a (start_values, end_values)
+    pair), giving (n_draws, n_times) results; this is how uncertainty draws
+    are evaluated in one batched pass. Derived and spliced components
+    resolve their dependencies first.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    out: Dict[str, np.ndarray] = {}
+
+    def resolve(name: str) -> np.ndarray:
+        if name in out:
+            return out[name]
+        spec = components[name]
+        if "milestones" in spec:
+            years, values = milestone_arrays(spec["milestones"])
+            if "values" in spec:
+                values = np.asarray(spec["values"], dtype=np.float64)
+            value = interp_rows(t, years, values)
+        elif "segments" in spec:
+            value = evaluate_segments(spec["segments"], t, spec.get("values"))
+        elif "derive" in spec:
+            rule = spec["derive"]
+            value = resolve(rule["of"]) * rule.get("multiply", 1.0) / rule.get("divide", 1.0)
+            if "max" in rule:
+                value = np.minimum(rule["max"], value)
+        elif "splice" in spec:
+            rule = spec["splice"]
+            value = np.where(t < rule["at"], resolve(rule["before"]), resolve(rule["after"]))
+        else:
+            raise ValueError(f"Component '{name}' has no milestones, segments, derive or splice")
+        out[name] = value
+        return value
+
+    for name in names if names is not None else components:
+        resolve(name)
+    return out
+
+
+def interp_rows(t: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    np.interp generalized to a batch of value rows.
+
+    ``fp`` is (n_points,) or (n_rows, n_points); the result is (n_times,) or
+    (n_rows, n_times). Segment indices are found once with searchsorted and
+    shared by every row.
+    """
+    fp = np.asarray(fp, dtype=np.float64)
+    if fp.ndim == 1:
+        return np.interp(t, xp, fp)
+
+    tc = np.clip(t, xp[0], xp[-1])
+    i = np.clip(np.searchsorted(xp, tc, side="right") - 1, 0, len(xp) - 2)
+    frac = (tc - xp[i]) / (xp[i + 1] - xp[i])
+    return fp[..., i] + (fp[..., i + 1] - fp[..., i]) * frac
+
+
+def normalize_term(values: np.ndarray, term: Dict) -> np.ndarray:
+    """(x - offset) / scale, optionally inverted (1 - x), then clipped."""
+    x = (values - term.get("offset", 0.0)) / term.get("scale", 1.0)
+    if term.get("invert", False):
+        x = 1 - x
+    if "clip" in term:
+        lo, hi = term["clip"]
+        x = np.clip(x, -np.inf if lo is None else lo, np.inf if hi is None else hi)
+    return x
+
+
+def harmony_column(spec: Dict) -> str:
+    """Output column holding the harmony value (composite or single component)."""
+    if "composite" in spec:
+        return spec["composite"]["column"]
+    return next(c for c in spec["columns"] if c.endswith("_component"))
+
+
+def composite(spec: Dict, values: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Weighted sum of normalized component terms."""
+    total = 0.0
+    for term in spec["composite"]["terms"]:
+        total = total + term["weight"] * normalize_term(values[term["component"]], term)
+    return total
+
+
+def label_eras(eras: Dict, t: np.ndarray) -> np.ndarray:
+    """
+    Era label per time point: label i covers breaks[i-1] <= t < breaks[i].
+
+    ``anchors`` ({"start", "every", "label"}) relabels whole years on a
+    fixed cadence, e.g. the 5-yearly Barro-Lee observations.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    labels = np.asarray(eras["labels"], dtype=object)
+    idx = np.searchsorted(np.asarray(eras.get("breaks", []), dtype=np.float64), t, side="right")
+    out = labels[idx]
+
+    anchors = eras.get("anchors")
+    if anchors:
+        on_anchor = (t >= anchors["start"]) & (t == np.floor(t)) & ((t - anchors["start"]) % anchors["every"] == 0)
+        out = np.where(on_anchor, anchors["label"], out)
+    return out
+
+
+def build_harmony(
+    spec: Dict,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    resolution: str = "annual",
+) -> pd.DataFrame:
+    """
+    Evaluate a harmony spec into its dataset frame.
+
+    Columns follow spec["columns"]; monthly output adds a 'month' column
+    after 'year'. Defaults to the spec's span.
+    """
+    span_start, span_end = spec["span"]
+    start = span_start if start is None else start
+    end = span_end if end is None else end
+    t = time_axis(start, end, resolution)
+
+    values = evaluate_components(spec["components"], t)
+    if "composite" in spec:
+        values[spec["composite"]["column"]] = composite(spec, values)
+    if "eras" in spec:
+        values[spec["eras"]["column"]] = label_eras(spec["eras"], t)
+
+    columns = {"year": np.floor(t).astype(np.int64)}
+    if resolution == "monthly":
+        columns["month"] = np.rint((t - np.floor(t)) * 12).astype(np.int64) + 1
+    for col in spec["columns"]:
+        if col != "year":
+            columns[col] = values[col]
+    return pd.DataFrame(columns)
+
+
+def regenerate_all(data_dir: Path = DATA_DIR, spec_dir: Path = SPEC_DIR) -> Dict[str, Path]:
+    """Write every harmony dataset in HARMONY_SPECS; returns {spec name: path}."""
+    written = {}
+    for name in HARMONY_SPECS:
+        spec = load_spec(name, spec_dir)
+        path = Path(data_dir) / spec["output"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        build_harmony(spec).to_csv(path, index=False)
+        written[name] = path
+    return written
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    paths = regenerate_all()
+    elapsed = (time.perf_counter() - start) * 1000
+    for name, path in paths.items():
+        print(f"  ✅ {name}: {path}")
+    print(f"Regenerated {len(paths)} harmony datasets in {elapsed:.1f} ms")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Milestone Uncertainty Draws
+
+Validates that:
+1. Era segments that are continuous in the spec stay continuous in every draw
+2. Real jumps between segments are still drawn independently
+
+Run: pytest shared/scripts/processing/test_milestone_uncertainty.py -v
+"""
+
+import numpy as np
+import pytest
+
+from milestone_uncertainty import DISTRIBUTIONS, draw_components, segment_boundaries
+from milestones import evaluate_segments, load_spec
+
+N_DRAWS = 500
+
+
+@pytest.fixture(scope="module")
+def h1_spec():
+    return load_spec("h1_governance")
+
+
+class TestSegmentDraws:
+    """Shared boundaries of H1 communication infrastructure."""
+
+    def test_boundary_points(self, h1_spec):
+        """Continuous boundaries are one point; the 1840 jump is two."""
+        segments = h1_spec["components"]["communication_infrastructure"]["segments"]
+        years, values, start_index, end_index = segment_boundaries(segments)
+
+        assert len(years) == len(segments) + 2
+        assert start_index[1] != end_index[0]
+        np.testing.assert_array_equal(start_index[2:], end_index[1:-1])
+        np.testing.assert_array_equal(values[start_index], [s[2] for s in segments])
+        np.testing.assert_array_equal(values[end_index], [s[3] for s in segments])
+
+    @pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+    def test_continuous_boundaries_in_every_draw(self, h1_spec, distribution):
+        """Each draw ends segment i at the value segment i + 1 starts from."""
+        spec = {**h1_spec, "uncertainty": {**h1_spec["uncertainty"], "distribution": distribution}}
+        component = draw_components(spec, N_DRAWS, np.random.default_rng(0))["communication_infrastructure"]
+        segments = component["segments"]
+        v0, v1 = component["values"]
+
+        for i in range(len(segments) - 1):
+            continuous = segments[i][1] == segments[i + 1][0] and segments[i][3] == segments[i + 1][2]
+            if continuous:
+                np.testing.assert_array_equal(v1[:, i], v0[:, i + 1])
+            else:
+                assert np.mean(v1[:, i] != v0[:, i + 1]) > 0.99
+
+        # The evaluated path has no step at the continuous boundaries
+        t = np.array([1879.999, 1880.0, 1919.999, 1920.0, 2009.999, 2010.0])
+        path = evaluate_segments(segments, t, (v0, v1))
+        np.testing.assert_allclose(path[:, 0::2], path[:, 1::2], atol=1e-3)
@@ -16,6 +16,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from synthetic_data import HISTORICAL_GDP_ERAS, growth_paths, harmony_trajectories, piecewise_compound
+
 
 def geometric_mean(values, weights=None):
     """
@@ -157,24 +159,16 @@ class TestKIndexConversion:
     def test_time_series_consistency(self):
         """Geometric K(t) should maintain same general trends as arithmetic."""
         # Simulate time series
-        np.random.seed(42)
         years = np.arange(1810, 2021, 10)
 
-        # Create realistic harmony trajectories (growing over time)
-        def harmony_trajectory(start, end, noise=0.05):
-            trend = np.linspace(start, end, len(years))
-            noise_vals = np.random.normal(0, noise, len(years))
-            return np.clip(trend + noise_vals, 0.01, 1.0)
-
-        harmonies = np.array([
-            harmony_trajectory(0.12, 0.85),  # H1
-            harmony_trajectory(0.15, 0.95),  # H2
-            harmony_trajectory(0.10, 0.65),  # H3
-            harmony_trajectory(0.08, 0.90),  # H4
-            harmony_trajectory(0.14, 0.90),  # H5
-            harmony_trajectory(0.11, 0.80),  # H6
-            harmony_trajectory(0.18, 0.98),  # H7
-        ])
+        # Create realistic harmony trajectories (growing over time), H1-H7
+        harmonies = harmony_trajectories(
+            years,
+            starts=[0.12, 0.15, 0.10, 0.08, 0.14, 0.11, 0.18],
+            ends=[0.85, 0.95, 0.65, 0.90, 0.90, 0.80, 0.98],
+            noise=0.05,
+            seed=42,
+        )
 
         k_arithmetic = np.mean(harmonies, axis=0)
         k_geometric = np.array([geometric_mean(harmonies[:, i]) for i in range(len(years))])
@@ -249,6 +243,38 @@ class TestBootstrapCompatibility:
         assert ci_width < 0.5, f"CI too wide: {ci_width:.4f}"
 
 
+class TestSyntheticData:
+    """Test the seedable synthetic series used by the validation scripts."""
+
+    def test_piecewise_compound_era_bases(self):
+        """Each era starts at the level compounded over all previous eras."""
+        years = np.array([1810, 1869, 1870, 1913, 1914, 1980, 2020])
+        gdp = growth_paths(years, HISTORICAL_GDP_ERAS, base=1000)
+
+        assert gdp[0] == pytest.approx(1000)
+        assert gdp[2] == pytest.approx(1000 * 1.002 ** 60)
+        assert gdp[4] == pytest.approx(1000 * 1.002 ** 60 * 1.015 ** 44)
+        assert gdp[6] == pytest.approx(1000 * 1.002 ** 60 * 1.015 ** 44 * 1.003 ** 31
+                                       * 1.025 ** 35 * 1.018 ** 40)
+        # Per-path rates broadcast over the leading axis
+        panel = piecewise_compound(years, [1810, 1870], np.array([[0.0, 0.0], [0.01, 0.02]]))
+        assert panel.shape == (2, len(years))
+        assert np.all(panel[0] == 1000)
+
+    def test_seeded_and_correlated(self):
+        """Same seed gives the same panel; noise correlation is recovered."""
+        years = np.arange(50)
+        kwargs = dict(noise=0.1, correlation=0.7, n_paths=2000, clip=None, seed=7)
+        a = harmony_trajectories(years, [0.2, 0.3, 0.4], [0.8, 0.9, 0.7], **kwargs)
+        b = harmony_trajectories(years, [0.2, 0.3, 0.4], [0.8, 0.9, 0.7], **kwargs)
+
+        assert a.shape == (2000, 3, 50)
+        np.testing.assert_array_equal(a, b)
+        residuals = a - np.linspace([0.2, 0.3, 0.4], [0.8, 0.9, 0.7], 50, axis=-1)
+        r = np.corrcoef(residuals[:, 0].ravel(), residuals[:, 2].ravel())[0, 1]
+        assert r == pytest.approx(0.7, abs=0.02)
+
+
 class TestValidationBenchmarks:
     """Test against known mathematical benchmarks."""
 
@@ -25,6 +25,9 @@ import pandas as pd
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
+sys.path.insert(0, str(project_root / "figures"))
+from analysis_dataset import load_analysis_dataset
+
 from historical_k.aggregation_methods import (
     compute_k_arithmetic,
     compute_k_geometric,
@@ -34,15 +37,13 @@ from historical_k.aggregation_methods import (
 
 
 def load_k_index_data() -> pd.DataFrame:
-    """Load the final K(t) index dataset with all harmonies."""
+    """Load the final K(t) index dataset with all harmonies (shared analysis dataset)."""
     data_path = project_root / "historical_k/data_sources/processed/k_index_final_1810_2020.csv"
 
-    if not data_path.exists():
-        raise FileNotFoundError(f"K(t) data file not found: {data_path}")
-
-    df = pd.read_csv(data_path)
+    data = load_analysis_dataset(data_path)
+    df = data.frame
     print(f"✅ Loaded K(t) data: {len(df)} years (1810-2020)")
-    print(f"   Columns: {', '.join(df.columns)}")
+    print(f"   Columns: {', '.join(data.source_columns)}")
 
     return df
 
@@ -17,6 +17,8 @@ import seaborn as sns
 from pathlib import Path
 from scipy.stats import pearsonr
 
+from synthetic_data import HISTORICAL_GDP_ERAS, growth_paths, min_max_scale
+
 plt.style.use('seaborn-v0_8-paper')
 plt.rcParams['figure.dpi'] = 300
 plt.rcParams['font.size'] = 10
@@ -37,48 +39,14 @@ def create_synthetic_gdp(years):
     - Stagnation 1914-1945 (world wars)
     - Fast growth 1945-1980 (post-war boom)
     - Moderate growth 1980-2020
+
+    Era rates are synthetic_data.HISTORICAL_GDP_ERAS.
     """
 
-    gdp = []
-    base = 1000  # 1810 baseline (arbitrary units)
-
-    for year in years:
-        if year < 1870:
-            # Pre-industrial: 0.2% annual growth
-            years_since = year - 1810
-            gdp_val = base * (1.002 ** years_since)
-
-        elif 1870 <= year < 1914:
-            # Industrial revolution: 1.5% annual growth
-            base_1870 = base * (1.002 ** 60)
-            years_since = year - 1870
-            gdp_val = base_1870 * (1.015 ** years_since)
-
-        elif 1914 <= year < 1945:
-            # World wars: 0.3% annual growth (stagnation)
-            base_1914 = base * (1.002 ** 60) * (1.015 ** 44)
-            years_since = year - 1914
-            gdp_val = base_1914 * (1.003 ** years_since)
-
-        elif 1945 <= year < 1980:
-            # Post-war boom: 2.5% annual growth
-            base_1945 = base * (1.002 ** 60) * (1.015 ** 44) * (1.003 ** 31)
-            years_since = year - 1945
-            gdp_val = base_1945 * (1.025 ** years_since)
-
-        else:  # 1980-2020
-            # Modern era: 1.8% annual growth
-            base_1980 = base * (1.002 ** 60) * (1.015 ** 44) * (1.003 ** 31) * (1.025 ** 35)
-            years_since = year - 1980
-            gdp_val = base_1980 * (1.018 ** years_since)
-
-        gdp.append(gdp_val)
+    gdp = growth_paths(years, HISTORICAL_GDP_ERAS, base=1000)  # 1810 baseline (arbitrary units)
 
     # Normalize to 0-1 for comparison
-    gdp = np.array(gdp)
-    gdp_norm = (gdp - gdp.min()) / (gdp.max() - gdp.min())
-
-    return gdp_norm
+    return min_max_scale(gdp)
 
 def main():
     """Run validation analysis."""